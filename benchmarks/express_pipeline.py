@@ -0,0 +1,123 @@
+"""Compare end-to-end latency and tokens of the full four-phase council and express mode.
+
+Run from the repo root:
+
+    python -m benchmarks.express_pipeline --agents 1 2 3 5
+
+Every model call is simulated with a fixed time to first token and a fixed decode rate, so
+the numbers isolate what the pipeline shape costs: express drops the separate finalizer
+round trip (its TTFT and re-reading the blueprint and finalist context as prompt tokens),
+and for one or two drafts it drops the critic call as well. Prompt tokens are estimated
+from the real prompt templates at four characters per token.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import replace
+from typing import Any, AsyncIterator
+
+from llm_council.settings import PERSONA, get_settings
+from llm_council.workflow import EXPRESS_MARKER, CouncilWorkflow, WorkflowRequest
+
+OUTPUT_TOKENS = {"generator": 450, "critic": 120, "architect": 180, "finalizer": 700}
+
+
+class SimulatedClient:
+    def __init__(self, ttft: float, seconds_per_token: float) -> None:
+        self.ttft = ttft
+        self.seconds_per_token = seconds_per_token
+
+    async def stream_generate(self, prompt: str, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        if EXPRESS_MARKER in prompt:
+            blueprint = self._blueprint()
+            text = f"{blueprint}\n{EXPRESS_MARKER}\n{self._words(OUTPUT_TOKENS['finalizer'])}"
+            completion = OUTPUT_TOKENS["architect"] + OUTPUT_TOKENS["finalizer"]
+        elif "Senior Quality Assurance Judge" in prompt:
+            agents = [line.split("--- RESPONSE ID: ")[1].split(" ---")[0] for line in prompt.splitlines() if line.startswith("--- RESPONSE ID:")]
+            scorecard = {"metric_scores": {"accuracy": 8, "relevance": 8, "completeness": 8, "clarity": 8, "practical_usefulness": 8}, "critique": "Solid."}
+            text = json.dumps({"reviews": {agent: scorecard for agent in agents}})
+            completion = OUTPUT_TOKENS["critic"] * len(agents)
+        elif "Chief Solutions Architect" in prompt:
+            text = self._blueprint()
+            completion = OUTPUT_TOKENS["architect"]
+        elif "Chief Editor and Publisher" in prompt:
+            text = self._words(OUTPUT_TOKENS["finalizer"])
+            completion = OUTPUT_TOKENS["finalizer"]
+        else:
+            text = self._words(OUTPUT_TOKENS["generator"])
+            completion = OUTPUT_TOKENS["generator"]
+        await asyncio.sleep(self.ttft)
+        # Decode in 8 slices so streaming overhead is exercised without thousands of sleeps.
+        step = max(1, len(text) // 8)
+        for index in range(0, len(text), step):
+            await asyncio.sleep(completion * self.seconds_per_token / 8)
+            yield _Update(delta=text[index:index + step])
+        prompt_tokens = len(prompt) // 4
+        yield _Update(usage={"prompt": prompt_tokens, "completion": completion, "total": prompt_tokens + completion})
+
+    @staticmethod
+    def _blueprint() -> str:
+        return json.dumps({"structure": ["Answer", "Details"], "tone_guidelines": "Clear", "missing_facts_to_add": [], "critique_integration": "Use it."})
+
+    @staticmethod
+    def _words(tokens: int) -> str:
+        return " ".join("word" for _ in range(tokens))
+
+
+class _Update:
+    def __init__(self, delta: str = "", usage: dict[str, int] | None = None) -> None:
+        self.delta = delta
+        self.usage = usage
+
+
+async def measure(pipeline: str, agents: int, ttft: float, seconds_per_token: float) -> dict[str, float]:
+    settings = replace(get_settings(), use_mock_mode=False, council_cache_mode="off", generator_straggler_timeout_seconds=0)
+    client = SimulatedClient(ttft, seconds_per_token)
+    workflow = CouncilWorkflow(settings=settings, client_factory=lambda **kwargs: client)
+    request = WorkflowRequest(query="Benchmark question", selected_agents=list(PERSONA)[:agents], pipeline=pipeline)
+    started = time.perf_counter()
+    first_answer_token: float | None = None
+    totals: dict[str, int] = {}
+    async for event in workflow.stream(request):
+        if event["type"] == "finalizer_chunk" and first_answer_token is None:
+            first_answer_token = time.perf_counter() - started
+        if event["type"] == "done":
+            totals = event["total_tokens"]
+    return {
+        "seconds": time.perf_counter() - started,
+        "first_answer_token": first_answer_token or 0.0,
+        "prompt": totals.get("prompt", 0),
+        "completion": totals.get("completion", 0),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, nargs="+", default=[1, 2, 3, 5])
+    parser.add_argument("--ttft-ms", type=float, default=800.0, help="simulated time to first token per call")
+    parser.add_argument("--tokens-per-second", type=float, default=150.0, help="simulated decode rate per stream")
+    parser.add_argument("--time-scale", type=float, default=0.05, help="run faster than real time; results are rescaled")
+    args = parser.parse_args()
+
+    ttft = args.ttft_ms / 1000.0 * args.time_scale
+    seconds_per_token = args.time_scale / args.tokens_per_second
+    print(f"{'agents':<8}{'pipeline':<10}{'seconds':>10}{'answer TTFT':>13}{'prompt tok':>12}{'output tok':>12}")
+    for agents in args.agents:
+        results = {}
+        for pipeline in ("full", "express"):
+            result = await measure(pipeline, agents, ttft, seconds_per_token)
+            results[pipeline] = result
+            print(
+                f"{agents:<8}{pipeline:<10}{result['seconds'] / args.time_scale:>10.2f}"
+                f"{result['first_answer_token'] / args.time_scale:>13.2f}{result['prompt']:>12}{result['completion']:>12}"
+            )
+        saved = 1 - results["express"]["seconds"] / results["full"]["seconds"]
+        print(f"{'':<8}express saves {saved:.0%} of end-to-end latency")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
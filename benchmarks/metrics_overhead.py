@@ -0,0 +1,67 @@
+"""Measure what recording one metric event costs, and what a /metrics scrape costs.
+
+Run from the repo root:
+
+    python -m benchmarks.metrics_overhead --events 200000
+
+Each row times one recording call the way the client and workflow make it, spread over a
+realistic number of label combinations (models x roles). Rows include the benchmark's own
+lambda call, shown as ``empty loop``. The scrape renders the registry after every row has
+run, so it holds all the series a busy process would expose. A council run records about
+20 events (a TTFT and a usage record per stream, phase ends, retries), so its cost is
+about 20 times the per-event figure.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+from llm_council.metrics import CouncilMetrics
+
+MODELS = [f"org/model-{index}" for index in range(6)]
+ROLES = ["generator", "critic", "architect", "finalizer", "follow_up_chat"]
+USAGE = {"prompt": 1800, "completion": 450, "total": 2250}
+
+
+def per_event_ns(record: Callable[[int], None], events: int, repeats: int = 5) -> float:
+    """Best of ``repeats`` passes, so scheduler noise does not inflate the figure."""
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter_ns()
+        for index in range(events):
+            record(index)
+        best = min(best, (time.perf_counter_ns() - started) / events)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200000)
+    args = parser.parse_args()
+
+    metrics = CouncilMetrics()
+    labels = [(model, role) for model in MODELS for role in ROLES]
+    rows: list[tuple[str, Callable[[int], None]]] = [
+        ("empty loop", lambda index: None),
+        ("ttft histogram observe", lambda index: metrics.ttft.observe(0.4 + index % 50 / 10, *labels[index % len(labels)])),
+        ("usage (tokens + tokens/sec)", lambda index: metrics.observe_usage(*labels[index % len(labels)], USAGE, 6.5)),
+        ("retry counter inc", lambda index: metrics.retries.inc(MODELS[index % len(MODELS)])),
+        ("phase duration observe", lambda index: metrics.phase_duration.observe(12.5, ROLES[index % 4])),
+        ("in-flight gauge inc+dec", lambda index: (metrics.councils_in_flight.inc(), metrics.councils_in_flight.dec())),
+    ]
+    print(f"{'event':<32}{'ns/event':>10}")
+    for name, record in rows:
+        print(f"{name:<32}{per_event_ns(record, args.events):>10.0f}")
+
+    scrapes = 200
+    started = time.perf_counter()
+    for _ in range(scrapes):
+        text = metrics.render()
+    elapsed = (time.perf_counter() - started) / scrapes
+    print(f"\n/metrics render: {elapsed * 1000:.2f} ms for {text.count(chr(10))} lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compare SSE writes per council run with and without delta coalescing.
+
+Run from the repo root:
+
+    python -m benchmarks.sse_coalescing --window-ms 40
+
+A synthetic council run streams interleaved generator deltas, then critic, architect and
+finalizer deltas, at a fixed per-stream token rate. Each string yielded by
+``stream_workflow`` is one ``StreamingResponse`` body write (one ``send`` on the socket),
+and each SSE event is one JSON encode.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from dataclasses import replace
+from typing import Any, AsyncIterator
+from unittest.mock import patch
+
+from llm_council import server
+
+
+async def synthetic_run(agents: int, tokens: int, token_interval: float) -> AsyncIterator[dict[str, Any]]:
+    names = [f"Agent {index + 1}" for index in range(agents)]
+    for name in names:
+        yield {"type": "generator_start", "agent": name, "model": "demo/model"}
+    for _ in range(tokens):
+        await asyncio.sleep(token_interval)
+        for name in names:
+            yield {"type": "generator_thinking", "agent": name, "chunk": "hm "}
+            yield {"type": "generator_chunk", "agent": name, "chunk": "word "}
+    for name in names:
+        yield {"type": "generator_thinking_done", "agent": name}
+        yield {"type": "generator_done", "agent": name, "time_taken": 1.0, "model": "demo/model", "usage": {}}
+    for phase in ("critic", "architect", "finalizer"):
+        yield {"type": f"{phase}_start", "model": "demo/model", "batch": 1, "total_batches": 1}
+        for _ in range(tokens):
+            await asyncio.sleep(token_interval)
+            yield {"type": f"{phase}_chunk", "batch": 1, "chunk": "word "}
+        yield {"type": f"{phase}_thinking_done", "batch": 1}
+    yield {"type": "finalizer_done", "time_taken": 1.0, "model": "demo/model", "usage": {}}
+    yield {"type": "done", "total_execution_time": 1.0, "total_tokens": {"prompt": 0, "completion": 0, "total": 0}}
+
+
+async def measure(window_ms: float, agents: int, tokens: int, token_interval: float) -> dict[str, float]:
+    settings = replace(server.settings, sse_coalesce_window_ms=window_ms)
+    request = server.SummonRequest(query="Benchmark", selected_agents=[])
+    writes = events = size = 0
+    started = time.perf_counter()
+    with patch.object(server, "settings", settings), patch.object(
+        server.workflow, "stream", lambda _request: synthetic_run(agents, tokens, token_interval),
+    ):
+        async for message in server.stream_workflow(request):
+            writes += 1
+            events += message.count("\nevent: ") + message.startswith("event: ")
+            size += len(message.encode("utf-8"))
+    return {"writes": writes, "events": events, "bytes": size, "seconds": time.perf_counter() - started}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--window-ms", type=float, default=40.0)
+    parser.add_argument("--agents", type=int, default=5)
+    parser.add_argument("--tokens", type=int, default=400, help="deltas per stream")
+    parser.add_argument("--token-interval-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    interval = args.token_interval_ms / 1000.0
+    baseline = await measure(0, args.agents, args.tokens, interval)
+    coalesced = await measure(args.window_ms, args.agents, args.tokens, interval)
+    print(f"{'':<22}{'writes':>10}{'events':>10}{'bytes':>12}{'seconds':>10}")
+    for label, result in (("uncoalesced", baseline), (f"coalesced {args.window_ms:g}ms", coalesced)):
+        print(f"{label:<22}{result['writes']:>10}{result['events']:>10}{result['bytes']:>12}{result['seconds']:>10.2f}")
+    print(f"write reduction: {baseline['writes'] / max(1, coalesced['writes']):.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
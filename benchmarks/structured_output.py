@@ -0,0 +1,220 @@
+"""Measure how often critic and architect output validates on the first attempt, per structured-output mode.
+
+Run from the repo root:
+
+    python -m benchmarks.structured_output --calls 400
+
+Every call goes through the real ``LLMClient`` and OpenAI SDK to a local stand-in for the
+NIM chat-completions endpoint (an ``httpx.MockTransport``). The stand-in writes JSON with
+the mistakes models commonly make, at fixed seeded rates: code fences and leading prose,
+dropped scorecards, out-of-range scores, missing fields, trailing commas. It imitates the
+provider's guarantees from what the request asks for. Any ``response_format`` removes
+fences, prose and trailing commas, as JSON mode does. A schema in ``response_format`` or ``nvext.guided_json``
+lets only schema-valid output through, as guided decoding does. So the numbers show what
+each request shape can guarantee; they are not a measurement of a real model's error rates.
+
+``--reject MODE`` makes the stand-in answer 400 to that mode, which shows the cost of the
+downgrade round trip. Each row starts with an empty capability cache, so only its first
+call pays it; later calls go straight to the mode the stand-in accepted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import random
+from dataclasses import replace
+from typing import Any
+
+import httpx
+from openai import AsyncOpenAI
+
+from llm_council.capabilities import CapabilityCache
+from llm_council.llm_client import LLMClient
+from llm_council.schemas import ArchitectBlueprint, CriticBatchOutput, critic_batch_model
+from llm_council.settings import get_settings
+from llm_council.structured_output import StructuredOutputCompiler
+from llm_council.workflow import SCORE_METRICS, parse_critic_batch
+
+AGENTS = ("The Academic", "The Layman", "The Skeptic")
+DEFECT_RATES = {
+    "fence": 0.15,
+    "prose": 0.05,
+    "drop_agent": 0.08,
+    "out_of_range": 0.05,
+    "missing_metric": 0.04,
+    "empty_critique": 0.02,
+    "missing_field": 0.06,
+    "trailing_comma": 0.04,
+}
+
+
+def conforms(value: Any, schema: dict[str, Any]) -> bool:
+    """The subset of JSON Schema the compiled council schemas use."""
+    kind = schema.get("type")
+    if kind == "object":
+        if not isinstance(value, dict):
+            return False
+        properties = schema.get("properties", {})
+        if any(key not in value for key in schema.get("required", [])):
+            return False
+        extra = schema.get("additionalProperties", True)
+        for key, item in value.items():
+            if key in properties:
+                if not conforms(item, properties[key]):
+                    return False
+            elif extra is False or (isinstance(extra, dict) and not conforms(item, extra)):
+                return False
+        return True
+    if kind == "array":
+        return isinstance(value, list) and all(conforms(item, schema.get("items", {})) for item in value)
+    if kind == "integer":
+        return (
+            isinstance(value, int)
+            and schema.get("minimum", value) <= value <= schema.get("maximum", value)
+        )
+    if kind == "string":
+        return isinstance(value, str) and len(value) >= schema.get("minLength", 0)
+    return True
+
+
+class StandInModel:
+    """Writes council JSON with seeded mistakes, constrained by what the request asked for."""
+
+    def __init__(self, seed: int, reject: str | None) -> None:
+        self.random = random.Random(seed)
+        self.reject = reject
+        self.requests = 0
+
+    def _hit(self, defect: str) -> bool:
+        return self.random.random() < DEFECT_RATES[defect]
+
+    def _critic_payload(self) -> dict[str, Any]:
+        reviews = {
+            agent: {"metric_scores": {metric: self.random.randint(5, 10) for metric in SCORE_METRICS}, "critique": "Grounded but thin on sources."}
+            for agent in AGENTS
+        }
+        if self._hit("drop_agent"):
+            reviews.pop(self.random.choice(AGENTS))
+        if reviews and self._hit("out_of_range"):
+            reviews[self.random.choice(list(reviews))]["metric_scores"]["accuracy"] = 11
+        if reviews and self._hit("missing_metric"):
+            reviews[self.random.choice(list(reviews))]["metric_scores"].pop("clarity")
+        if reviews and self._hit("empty_critique"):
+            reviews[self.random.choice(list(reviews))]["critique"] = ""
+        return {"reviews": reviews}
+
+    def _architect_payload(self) -> dict[str, Any]:
+        payload = {
+            "structure": ["Answer - lead with it", "Evidence - strongest points", "Takeaway - one action"],
+            "tone_guidelines": "Plain and direct.",
+            "missing_facts_to_add": [],
+            "critique_integration": "Fold in the skeptic's caveats.",
+        }
+        if self._hit("missing_field"):
+            payload.pop("critique_integration")
+        return payload
+
+    def complete(self, body: dict[str, Any]) -> str:
+        prompt = body["messages"][-1]["content"]
+        response_format = body.get("response_format") or {}
+        schema = (response_format.get("json_schema") or {}).get("schema") or body.get("nvext", {}).get("guided_json")
+        make = self._critic_payload if "Senior Quality Assurance Judge" in prompt else self._architect_payload
+        payload = make()
+        if schema is not None:
+            # Guided decoding never emits a token that leaves the schema.
+            while not conforms(payload, schema):
+                payload = make()
+        text = json.dumps(payload, indent=2)
+        if not response_format and schema is None:
+            # JSON mode only guarantees syntax: fences, prose and trailing commas disappear.
+            if self._hit("trailing_comma"):
+                text = text.replace("\n  ]", ",\n  ]", 1).replace("\n}", ",\n}", 1)
+            if self._hit("fence"):
+                text = f"```json\n{text}\n```"
+            if self._hit("prose"):
+                text = f"Here is the evaluation:\n{text}"
+        return text
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        body = json.loads(request.content)
+        mode = (
+            "guided_json" if "nvext" in body
+            else (body.get("response_format") or {}).get("type", "off")
+        )
+        if mode == self.reject:
+            return httpx.Response(400, json={"error": {"message": f"{mode} is not supported by this deployment"}})
+        text = self.complete(body)
+        chunks = [text[index:index + 64] for index in range(0, len(text), 64)]
+        events = [
+            {"id": "stand-in", "object": "chat.completion.chunk", "created": 0, "model": body["model"], "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}]}
+            for chunk in chunks
+        ]
+        events.append({"id": "stand-in", "object": "chat.completion.chunk", "created": 0, "model": body["model"], "choices": [], "usage": {"prompt_tokens": 400, "completion_tokens": len(text) // 4, "total_tokens": 400 + len(text) // 4}})
+        stream = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+        return httpx.Response(200, text=stream, headers={"content-type": "text/event-stream"})
+
+
+def first_attempt_valid(kind: str, text: str) -> bool:
+    try:
+        if kind == "critic":
+            parse_critic_batch(text, AGENTS)
+        else:
+            ArchitectBlueprint.model_validate_json(text)
+    except ValueError:
+        return False
+    return True
+
+
+async def measure(mode: str, critic_schema: Any, calls: int, seed: int, reject: str | None) -> dict[str, float]:
+    settings = replace(get_settings(), use_mock_mode=False, nvidia_api_key="nvapi-stand-in", response_cache_enabled=False, nvidia_hedging=False)
+    stand_in = StandInModel(seed, reject)
+    client = LLMClient(settings=settings, structured_output=StructuredOutputCompiler(default_mode=mode), capabilities=CapabilityCache())
+    client.openai_client = AsyncOpenAI(
+        api_key="nvapi-stand-in",
+        base_url="http://stand-in.local/v1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(stand_in.handle)),
+    )
+    valid = {"critic": 0, "architect": 0}
+    for call in range(calls):
+        kind = "critic" if call % 2 == 0 else "architect"
+        prompt = "You are an impartial Senior Quality Assurance Judge." if kind == "critic" else "You are the Chief Solutions Architect."
+        schema = critic_schema if kind == "critic" else ArchitectBlueprint
+        with contextlib.redirect_stdout(io.StringIO()):  # the client's per-request debug lines
+            text = "".join([update.delta async for update in client.stream_generate(prompt, schema=schema, model="stand-in/model", hedge=False)])
+        valid[kind] += first_attempt_valid(kind, text)
+    await client.openai_client.close()
+    per_kind = calls / 2
+    return {
+        "critic": valid["critic"] / per_kind,
+        "architect": valid["architect"] / per_kind,
+        "requests_per_call": stand_in.requests / calls,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--reject", choices=("json_schema", "guided_json", "json_object"), default=None)
+    args = parser.parse_args()
+
+    rows = [
+        ("off (no constraint)", "off", CriticBatchOutput),
+        ("json_object (previous)", "json_object", CriticBatchOutput),
+        ("json_schema, generic", "json_schema", CriticBatchOutput),
+        ("json_schema, per batch", "json_schema", critic_batch_model(AGENTS)),
+        ("guided_json, per batch", "guided_json", critic_batch_model(AGENTS)),
+    ]
+    print(f"{'request shape':<26}{'critic valid':>14}{'architect valid':>17}{'requests/call':>15}")
+    for label, mode, critic_schema in rows:
+        result = await measure(mode, critic_schema, args.calls, args.seed, args.reject)
+        print(f"{label:<26}{result['critic']:>14.1%}{result['architect']:>17.1%}{result['requests_per_call']:>15.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
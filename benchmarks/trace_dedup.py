@@ -0,0 +1,103 @@
+"""Measure local trace bytes and trace-writer CPU with and without blob dedup.
+
+Run from the repo root:
+
+    python -m benchmarks.trace_dedup --agents 3 5 8 --runs 20
+
+Each run is a full council through the real workflow, prompt templates and trace sink,
+with a simulated model that answers instantly with drafts of realistic length. The
+baseline gives every tracer a blob table whose size threshold is never reached, so each
+string is redacted and written in full, as before. ``sink CPU`` is the trace worker's
+time to build, redact, serialize and write the records.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from llm_council.settings import PERSONA, get_settings
+from llm_council.trace_blobs import BlobTable
+from llm_council.trace_sink import TraceSink
+from llm_council.tracer import WorkflowTracer
+from llm_council.workflow import CouncilWorkflow, WorkflowRequest
+
+VOCABULARY = "council evidence source claim risk answer model latency budget review draft policy cache token".split()
+
+
+class InstantClient:
+    def __init__(self, seed: int) -> None:
+        self.random = random.Random(seed)
+
+    async def stream_generate(self, prompt: str, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        if "Senior Quality Assurance Judge" in prompt:
+            agents = [line.split("--- RESPONSE ID: ")[1].split(" ---")[0] for line in prompt.splitlines() if line.startswith("--- RESPONSE ID:")]
+            scorecard = {"metric_scores": {"accuracy": 8, "relevance": 8, "completeness": 7, "clarity": 8, "practical_usefulness": 7}, "critique": self._words(40)}
+            text = json.dumps({"reviews": {agent: scorecard for agent in agents}})
+        elif "Chief Solutions Architect" in prompt:
+            text = json.dumps({"structure": ["Answer", "Evidence", "Risks"], "tone_guidelines": "Clear", "missing_facts_to_add": [], "critique_integration": self._words(30)})
+        else:
+            # Generator drafts and the final report: roughly 450 tokens of prose.
+            text = self._words(450)
+        yield _Update(delta=text)
+        yield _Update(usage={"prompt": len(prompt) // 4, "completion": len(text) // 4, "total": (len(prompt) + len(text)) // 4})
+
+    def _words(self, count: int) -> str:
+        return " ".join(self.random.choice(VOCABULARY) for _ in range(count))
+
+
+class _Update:
+    def __init__(self, delta: str = "", usage: dict[str, int] | None = None) -> None:
+        self.delta = delta
+        self.usage = usage
+
+
+async def measure(agents: int, runs: int, dedup: bool) -> dict[str, float]:
+    settings = replace(get_settings(), use_mock_mode=False, council_cache_mode="off", generator_straggler_timeout_seconds=0, enable_trace_logs=True)
+    with tempfile.TemporaryDirectory() as directory:
+        sink = TraceSink(Path(directory))
+
+        def tracer_factory(**kwargs: Any) -> WorkflowTracer:
+            tracer = WorkflowTracer(**kwargs, sink=sink)
+            if not dedup:
+                tracer.blobs = BlobTable(min_chars=2**62)
+            return tracer
+
+        workflow = CouncilWorkflow(
+            settings=replace(settings, trace_log_dir=Path(directory)),
+            client_factory=lambda **kwargs: InstantClient(seed=agents),
+            tracer_factory=tracer_factory,
+        )
+        request = WorkflowRequest(query="How should we roll out the new cache?", selected_agents=list(PERSONA)[:agents])
+        for _ in range(runs):
+            async for _event in workflow.stream(request):
+                pass
+        sink.close()
+        size = (Path(directory) / "traces.jsonl").stat().st_size
+        return {"kib_per_run": size / runs / 1024, "cpu_ms_per_run": sink.busy_seconds / runs * 1000}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, nargs="+", default=[3, 5, 8])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'agents':>6}{'KiB/run before':>16}{'KiB/run after':>15}{'sink CPU before':>17}{'sink CPU after':>16}")
+    for agents in args.agents:
+        before = await measure(agents, args.runs, dedup=False)
+        after = await measure(agents, args.runs, dedup=True)
+        print(
+            f"{agents:>6}{before['kib_per_run']:>16.1f}{after['kib_per_run']:>15.1f}"
+            f"{before['cpu_ms_per_run']:>15.2f}ms{after['cpu_ms_per_run']:>14.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from .settings import Settings
+
+# Optional request parameters a deployment may refuse with 400/422, plus the structured
+# output modes. Each is remembered per (base URL, model) as accepted or rejected.
+NEGOTIATED_PARAMETERS = ("json_schema", "guided_json", "json_object", "reasoning_effort", "stream_options")
+
+
+class CapabilityCache:
+    """Which optional request parameters each (base URL, model) pair accepts.
+
+    ``LLMClient`` records what a successful request sent as accepted and what it had to
+    strip after a 400/422 as rejected, so later requests to that model leave rejected
+    parameters out instead of paying the failed round trip again. A learned capability
+    expires ``ttl_seconds`` after it was recorded so upgraded deployments are re-probed;
+    ``0`` keeps it until reset. When ``path`` is set the table is loaded on start and
+    written there as JSON only when a learned value changes; inside an event loop the write
+    runs in a worker thread, and changes made while it runs are folded into one more write.
+    """
+
+    def __init__(self, *, ttl_seconds: float = 86400.0, path: Path | None = None) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        # (base_url, model) -> parameter -> (accepted, learned_at wall-clock seconds)
+        self._entries: dict[tuple[str, str], dict[str, tuple[bool, float]]] = {}
+        self.lookups = 0
+        self.hits = 0
+        self.learned = 0
+        self.expirations = 0
+        self.writes = 0
+        self._dirty = False
+        self._writer: asyncio.Task[None] | None = None
+        self._load()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "CapabilityCache":
+        return cls(
+            ttl_seconds=settings.nvidia_capability_ttl_seconds,
+            path=settings.nvidia_capability_cache_path,
+        )
+
+    def _expired(self, learned_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - learned_at > self.ttl_seconds
+
+    def _live(self, base_url: str, model: str) -> dict[str, tuple[bool, float]]:
+        entry = self._entries.get((base_url, model))
+        if not entry:
+            return {}
+        expired = [name for name, (_, learned_at) in entry.items() if self._expired(learned_at)]
+        for name in expired:
+            del entry[name]
+            self.expirations += 1
+        if not entry:
+            del self._entries[(base_url, model)]
+        return entry
+
+    def accepts(self, base_url: str, model: str) -> dict[str, bool]:
+        """Learned parameters for one model; a parameter missing here has not been probed."""
+        self.lookups += 1
+        known = {name: accepted for name, (accepted, _) in self._live(base_url, model).items()}
+        self.hits += bool(known)
+        return known
+
+    def record(self, base_url: str, model: str, learned: dict[str, bool]) -> None:
+        entry = self._live(base_url, model)
+        changed = {name: accepted for name, accepted in learned.items() if name not in entry or entry[name][0] != accepted}
+        if not changed:
+            return
+        now = time.time()
+        entry = self._entries.setdefault((base_url, model), entry)
+        for name, accepted in changed.items():
+            entry[name] = (accepted, now)
+            if not accepted:
+                print(f"[WARNING] {model} at {base_url} rejects {name}; later requests will leave it out.")
+        self.learned += len(changed)
+        self._save()
+
+    def reset(self, base_url: str | None = None, model: str | None = None) -> int:
+        """Forget learned capabilities, optionally only for one base URL and/or model."""
+        matches = [
+            key for key in self._entries
+            if (base_url is None or key[0] == base_url) and (model is None or key[1] == model)
+        ]
+        for key in matches:
+            del self._entries[key]
+        if matches:
+            self._save()
+        return len(matches)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        rows = []
+        for base_url, model in list(self._entries):
+            entry = self._live(base_url, model)
+            if entry:
+                rows.append({
+                    "base_url": base_url,
+                    "model": model,
+                    "accepts": {name: accepted for name, (accepted, _) in sorted(entry.items())},
+                    "learned_at": {name: learned_at for name, (_, learned_at) in sorted(entry.items())},
+                })
+        return rows
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            rows = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            print(f"[WARNING] Ignoring unreadable capability cache {self.path}: {exc}")
+            return
+        for row in rows if isinstance(rows, list) else []:
+            try:
+                entry = {
+                    name: (bool(accepted), float(row["learned_at"][name]))
+                    for name, accepted in row["accepts"].items()
+                    if name in NEGOTIATED_PARAMETERS
+                }
+                key = (str(row["base_url"]), str(row["model"]))
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+            live = {name: value for name, value in entry.items() if not self._expired(value[1])}
+            if live:
+                self._entries[key] = live
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(self.path, self.snapshot())
+            return
+        self._dirty = True
+        if self._writer is None or self._writer.done() or self._writer.get_loop() is not loop:
+            self._writer = loop.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        while self._dirty:
+            self._dirty = False
+            await asyncio.to_thread(self._write, self.path, self.snapshot())
+
+    async def aclose(self) -> None:
+        """Wait for a pending write so shutdown does not drop the last learned change."""
+        if self._writer is not None:
+            await self._writer
+
+    def _write(self, path: Path, rows: list[dict[str, Any]]) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(".tmp")
+            temp_path.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+            temp_path.replace(path)
+            self.writes += 1
+        except OSError as exc:  # pragma: no cover - persistence must never fail a request
+            print(f"[WARNING] Capability cache write failed: {exc}")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "models": len(self._entries),
+            "ttl_seconds": self.ttl_seconds,
+            "persisted": self.path is not None,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "learned": self.learned,
+            "expirations": self.expirations,
+            "writes": self.writes,
+        }
+
+
+_default_cache: CapabilityCache | None = None
+
+
+def get_capability_cache(settings: Settings) -> CapabilityCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = CapabilityCache.from_settings(settings)
+    return _default_cache
+
+
+async def close_capability_cache() -> None:
+    global _default_cache
+    cache, _default_cache = _default_cache, None
+    if cache is not None:
+        await cache.aclose()
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict, deque
+from typing import Any, Collection, Literal
+
+from openai import APIStatusError
+
+from .settings import Settings
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+
+def counts_as_model_failure(exc: BaseException) -> bool:
+    """Only provider-side failures trip a breaker; a caller's bad key or request must not."""
+    cause = exc.__cause__ or exc
+    if isinstance(cause, APIStatusError):
+        return cause.status_code == 429 or cause.status_code >= 500
+    return True
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one model id under one API key.
+
+    ``failure_threshold`` failures or timeouts inside ``window_seconds`` open the breaker.
+    After ``cooldown_seconds`` it admits a single half-open probe: success closes it, failure
+    re-opens it for another cooldown. A probe that never reports back (for example a
+    cancelled run) is forgotten after one cooldown so the breaker cannot wedge half-open.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        window_seconds: float = 60.0,
+        cooldown_seconds: float = 30.0,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self._state: BreakerState = "closed"
+        self._failures: deque[float] = deque()
+        self._opened_at = 0.0
+        self._probe_started_at: float | None = None
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejections = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> BreakerState:
+        if self._state == "open" and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+            self._state = "half_open"
+            self._probe_started_at = None
+        return self._state
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open":
+            now = time.monotonic()
+            if self._probe_started_at is None or now - self._probe_started_at >= self.cooldown_seconds:
+                self._probe_started_at = now
+                return True
+        self.rejections += 1
+        return False
+
+    def record_success(self) -> None:
+        self.successes += 1
+        self._state = "closed"
+        self._failures.clear()
+        self._probe_started_at = None
+
+    def record_failure(self, *, timeout: bool = False) -> None:
+        now = time.monotonic()
+        self.failures += 1
+        if timeout:
+            self.timeouts += 1
+        self._failures.append(now)
+        while self._failures and now - self._failures[0] > self.window_seconds:
+            self._failures.popleft()
+        if self._state == "half_open" or len(self._failures) >= self.failure_threshold:
+            if self._state != "open":
+                self.opened += 1
+            self._state = "open"
+            self._opened_at = now
+            self._probe_started_at = None
+
+    def is_idle(self) -> bool:
+        """Closed with no failure left in the window, so a fresh breaker would behave the same."""
+        now = time.monotonic()
+        while self._failures and now - self._failures[0] > self.window_seconds:
+            self._failures.popleft()
+        return self.state == "closed" and not self._failures
+
+    def snapshot(self) -> dict[str, Any]:
+        state = self.state
+        return {
+            "state": state,
+            "recent_failures": len(self._failures),
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "successes": self.successes,
+            "rejections": self.rejections,
+            "times_opened": self.opened,
+            "retry_in_seconds": round(max(0.0, self.cooldown_seconds - (time.monotonic() - self._opened_at)), 3)
+            if state == "open"
+            else 0.0,
+        }
+
+
+class BreakerRegistry:
+    """Process-wide breakers keyed by API-key fingerprint and model id.
+
+    A 429 is a per-key quota signal, so one tenant exhausting its quota must not open the
+    breaker for callers that bring their own key. Both parts of the key come from callers,
+    so past ``max_entries`` the least recently used idle breakers are dropped; open,
+    half-open, or recently failing breakers are never evicted.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        failure_threshold: int = 5,
+        window_seconds: float = 60.0,
+        cooldown_seconds: float = 30.0,
+        max_entries: int = 512,
+    ) -> None:
+        self.enabled = enabled
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.max_entries = max(1, max_entries)
+        self.evictions = 0
+        self._breakers: OrderedDict[tuple[str, str], CircuitBreaker] = OrderedDict()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "BreakerRegistry":
+        return cls(
+            enabled=settings.circuit_breaker_enabled,
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            window_seconds=settings.circuit_breaker_window_seconds,
+            cooldown_seconds=settings.circuit_breaker_cooldown_seconds,
+            max_entries=settings.model_registry_max_entries,
+        )
+
+    def get(self, key_id: str, model: str) -> CircuitBreaker:
+        key = (key_id, model)
+        breaker = self._breakers.get(key)
+        if breaker is not None:
+            self._breakers.move_to_end(key)
+            return breaker
+        breaker = CircuitBreaker(
+            failure_threshold=self.failure_threshold,
+            window_seconds=self.window_seconds,
+            cooldown_seconds=self.cooldown_seconds,
+        )
+        self._breakers[key] = breaker
+        self._evict_idle(keep=key)
+        return breaker
+
+    def _evict_idle(self, *, keep: tuple[str, str]) -> None:
+        excess = len(self._breakers) - self.max_entries
+        if excess <= 0:
+            return
+        idle = [key for key, breaker in self._breakers.items() if key != keep and breaker.is_idle()]
+        for key in idle[:excess]:
+            del self._breakers[key]
+            self.evictions += 1
+
+    def allow_request(self, key_id: str, model: str) -> bool:
+        return not self.enabled or self.get(key_id, model).allow_request()
+
+    def is_closed(self, key_id: str, model: str) -> bool:
+        """Whether ``model`` is healthy without claiming its half-open probe slot."""
+        return not self.enabled or self.get(key_id, model).state == "closed"
+
+    def record_success(self, key_id: str, model: str) -> None:
+        if not self.enabled:
+            return
+        breaker = self.get(key_id, model)
+        if breaker.state != "closed":
+            print(f"[INFO] Circuit for {model} closed after a successful probe.")
+        breaker.record_success()
+
+    def record_failure(self, key_id: str, model: str, exc: BaseException) -> None:
+        if not self.enabled or not counts_as_model_failure(exc):
+            return
+        breaker = self.get(key_id, model)
+        was_open = breaker.state == "open"
+        breaker.record_failure(timeout=isinstance(exc.__cause__, TimeoutError))
+        if not was_open and breaker.state == "open":
+            print(f"[WARNING] Circuit for {model} opened; routing its calls to fallback models.")
+
+    def snapshot(self, key_ids: Collection[str] | None = None) -> list[dict[str, Any]]:
+        """List breakers, optionally only those belonging to ``key_ids`` fingerprints."""
+        return [
+            {"api_key": key_id, "model": model, **breaker.snapshot()}
+            for (key_id, model), breaker in self._breakers.items()
+            if key_ids is None or key_id in key_ids
+        ]
+
+
+_default_registry: BreakerRegistry | None = None
+
+
+def get_breaker_registry(settings: Settings) -> BreakerRegistry:
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = BreakerRegistry.from_settings(settings)
+    return _default_registry
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib.util
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from .settings import Settings
+
+PoolKey = tuple[str, str]
+
+
+def api_key_fingerprint(api_key: str | None) -> str:
+    """Identify a credential without keeping the raw key in registries, stats, or logs."""
+    if not api_key:
+        return "server-default"
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class _PooledClient:
+    client: AsyncOpenAI
+    leases: int = 0
+
+
+class ClientPool:
+    """Share one keep-alive AsyncOpenAI client per (API key, base URL) across council runs.
+
+    Every ``LLMClient`` leases its upstream client from this registry, so repeated runs reuse
+    warm TCP/TLS connections to NIM. The registry is bounded: once it holds more than
+    ``max_clients`` entries, the least recently used client without active leases is closed.
+    Clients that are still leased are never evicted, so the bound is soft under heavy fan-out.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_clients: int = 16,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_seconds: float = 60.0,
+        http2: bool = False,
+    ) -> None:
+        self.max_clients = max(1, max_clients)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_seconds,
+        )
+        self.http2 = http2 and _http2_available()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clients: OrderedDict[PoolKey, _PooledClient] = OrderedDict()
+        self._closing: set[asyncio.Task[None]] = set()
+        # FastAPI's TestClient and threadpool endpoints can touch the registry off the loop thread.
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ClientPool":
+        return cls(
+            max_clients=settings.nvidia_client_pool_size,
+            max_connections=settings.nvidia_max_connections,
+            max_keepalive_connections=settings.nvidia_max_keepalive_connections,
+            keepalive_expiry_seconds=settings.nvidia_keepalive_expiry_seconds,
+            http2=settings.nvidia_http2,
+        )
+
+    def acquire(self, api_key: str | None, base_url: str) -> tuple[PoolKey, AsyncOpenAI]:
+        """Lease the pooled client for this credential, creating it on first use."""
+        key = (api_key_fingerprint(api_key), base_url)
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None:
+                self.hits += 1
+                entry.leases += 1
+                self._clients.move_to_end(key)
+                return key, entry.client
+            self.misses += 1
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=DefaultAsyncHttpxClient(limits=self.limits, http2=self.http2),
+            )
+            self._clients[key] = _PooledClient(client, leases=1)
+            evicted = self._evict_idle_locked()
+        self._close_later(evicted)
+        return key, client
+
+    def release(self, key: PoolKey, client: AsyncOpenAI) -> None:
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None and entry.client is client:
+                entry.leases = max(0, entry.leases - 1)
+            evicted = self._evict_idle_locked()
+        self._close_later(evicted)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "leased_clients": sum(1 for entry in self._clients.values() if entry.leases),
+                "max_clients": self.max_clients,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "http2": self.http2,
+            }
+
+    async def aclose(self) -> None:
+        """Close every pooled client; used on server shutdown."""
+        with self._lock:
+            clients = [entry.client for entry in self._clients.values()]
+            self._clients.clear()
+        await asyncio.gather(*(client.close() for client in clients), *self._closing, return_exceptions=True)
+        self._closing.clear()
+
+    def _evict_idle_locked(self) -> list[AsyncOpenAI]:
+        evicted: list[AsyncOpenAI] = []
+        while len(self._clients) > self.max_clients:
+            idle_key = next((key for key, entry in self._clients.items() if entry.leases == 0), None)
+            if idle_key is None:
+                break
+            evicted.append(self._clients.pop(idle_key).client)
+            self.evictions += 1
+        return evicted
+
+    def _close_later(self, clients: list[AsyncOpenAI]) -> None:
+        if not clients:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside the server loop there is nothing to await on; httpx releases sockets on GC.
+            return
+        for client in clients:
+            task = loop.create_task(client.close())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+
+def _http2_available() -> bool:
+    if importlib.util.find_spec("h2") is not None:
+        return True
+    print("[WARNING] NVIDIA_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1.")
+    return False
+
+
+_default_pool: ClientPool | None = None
+
+
+def get_client_pool(settings: Settings) -> ClientPool:
+    """Return the process-wide pool, created from the first settings that ask for it."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = ClientPool.from_settings(settings)
+    return _default_pool
+
+
+async def close_client_pool() -> None:
+    global _default_pool
+    pool, _default_pool = _default_pool, None
+    if pool is not None:
+        await pool.aclose()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from .settings import Settings
+
+CouncilEvent = dict[str, Any]
+_DELTA_SUFFIXES = ("_chunk", "_thinking")
+
+
+def is_delta_event(event: CouncilEvent) -> bool:
+    return str(event.get("type", "")).endswith(_DELTA_SUFFIXES) and isinstance(event.get("chunk"), str)
+
+
+class DeltaCoalescer:
+    """Merge token delta events per stream before they are encoded and written as SSE.
+
+    ``*_chunk`` and ``*_thinking`` events with the same type and agent/batch are joined into
+    one event until the oldest buffered delta is ``window_seconds`` old or the buffer holds
+    ``max_bytes`` of text. Any other event (``*_start``, ``*_done``, ``error``, ``done``)
+    flushes the buffer first, so phase boundaries are never reordered or delayed. Within a
+    flush, streams are emitted in the order their first delta arrived.
+    """
+
+    def __init__(self, *, window_seconds: float = 0.04, max_bytes: int = 4096) -> None:
+        self.window_seconds = window_seconds
+        self.max_bytes = max_bytes
+        self._pending: dict[tuple[Any, ...], CouncilEvent] = {}
+        self._pending_bytes = 0
+        self._oldest_at: float | None = None
+        self.events_in = 0
+        self.events_out = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "DeltaCoalescer":
+        return cls(
+            window_seconds=settings.sse_coalesce_window_ms / 1000.0,
+            max_bytes=settings.sse_coalesce_max_bytes,
+        )
+
+    def push(self, event: CouncilEvent) -> list[CouncilEvent]:
+        """Buffer ``event`` and return whatever must be written now, in order."""
+        self.events_in += 1
+        if self.window_seconds <= 0 or not is_delta_event(event):
+            return self._emit([*self._drain(), event])
+        key = (event["type"], event.get("agent"), event.get("batch"))
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = dict(event)
+        else:
+            pending["chunk"] += event["chunk"]
+        if self._oldest_at is None:
+            self._oldest_at = time.monotonic()
+        self._pending_bytes += len(event["chunk"])
+        if self._pending_bytes >= self.max_bytes or self.seconds_until_flush() == 0.0:
+            return self.flush()
+        return []
+
+    def seconds_until_flush(self) -> float | None:
+        """Time left before buffered deltas are due, or ``None`` when nothing is buffered."""
+        if self._oldest_at is None:
+            return None
+        return max(0.0, self._oldest_at + self.window_seconds - time.monotonic())
+
+    def flush(self) -> list[CouncilEvent]:
+        return self._emit(self._drain())
+
+    def _drain(self) -> list[CouncilEvent]:
+        events = list(self._pending.values())
+        self._pending.clear()
+        self._pending_bytes = 0
+        self._oldest_at = None
+        return events
+
+    def _emit(self, events: list[CouncilEvent]) -> list[CouncilEvent]:
+        self.events_out += len(events)
+        return events
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from .settings import Settings
+
+Outcome = Literal["success", "overload", "neutral"]
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for one (API key, model) pair with a fair FIFO wait queue.
+
+    The limit grows by roughly one slot per window of healthy completions (success with a
+    first-token latency under the threshold) and is cut multiplicatively on 429/5xx or
+    first-token timeouts. Only one cut is applied per generation, so a burst of failures from
+    requests that were already in flight does not collapse the limit to its floor.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_threshold_seconds: float = 10.0,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_threshold_seconds = latency_threshold_seconds
+        self.decrease_factor = decrease_factor
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._generation = 0
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self.acquired = 0
+        self.waited = 0
+        self.overloads = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.max_queue_depth = 0
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> "LimiterLease":
+        started = time.perf_counter()
+        if self._waiters or self._in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was granted just before cancellation; hand it to the next caller.
+                    self._in_flight -= 1
+                    self._wake()
+                elif waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                raise
+            waited = time.perf_counter() - started
+            self.waited += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        else:
+            self._in_flight += 1
+        self.acquired += 1
+        return LimiterLease(self, self._generation)
+
+    def _release(self, outcome: Outcome, latency_seconds: float | None, generation: int) -> None:
+        self._in_flight -= 1
+        if outcome == "success":
+            if latency_seconds is None or latency_seconds <= self.latency_threshold_seconds:
+                self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+        elif outcome == "overload":
+            self.overloads += 1
+            if generation == self._generation:
+                self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+                self._generation += 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queue_depth": len(self._waiters),
+            "max_queue_depth": self.max_queue_depth,
+            "acquired": self.acquired,
+            "waited": self.waited,
+            "overloads": self.overloads,
+            "avg_wait_seconds": round(self.total_wait_seconds / self.waited, 4) if self.waited else 0.0,
+            "max_wait_seconds": round(self.max_wait_seconds, 4),
+        }
+
+
+@dataclass
+class LimiterLease:
+    limiter: AdaptiveLimiter
+    generation: int
+    released: bool = False
+
+    def release(self, outcome: Outcome = "neutral", latency_seconds: float | None = None) -> None:
+        """Return the slot exactly once; later calls (e.g. from a finally block) are no-ops."""
+        if self.released:
+            return
+        self.released = True
+        self.limiter._release(outcome, latency_seconds, self.generation)
+
+
+class LimiterRegistry:
+    """Process-wide limiters keyed by (API key fingerprint, model).
+
+    Both parts of the key come from callers, so the registry is bounded: past
+    ``max_entries`` the least recently used limiters with nothing in flight or queued are
+    dropped. Busy limiters are never evicted, so the bound is soft under heavy fan-out.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_threshold_seconds: float = 10.0,
+        max_entries: int = 512,
+    ) -> None:
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_threshold_seconds = latency_threshold_seconds
+        self.max_entries = max(1, max_entries)
+        self.evictions = 0
+        self._limiters: OrderedDict[tuple[str, str], AdaptiveLimiter] = OrderedDict()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "LimiterRegistry":
+        return cls(
+            initial_limit=settings.nvidia_concurrency_initial_limit,
+            min_limit=settings.nvidia_concurrency_min_limit,
+            max_limit=settings.nvidia_concurrency_max_limit,
+            latency_threshold_seconds=settings.nvidia_concurrency_latency_threshold_seconds,
+            max_entries=settings.model_registry_max_entries,
+        )
+
+    def get(self, key_id: str, model: str) -> AdaptiveLimiter:
+        key = (key_id, model)
+        limiter = self._limiters.get(key)
+        if limiter is not None:
+            self._limiters.move_to_end(key)
+            return limiter
+        limiter = AdaptiveLimiter(
+            initial_limit=self.initial_limit,
+            min_limit=self.min_limit,
+            max_limit=self.max_limit,
+            latency_threshold_seconds=self.latency_threshold_seconds,
+        )
+        self._limiters[key] = limiter
+        self._evict_idle(keep=key)
+        return limiter
+
+    def _evict_idle(self, *, keep: tuple[str, str]) -> None:
+        excess = len(self._limiters) - self.max_entries
+        if excess <= 0:
+            return
+        idle = [
+            key for key, limiter in self._limiters.items()
+            if key != keep and not limiter.in_flight and not limiter.queue_depth
+        ]
+        for key in idle[:excess]:
+            del self._limiters[key]
+            self.evictions += 1
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [
+            {"api_key": key_id, "model": model, **limiter.stats()}
+            for (key_id, model), limiter in self._limiters.items()
+        ]
+
+
+_default_registry: LimiterRegistry | None = None
+
+
+def get_limiter_registry(settings: Settings) -> LimiterRegistry:
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = LimiterRegistry.from_settings(settings)
+    return _default_registry
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Literal, Sequence
+
+from .client_pool import api_key_fingerprint
+from .settings import Settings
+
+CouncilCacheMode = Literal["off", "replay", "offer"]
+COUNCIL_CACHE_MODES: tuple[str, ...] = ("off", "replay", "offer")
+FINGERPRINT_BITS = 64
+LSH_BANDS = 8
+_BAND_BITS = FINGERPRINT_BITS // LSH_BANDS
+_WORD = re.compile(r"[a-z0-9]+")
+# Filler words that paraphrases add or drop without changing the question.
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "be", "can", "could", "do", "does", "for", "i", "in", "is",
+    "it", "me", "of", "on", "or", "please", "so", "tell", "the", "to", "what", "whats", "would", "you",
+})
+_MERGEABLE_SUFFIXES = ("_chunk", "_thinking")
+
+
+def normalize_query(query: str) -> list[str]:
+    """Lowercase, strip punctuation and filler words; the result is the SimHash feature source."""
+    words = _WORD.findall(query.casefold())
+    return [word for word in words if word not in _STOPWORDS] or words
+
+
+def simhash(words: Sequence[str]) -> int:
+    """64-bit SimHash over unigrams and bigrams, so word order matters but only weakly."""
+    features = list(words) + [f"{left} {right}" for left, right in zip(words, words[1:])]
+    weights = [0] * FINGERPRINT_BITS
+    for feature in features:
+        digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if digest >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def similarity(left: int, right: int) -> float:
+    return 1.0 - bin(left ^ right).count("1") / FINGERPRINT_BITS
+
+
+def council_context_key(
+    selected_agents: Sequence[str],
+    custom_model_map: dict[str, str] | None,
+    custom_agents: list[dict[str, str]] | None,
+    pipeline: str = "full",
+    finalizer_mode: str = "single",
+    custom_api_key: str | None = None,
+) -> str:
+    """Runs only share answers when the same council (agents, prompts, models) would answer.
+
+    The caller's key is part of the context, so one tenant's answers are never replayed to
+    another.
+    """
+    context: dict[str, Any] = {
+        "agents": list(selected_agents),
+        "models": custom_model_map or {},
+        "registry": custom_agents or [],
+        "api_key": api_key_fingerprint(custom_api_key),
+    }
+    if pipeline != "full":
+        # Keep existing keys stable for full runs; express and sectional answers are cached separately.
+        context["pipeline"] = pipeline
+    if finalizer_mode != "single":
+        context["finalizer_mode"] = finalizer_mode
+    material = json.dumps(context, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def compact_events(events: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Merge every chunk/thinking event of one stream into its first occurrence.
+
+    A live run emits thousands of tiny deltas; the replayed run keeps the same phase order
+    and per-agent text while storing one event per stream.
+    """
+    compacted: list[dict[str, Any]] = []
+    open_streams: dict[tuple[Any, ...], dict[str, Any]] = {}
+    for event in events:
+        event_type = event.get("type", "")
+        if event_type.endswith(_MERGEABLE_SUFFIXES) and isinstance(event.get("chunk"), str):
+            stream_key = (event_type, event.get("agent"), event.get("batch"))
+            merged = open_streams.get(stream_key)
+            if merged is None:
+                merged = dict(event)
+                open_streams[stream_key] = merged
+                compacted.append(merged)
+            else:
+                merged["chunk"] += event["chunk"]
+            continue
+        compacted.append(dict(event))
+    return compacted
+
+
+@dataclass
+class CouncilCacheEntry:
+    context: str
+    query: str
+    fingerprint: int
+    events: list[dict[str, Any]]
+    nbytes: int
+    created_at: float
+
+
+@dataclass(frozen=True)
+class CouncilCacheMatch:
+    entry: CouncilCacheEntry
+    similarity: float
+
+    @property
+    def final_report(self) -> str:
+        return "".join(event["chunk"] for event in self.entry.events if event.get("type") == "finalizer_chunk")
+
+
+class CouncilCache:
+    """Bounded near-duplicate index of completed council runs.
+
+    Queries are fingerprinted with SimHash and indexed by locality-sensitive bands: with
+    eight 8-bit bands, any stored query within seven differing bits shares at least one band
+    with the lookup, so candidates are found without scanning every entry. Entries are
+    partitioned by council context, evicted LRU past ``max_entries`` or ``max_bytes`` of
+    stored events, and expire after ``ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        *,
+        mode: CouncilCacheMode = "replay",
+        similarity_threshold: float = 0.9,
+        max_entries: int = 256,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl_seconds: float = 86400.0,
+    ) -> None:
+        self.mode = mode
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[int, CouncilCacheEntry] = OrderedDict()
+        self._bands: dict[tuple[str, int, int], set[int]] = {}
+        self._next_id = 0
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "CouncilCache":
+        return cls(
+            mode=settings.council_cache_mode,  # type: ignore[arg-type]
+            similarity_threshold=settings.council_cache_similarity,
+            max_entries=settings.council_cache_max_entries,
+            max_bytes=settings.council_cache_max_bytes,
+            ttl_seconds=settings.council_cache_ttl_seconds,
+        )
+
+    @staticmethod
+    def _band_keys(context: str, fingerprint: int) -> list[tuple[str, int, int]]:
+        mask = (1 << _BAND_BITS) - 1
+        return [(context, band, fingerprint >> (band * _BAND_BITS) & mask) for band in range(LSH_BANDS)]
+
+    def lookup(self, query: str, context: str) -> CouncilCacheMatch | None:
+        fingerprint = simhash(normalize_query(query))
+        candidates: set[int] = set()
+        for band_key in self._band_keys(context, fingerprint):
+            candidates.update(self._bands.get(band_key, ()))
+        best: CouncilCacheMatch | None = None
+        best_id = -1
+        now = time.time()
+        for entry_id in candidates:
+            entry = self._entries[entry_id]
+            if self.ttl_seconds > 0 and now - entry.created_at > self.ttl_seconds:
+                self._remove(entry_id)
+                self.expirations += 1
+                continue
+            score = similarity(fingerprint, entry.fingerprint)
+            if score >= self.similarity_threshold and (best is None or score > best.similarity):
+                best = CouncilCacheMatch(entry=entry, similarity=score)
+                best_id = entry_id
+        if best is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(best_id)
+        self.hits += 1
+        return best
+
+    def store(self, query: str, context: str, events: Sequence[dict[str, Any]]) -> None:
+        compacted = compact_events(events)
+        nbytes = len(json.dumps(compacted).encode("utf-8"))
+        if nbytes > self.max_bytes:
+            return
+        fingerprint = simhash(normalize_query(query))
+        for band_key in self._band_keys(context, fingerprint):
+            for entry_id in list(self._bands.get(band_key, ())):
+                if self._entries[entry_id].fingerprint == fingerprint:
+                    # A repeat of a stored query refreshes that entry instead of duplicating it.
+                    self._remove(entry_id)
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = CouncilCacheEntry(
+            context=context,
+            query=query,
+            fingerprint=fingerprint,
+            events=compacted,
+            nbytes=nbytes,
+            created_at=time.time(),
+        )
+        for band_key in self._band_keys(context, fingerprint):
+            self._bands.setdefault(band_key, set()).add(entry_id)
+        self._bytes += nbytes
+        self.stores += 1
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        self._bytes -= entry.nbytes
+        for band_key in self._band_keys(entry.context, entry.fingerprint):
+            bucket = self._bands.get(band_key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._bands[band_key]
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+_default_cache: CouncilCache | None = None
+
+
+def get_council_cache(settings: Settings) -> CouncilCache | None:
+    """Return the process-wide council cache, or ``None`` when COUNCIL_CACHE_MODE is off."""
+    global _default_cache
+    if settings.council_cache_mode not in COUNCIL_CACHE_MODES:
+        print(f"[WARNING] Unknown COUNCIL_CACHE_MODE {settings.council_cache_mode!r}; council cache disabled.")
+        return None
+    if settings.council_cache_mode == "off":
+        return None
+    if _default_cache is None:
+        _default_cache = CouncilCache.from_settings(settings)
+    return _default_cache
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable
+
+from .settings import Settings
+
+
+@dataclass
+class _ModelHedgeStats:
+    ttft: deque[float]
+    requests: int = 0
+    hedges: int = 0
+    wins: int = 0
+    extra_tokens: int = 0
+
+
+class HedgeController:
+    """Tracks time-to-first-token per model and decides when a duplicate request is worth it.
+
+    A hedge fires when a stream has produced no token after the configured percentile of
+    recently observed TTFT for its model. Until ``min_samples`` observations exist the model
+    is never hedged, so cold models do not double their traffic.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = False,
+        percentile: float = 0.9,
+        min_samples: int = 20,
+        min_delay_seconds: float = 1.0,
+        window: int = 200,
+    ) -> None:
+        self.enabled = enabled
+        self.percentile = min(max(percentile, 0.0), 1.0)
+        self.min_samples = max(1, min_samples)
+        self.min_delay_seconds = min_delay_seconds
+        self.window = window
+        self._models: dict[str, _ModelHedgeStats] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "HedgeController":
+        return cls(
+            enabled=settings.nvidia_hedging,
+            percentile=settings.nvidia_hedge_percentile,
+            min_samples=settings.nvidia_hedge_min_samples,
+            min_delay_seconds=settings.nvidia_hedge_min_delay_seconds,
+        )
+
+    def _stats(self, model: str) -> _ModelHedgeStats:
+        stats = self._models.get(model)
+        if stats is None:
+            stats = _ModelHedgeStats(ttft=deque(maxlen=self.window))
+            self._models[model] = stats
+        return stats
+
+    def record_ttft(self, model: str, seconds: float) -> None:
+        self._stats(model).ttft.append(seconds)
+
+    def hedge_delay(self, model: str) -> float | None:
+        """Seconds to wait for a first token before hedging, or ``None`` when not enough is known."""
+        samples = sorted(self._stats(model).ttft)
+        if len(samples) < self.min_samples:
+            return None
+        index = min(len(samples) - 1, int(self.percentile * len(samples)))
+        return max(self.min_delay_seconds, samples[index])
+
+    def record_outcome(self, model: str, *, hedged: bool, hedge_won: bool, extra_tokens: int) -> None:
+        stats = self._stats(model)
+        stats.requests += 1
+        if hedged:
+            stats.hedges += 1
+            stats.extra_tokens += extra_tokens
+        if hedge_won:
+            stats.wins += 1
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "model": model,
+                "ttft_samples": len(stats.ttft),
+                "hedge_delay_seconds": self.hedge_delay(model),
+                "requests": stats.requests,
+                "hedges": stats.hedges,
+                "hedge_rate": round(stats.hedges / stats.requests, 4) if stats.requests else 0.0,
+                "hedge_wins": stats.wins,
+                "extra_tokens": stats.extra_tokens,
+            }
+            for model, stats in self._models.items()
+        ]
+
+
+@dataclass
+class _Contender:
+    model: str
+    task: asyncio.Task[None]
+    queue: asyncio.Queue[tuple[str, Any]]
+    alive: bool = True
+    error: BaseException | None = None
+
+
+def _start_contender(stream: AsyncIterator[Any], model: str) -> _Contender:
+    queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+
+    async def pump() -> None:
+        try:
+            async with aclosing(stream):
+                async for update in stream:
+                    await queue.put(("update", update))
+            await queue.put(("end", None))
+        except Exception as exc:
+            await queue.put(("error", exc))
+
+    return _Contender(model=model, task=asyncio.create_task(pump()), queue=queue)
+
+
+async def race_streams(
+    open_stream: Callable[[str], AsyncIterator[Any]],
+    primary_model: str,
+    hedge_model: str,
+    hedge_delay: float,
+    on_outcome: Callable[[bool, bool], None] | None = None,
+) -> AsyncIterator[Any]:
+    """Stream ``primary_model`` and, if it is silent for ``hedge_delay``, race a duplicate.
+
+    The first contender to produce any update wins; the other is cancelled, which closes its
+    upstream stream. ``on_outcome(hedged, hedge_won)`` is called once the winner is known so
+    callers can annotate the terminal usage record.
+    """
+    contenders = [_start_contender(open_stream(primary_model), primary_model)]
+    hedged = False
+    winner: _Contender | None = None
+    first_update: Any = None
+    try:
+        while winner is None:
+            getters = {asyncio.ensure_future(contender.queue.get()): contender for contender in contenders if contender.alive}
+            done, pending = await asyncio.wait(
+                getters,
+                timeout=None if hedged else hedge_delay,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for getter in pending:
+                getter.cancel()
+            if not done:
+                hedged = True
+                print(f"[WARNING] No first token from {primary_model} after {hedge_delay:.2f}s; hedging to {hedge_model}.")
+                contenders.append(_start_contender(open_stream(hedge_model), hedge_model))
+                continue
+            for getter in done:
+                contender = getters[getter]
+                kind, payload = getter.result()
+                if kind == "update" and winner is None:
+                    winner, first_update = contender, payload
+                elif kind == "error":
+                    contender.alive, contender.error = False, payload
+                elif kind == "end":
+                    contender.alive = False
+            if winner is None and not any(contender.alive for contender in contenders):
+                raise contenders[0].error or RuntimeError(f"NVIDIA NIM stream from {primary_model} ended without output")
+        losers = [contender.task for contender in contenders if contender is not winner]
+        for task in losers:
+            task.cancel()
+        await asyncio.gather(*losers, return_exceptions=True)
+        if on_outcome is not None:
+            on_outcome(hedged, winner is not contenders[0])
+        yield first_update
+        while True:
+            kind, payload = await winner.queue.get()
+            if kind == "end":
+                return
+            if kind == "error":
+                raise payload
+            yield payload
+    finally:
+        tasks = [contender.task for contender in contenders if not contender.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_default_controller: HedgeController | None = None
+
+
+def get_hedge_controller(settings: Settings) -> HedgeController:
+    global _default_controller
+    if _default_controller is None:
+        _default_controller = HedgeController.from_settings(settings)
+    return _default_controller
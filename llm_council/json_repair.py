@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any
+
+CODE_FENCE = "code_fence"
+EXTRACTED = "extracted"
+TRAILING_COMMA = "trailing_comma"
+CLOSED_BRACKETS = "closed_brackets"
+DROPPED_PARTIAL = "dropped_partial"
+REPAIR_KINDS = (CODE_FENCE, EXTRACTED, TRAILING_COMMA, CLOSED_BRACKETS, DROPPED_PARTIAL)
+
+_FENCE = re.compile(r"```[a-zA-Z]*[ \t]*\n?(.*?)(?:```|\Z)", re.DOTALL)
+_CLOSERS = {"{": "}", "[": "]"}
+# Cutting a truncated document back one member at a time stops after this many tries.
+MAX_TRUNCATION_CUTS = 64
+
+
+@dataclass(frozen=True)
+class JsonRepair:
+    value: Any
+    text: str
+    repairs: tuple[str, ...] = ()
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """Drop commas that directly precede ``}`` or ``]``, leaving string contents alone."""
+    out: list[str] = []
+    in_string = escaped = False
+    pending_comma: int | None = None
+    for char in text:
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char in "}]" and pending_comma is not None:
+            del out[pending_comma]
+        if char == ",":
+            pending_comma = len(out)
+        elif not char.isspace():
+            pending_comma = None
+        if char == '"':
+            in_string = True
+        out.append(char)
+    return "".join(out)
+
+
+def _scan_containers(text: str) -> tuple[list[tuple[int, int]], int | None]:
+    """Spans of balanced top-level ``{}``/``[]`` values, plus where an unclosed one starts."""
+    spans: list[tuple[int, int]] = []
+    stack: list[str] = []
+    start: int | None = None
+    in_string = escaped = False
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"' and stack:
+            in_string = True
+        elif char in _CLOSERS:
+            if not stack:
+                start = index
+            stack.append(_CLOSERS[char])
+        elif stack and char == stack[-1]:
+            stack.pop()
+            if not stack and start is not None:
+                spans.append((start, index + 1))
+                start = None
+        elif stack and char in "}]":
+            # A mismatched closer means this candidate is garbage; look for the next one.
+            stack.clear()
+            start = None
+    return spans, start if stack else None
+
+
+def _close(fragment: str) -> str:
+    """Terminate an open string, drop a dangling comma or key, and close open brackets."""
+    stack: list[str] = []
+    in_string = escaped = False
+    for char in fragment:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(_CLOSERS[char])
+        elif stack and char == stack[-1]:
+            stack.pop()
+    text = fragment + ('"' if in_string else "")
+    text = text.rstrip().rstrip(",").rstrip()
+    if text.endswith(":"):
+        text += " null"
+    return text + "".join(reversed(stack))
+
+
+def _member_cuts(fragment: str) -> list[int]:
+    """Comma positions outside strings, latest first: places to cut a truncated document back to."""
+    cuts: list[int] = []
+    in_string = escaped = False
+    for index, char in enumerate(fragment):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == ",":
+            cuts.append(index)
+    return cuts[::-1][:MAX_TRUNCATION_CUTS]
+
+
+def _load(text: str, repairs: list[str]) -> tuple[Any, list[str]] | None:
+    try:
+        return json.loads(text), repairs
+    except json.JSONDecodeError:
+        pass
+    cleaned = _strip_trailing_commas(text)
+    if cleaned != text:
+        try:
+            return json.loads(cleaned), [*repairs, TRAILING_COMMA]
+        except json.JSONDecodeError:
+            pass
+    return None
+
+
+def _recover_truncated(fragment: str, repairs: list[str]) -> tuple[Any, list[str]] | None:
+    loaded = _load(_close(fragment), [*repairs, CLOSED_BRACKETS])
+    if loaded is not None:
+        return loaded
+    for cut in _member_cuts(fragment):
+        loaded = _load(_close(fragment[:cut]), [*repairs, CLOSED_BRACKETS, DROPPED_PARTIAL])
+        if loaded is not None:
+            return loaded
+    return None
+
+
+def repair_json(raw: str) -> JsonRepair:
+    """Parse model output as JSON, repairing the damage models commonly do to it.
+
+    In order: strip a markdown code fence, pull the largest valid object or array out of
+    surrounding prose, drop trailing commas, and close a document cut off mid-way (closing
+    an open string and brackets, then cutting back one member at a time if that is not
+    enough). ``repairs`` names every step that was needed; it is empty for clean JSON.
+    Raises ``ValueError`` when nothing recoverable is found.
+    """
+    text = raw.strip()
+    repairs: list[str] = []
+    loaded = _load(text, repairs)
+    if loaded is not None:
+        value, applied = loaded
+        return JsonRepair(value=value, text=json.dumps(value), repairs=tuple(applied))
+    fence = _FENCE.search(text)
+    if fence:
+        text = fence.group(1).strip()
+        repairs.append(CODE_FENCE)
+        loaded = _load(text, repairs)
+        if loaded is not None:
+            value, applied = loaded
+            return JsonRepair(value=value, text=json.dumps(value), repairs=tuple(applied))
+
+    spans, unclosed_start = _scan_containers(text)
+    candidates: list[tuple[int, Any, list[str]]] = []
+    for start, end in spans:
+        extracted = repairs if (start, end) == (0, len(text)) else [*repairs, EXTRACTED]
+        loaded = _load(text[start:end], extracted)
+        if loaded is not None:
+            candidates.append((end - start, *loaded))
+    if unclosed_start is not None:
+        extracted = repairs if unclosed_start == 0 else [*repairs, EXTRACTED]
+        loaded = _recover_truncated(text[unclosed_start:], extracted)
+        if loaded is not None:
+            candidates.append((len(text) - unclosed_start, *loaded))
+    if not candidates:
+        raise ValueError("No recoverable JSON object found in the model output.")
+    _size, value, applied = max(candidates, key=lambda candidate: (isinstance(candidate[1], dict), candidate[0]))
+    return JsonRepair(value=value, text=json.dumps(value), repairs=tuple(applied))
+
+
+class JsonRepairStats:
+    """Per-model counts of structured outputs that parsed cleanly, needed repair, or were lost."""
+
+    def __init__(self) -> None:
+        self._models: dict[str, dict[str, Any]] = {}
+
+    def record(self, model: str, phase: str, repairs: tuple[str, ...] | None) -> None:
+        """``repairs`` is ``None`` when the output could not be recovered at all."""
+        state = self._models.setdefault(
+            model,
+            {"phases": set(), "parsed": 0, "repaired": 0, "failed": 0, "repairs": dict.fromkeys(REPAIR_KINDS, 0)},
+        )
+        state["phases"].add(phase)
+        if repairs is None:
+            state["failed"] += 1
+            return
+        state["parsed"] += 1
+        if repairs:
+            state["repaired"] += 1
+            for repair in repairs:
+                state["repairs"][repair] += 1
+
+    def stats(self) -> list[dict[str, Any]]:
+        results = []
+        for model, state in self._models.items():
+            seen = state["parsed"] + state["failed"]
+            results.append({
+                "model": model,
+                "phases": sorted(state["phases"]),
+                "outputs": seen,
+                "repaired": state["repaired"],
+                "failed": state["failed"],
+                "repair_rate": round(state["repaired"] / seen, 4) if seen else 0.0,
+                "failure_rate": round(state["failed"] / seen, 4) if seen else 0.0,
+                "repairs": {kind: count for kind, count in state["repairs"].items() if count},
+            })
+        return results
+
+
+_default_stats: JsonRepairStats | None = None
+
+
+def get_json_repair_stats() -> JsonRepairStats:
+    global _default_stats
+    if _default_stats is None:
+        _default_stats = JsonRepairStats()
+    return _default_stats
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+JsonPath = tuple[str | int, ...]
+WILDCARD = "*"
+_WHITESPACE = " \t\r\n"
+_PRIMITIVE_END = ",}]" + _WHITESPACE
+
+
+@dataclass
+class _Frame:
+    kind: str  # "{" or "["
+    key: str | int | None
+    expect: str  # object: key, colon, value, comma; array: value, comma
+    members: int = 0
+
+
+class IncrementalJsonParser:
+    """Scan streamed JSON text and report values at watched paths as soon as they close.
+
+    ``feed(delta)`` returns ``(path, value)`` pairs for every watched value completed by
+    that delta, so ``("reviews", "*")`` yields each scorecard as its closing brace arrives
+    and ``("structure", "*")`` yields each blueprint section as its string ends. Text before
+    the first ``{`` or ``[`` (prose, a code fence) and after the top-level value is ignored.
+    Malformed JSON stops the scan quietly: the final full parse stays authoritative.
+    """
+
+    def __init__(self, watch: Iterable[JsonPath]) -> None:
+        self.watch = [tuple(path) for path in watch]
+        self.completed: dict[JsonPath, Any] = {}
+        self.failed = False
+        self.finished = False
+        self._text = ""
+        self._pos = 0
+        self._stack: list[_Frame] = []
+        self._started = False
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._string_is_key = False
+        self._primitive_start: int | None = None
+        self._captures: dict[int, tuple[JsonPath, int]] = {}
+
+    def feed(self, delta: str) -> list[tuple[JsonPath, Any]]:
+        if self.failed or self.finished or not delta:
+            return []
+        self._text += delta
+        emitted: list[tuple[JsonPath, Any]] = []
+        try:
+            self._scan(emitted)
+        except ValueError:
+            self.failed = True
+        return emitted
+
+    def top_level(self) -> dict[str, Any]:
+        """Top-level fields whose values have fully arrived, in a partial or complete object."""
+        return {path[0]: value for path, value in self.completed.items() if len(path) == 1 and isinstance(path[0], str)}
+
+    def _path(self) -> JsonPath:
+        return tuple(frame.key for frame in self._stack)  # type: ignore[misc]
+
+    def _watched(self, path: JsonPath) -> bool:
+        return any(
+            len(pattern) == len(path) and all(part == WILDCARD or part == key for part, key in zip(pattern, path))
+            for pattern in self.watch
+        )
+
+    def _complete(self, path: JsonPath, start: int, end: int, emitted: list[tuple[JsonPath, Any]]) -> None:
+        if len(path) == 1 or self._watched(path):
+            value = json.loads(self._text[start:end])
+            if len(path) == 1:
+                self.completed[path] = value
+            if self._watched(path):
+                emitted.append((path, value))
+        if self._stack:
+            self._stack[-1].expect = "comma"
+        else:
+            self.finished = True
+
+    def _begin_value(self, char: str, index: int) -> None:
+        path = self._path()
+        if char in "{[":
+            self._stack.append(_Frame(kind=char, key=None if char == "{" else 0, expect="key" if char == "{" else "value"))
+            self._captures[len(self._stack)] = (path, index)
+        elif char == '"':
+            self._in_string = True
+            self._string_is_key = False
+            self._string_start = index
+        elif char in "-0123456789tfn":
+            self._primitive_start = index
+        else:
+            raise ValueError(f"unexpected {char!r} at {index}")
+
+    def _scan(self, emitted: list[tuple[JsonPath, Any]]) -> None:
+        text = self._text
+        index = self._pos
+        while index < len(text) and not self.finished:
+            char = text[index]
+            if not self._started:
+                if char in "{[":
+                    self._started = True
+                    self._begin_value(char, index)
+                index += 1
+                continue
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._string_is_key:
+                        frame = self._stack[-1]
+                        frame.key = json.loads(text[self._string_start:index + 1])
+                        frame.expect = "colon"
+                    else:
+                        self._complete(self._path(), self._string_start, index + 1, emitted)
+                index += 1
+                continue
+            if self._primitive_start is not None:
+                if char not in _PRIMITIVE_END:
+                    index += 1
+                    continue
+                start, self._primitive_start = self._primitive_start, None
+                self._complete(self._path(), start, index, emitted)
+                continue  # the delimiter is handled by the containing frame below
+            if char in _WHITESPACE:
+                index += 1
+                continue
+            frame = self._stack[-1]
+            closes = (frame.kind == "{" and char == "}") or (frame.kind == "[" and char == "]")
+            if closes and (frame.expect == "comma" or frame.members == 0):
+                path, start = self._captures.pop(len(self._stack))
+                self._stack.pop()
+                self._complete(path, start, index + 1, emitted)
+            elif frame.expect == "comma" and char == ",":
+                if frame.kind == "[":
+                    frame.key = int(frame.key or 0) + 1
+                frame.expect = "key" if frame.kind == "{" else "value"
+            elif frame.expect == "key" and char == '"':
+                frame.members += 1
+                self._in_string = True
+                self._string_is_key = True
+                self._string_start = index
+            elif frame.expect == "colon" and char == ":":
+                frame.expect = "value"
+            elif frame.expect == "value":
+                if frame.kind == "[":
+                    frame.members += 1
+                self._begin_value(char, index)
+            else:
+                raise ValueError(f"unexpected {char!r} at {index}")
+            index += 1
+        self._pos = index
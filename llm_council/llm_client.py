@@ -1,17 +1,73 @@
 import asyncio
+import inspect
 import json
-import random
 import re
-from dataclasses import dataclass
-from typing import AsyncIterator, Optional, Any
+import time
+import weakref
+from contextlib import aclosing
+from dataclasses import dataclass, replace
+from typing import AsyncIterator, Callable, Optional, Any, Sequence
 
-from openai import AsyncOpenAI, APIStatusError
+from openai import APIStatusError
 
+from .capabilities import CapabilityCache, get_capability_cache
+from .circuit_breaker import BreakerRegistry, get_breaker_registry
+from .client_pool import ClientPool, api_key_fingerprint, get_client_pool
+from .concurrency import LimiterRegistry, get_limiter_registry
+from .hedging import HedgeController, get_hedge_controller, race_streams
+from .metrics import CouncilMetrics, get_metrics
+from .response_cache import CachedResponse, ResponseCache, get_response_cache, is_cacheable, response_cache_key
+from .retry import RetryScheduler, get_retry_scheduler, is_retryable
 from .settings import DEFAULT_MODEL_MAP, Settings, get_settings
+from .stalls import STITCH_WINDOW_CHARS, StallMonitor, continuation_messages, get_stall_monitor, stitch_overlap
+from .structured_output import StructuredOutputCompiler, downgrade_mode, get_structured_output_compiler
 
 UsageDict = dict[str, int]
 
 
+async def close_upstream(stream: Any) -> None:
+    """Close an OpenAI ``AsyncStream`` (or any async iterator) without raising."""
+    close = getattr(stream, "close", None) or getattr(stream, "aclose", None)
+    if close is None:
+        return
+    try:
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+    except Exception as exc:  # pragma: no cover - best-effort cleanup
+        print(f"[WARNING] Failed to close NVIDIA NIM stream: {exc}")
+
+
+_PARAMETER_HINTS = {
+    "json_schema": ("response_format", "json_schema"),
+    "json_object": ("response_format", "json_object"),
+    "guided_json": ("guided_json", "nvext"),
+}
+
+
+def sent_parameters(kwargs: dict[str, Any]) -> list[str]:
+    """Negotiable parameters in a request, in the order a 400/422 strips them."""
+    sent = []
+    if "extra_body" in kwargs:
+        sent.append("guided_json")
+    elif "response_format" in kwargs:
+        sent.append(kwargs["response_format"].get("type", "json_object"))
+    sent.extend(name for name in ("reasoning_effort", "stream_options") if name in kwargs)
+    return sent
+
+
+def rejected_parameter(exc: APIStatusError, kwargs: dict[str, Any]) -> str | None:
+    """The parameter a 400/422 names, else the first one the stripping order would drop."""
+    sent = sent_parameters(kwargs)
+    if not sent:
+        return None
+    message = f"{exc} {getattr(exc, 'body', '') or ''}".lower()
+    for name in sent:
+        if any(hint in message for hint in _PARAMETER_HINTS.get(name, (name,))):
+            return name
+    return sent[0]
+
+
 @dataclass(frozen=True)
 class StreamUpdate:
     """One upstream token delta or the terminal usage record for a request."""
@@ -20,19 +76,61 @@ class StreamUpdate:
     reasoning: str = ""
     usage: UsageDict | None = None
     model: str | None = None
+    cache_hit: bool = False
 
 class LLMClient:
-    def __init__(self, api_key: Optional[str] = None, settings: Optional[Settings] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        settings: Optional[Settings] = None,
+        pool: Optional[ClientPool] = None,
+        limiters: Optional[LimiterRegistry] = None,
+        retries: Optional[RetryScheduler] = None,
+        hedging: Optional[HedgeController] = None,
+        breakers: Optional[BreakerRegistry] = None,
+        response_cache: Optional[ResponseCache] = None,
+        structured_output: Optional[StructuredOutputCompiler] = None,
+        capabilities: Optional[CapabilityCache] = None,
+        stalls: Optional[StallMonitor] = None,
+        metrics: Optional[CouncilMetrics] = None,
+    ):
         self.settings = settings or get_settings()
         self.mock_mode = self.settings.use_mock_mode
         
         # Use a browser-provided NVIDIA key when available, otherwise use the server key.
         target_key = api_key if api_key else self.settings.nvidia_api_key
+        self.key_id = api_key_fingerprint(target_key)
+        if limiters is None and self.settings.nvidia_adaptive_concurrency:
+            limiters = get_limiter_registry(self.settings)
+        self.limiters = limiters
+        self.retries = retries or get_retry_scheduler(self.settings)
+        self.hedging = hedging or get_hedge_controller(self.settings)
+        self.breakers = breakers or get_breaker_registry(self.settings)
+        self.response_cache = response_cache if response_cache is not None else get_response_cache(self.settings)
+        self.structured_output = structured_output or get_structured_output_compiler(self.settings)
+        self.capabilities = capabilities or get_capability_cache(self.settings)
+        self.stalls = stalls or get_stall_monitor(self.settings)
+        self.metrics = metrics or get_metrics(self.settings)
         
-        self.openai_client = AsyncOpenAI(
-            api_key=target_key,
-            base_url=self.settings.nvidia_api_base_url,
-        ) if not self.mock_mode else None
+        self.openai_client = None
+        self._release_lease: weakref.finalize | None = None
+        if not self.mock_mode:
+            # Lease a shared keep-alive client so each run reuses warm NIM connections.
+            client_pool = pool or get_client_pool(self.settings)
+            pool_key, self.openai_client = client_pool.acquire(target_key, self.settings.nvidia_api_base_url)
+            # ``aclose`` returns the lease; the finalizer only covers clients nobody closed.
+            self._release_lease = weakref.finalize(self, client_pool.release, pool_key, self.openai_client)
+
+    async def aclose(self) -> None:
+        """Return the pooled upstream client; safe to call more than once."""
+        if self._release_lease is not None:
+            self._release_lease()
+
+    async def __aenter__(self) -> "LLMClient":
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        await self.aclose()
         
     async def generate(self, prompt: str, schema: Optional[Any] = None, model: Optional[str] = None):
         """
@@ -53,8 +151,24 @@ class LLMClient:
         include_reasoning: bool = False,
         fallback_model: Optional[str] = None,
         first_response_timeout_seconds: float | None = None,
+        deadline: float | None = None,
+        hedge: bool | None = None,
+        fallback_chain: Sequence[str] = (),
+        role: str = "other",
     ) -> AsyncIterator[StreamUpdate]:
-        """Yield true NVIDIA NIM deltas followed by terminal token usage."""
+        """Yield true NVIDIA NIM deltas followed by terminal token usage.
+
+        Models are tried in order: ``model``, ``fallback_model``, then ``fallback_chain``.
+        A model whose circuit breaker is open is skipped without a request, and a model that
+        fails before any visible text hands over to the next one. ``deadline`` is a
+        ``time.monotonic()`` instant; retries never sleep past it. With ``hedge`` (default:
+        ``NVIDIA_HEDGING``), a request that has not produced a token by the model's observed
+        TTFT percentile is duplicated to the next model in the chain, and the slower
+        contender is cancelled. With a response cache configured, an identical earlier call
+        is replayed with its recorded usage and every update is marked ``cache_hit``; only
+        non-empty answers that parse against ``schema`` are stored.
+        ``role`` labels the call's latency and token metrics.
+        """
         if self.mock_mode:
             content, usage = await self._mock_generate(prompt, schema)
             for index in range(0, len(content), 48):
@@ -63,30 +177,148 @@ class LLMClient:
             yield StreamUpdate(usage=usage)
             return
 
-        emitted_content = False
-        try:
-            async for update in self._stream_messages(
-                [{"role": "user", "content": prompt}],
-                schema=schema,
-                model=model,
-                reasoning_effort=reasoning_effort,
-                include_reasoning=include_reasoning,
-                first_response_timeout_seconds=first_response_timeout_seconds,
-            ):
-                emitted_content = emitted_content or bool(update.delta)
+        model = model or DEFAULT_MODEL_MAP["generator_1"]
+        routed = self._stream_routed(
+            prompt, schema, model, reasoning_effort, include_reasoning, fallback_model,
+            first_response_timeout_seconds, deadline, hedge, fallback_chain, role,
+        )
+        async with aclosing(routed):
+            if self.response_cache is None:
+                async for update in routed:
+                    yield update
+                return
+
+            key = response_cache_key(self.key_id, model, prompt, schema, reasoning_effort)
+            cached = await self.response_cache.get(key)
+            if cached is not None:
+                async for update in self._replay_cached(cached, include_reasoning):
+                    yield update
+                return
+
+            content_parts: list[str] = []
+            reasoning_parts: list[str] = []
+            async for update in routed:
+                if update.usage is not None:
+                    # Only a stream that reached its usage record is complete enough to replay.
+                    content = "".join(content_parts)
+                    if is_cacheable(content, schema):
+                        await self.response_cache.put(key, CachedResponse(
+                            content=content,
+                            reasoning="".join(reasoning_parts),
+                            usage=update.usage,
+                            model=update.model or model,
+                            created_at=time.time(),
+                        ))
+                else:
+                    content_parts.append(update.delta)
+                    reasoning_parts.append(update.reasoning)
                 yield update
-        except RuntimeError:
-            if not fallback_model or emitted_content or fallback_model == model:
-                raise
-            print(f"[WARNING] Falling back from {model} to {fallback_model} after no visible response.")
-            async for update in self._stream_messages(
+
+    async def _replay_cached(self, cached: CachedResponse, include_reasoning: bool) -> AsyncIterator[StreamUpdate]:
+        if include_reasoning and cached.reasoning:
+            yield StreamUpdate(reasoning=cached.reasoning, cache_hit=True)
+        for index in range(0, len(cached.content), 512):
+            await asyncio.sleep(0)
+            yield StreamUpdate(delta=cached.content[index:index + 512], cache_hit=True)
+        yield StreamUpdate(usage=dict(cached.usage), model=cached.model, cache_hit=True)
+
+    async def _stream_routed(
+        self,
+        prompt: str,
+        schema: Optional[Any],
+        model: str,
+        reasoning_effort: Optional[str],
+        include_reasoning: bool,
+        fallback_model: Optional[str],
+        first_response_timeout_seconds: float | None,
+        deadline: float | None,
+        hedge: bool | None,
+        fallback_chain: Sequence[str],
+        role: str = "other",
+    ) -> AsyncIterator[StreamUpdate]:
+        """Route one call through breakers, fallbacks, and hedging as described in ``stream_generate``."""
+
+        def open_stream(target_model: str) -> AsyncIterator[StreamUpdate]:
+            return self._stream_messages(
                 [{"role": "user", "content": prompt}],
                 schema=schema,
-                model=fallback_model,
+                model=target_model,
                 reasoning_effort=reasoning_effort,
                 include_reasoning=include_reasoning,
                 first_response_timeout_seconds=first_response_timeout_seconds,
-            ):
+                deadline=deadline,
+                role=role,
+            )
+
+        hedge_enabled = self.hedging.enabled if hedge is None else hedge
+        chain = list(dict.fromkeys(
+            candidate for candidate in (model, fallback_model, *fallback_chain) if candidate
+        ))
+        last_error: RuntimeError | None = None
+        for index, candidate in enumerate(chain):
+            if not self.breakers.allow_request(self.key_id, candidate):
+                print(f"[WARNING] Circuit open for {candidate}; skipping to the next model.")
+                self.metrics.fallbacks.inc(candidate, "circuit_open")
+                continue
+            hedge_delay = self.hedging.hedge_delay(candidate) if hedge_enabled else None
+            # A half-open model's single probe belongs to a primary call, not a speculative hedge.
+            hedge_model = next(
+                (later for later in chain[index + 1:] if self.breakers.is_closed(self.key_id, later)),
+                candidate,
+            )
+            emitted_content = False
+            try:
+                async with aclosing(self._maybe_hedged(open_stream, candidate, hedge_model, hedge_delay)) as updates:
+                    async for update in updates:
+                        emitted_content = emitted_content or bool(update.delta)
+                        if update.usage is not None:
+                            self.breakers.record_success(self.key_id, update.model or candidate)
+                        yield update
+                return
+            except RuntimeError as exc:
+                self.breakers.record_failure(self.key_id, candidate, exc)
+                if emitted_content:
+                    raise
+                last_error = exc
+                if index + 1 < len(chain):
+                    self.metrics.fallbacks.inc(candidate, "error")
+                    print(f"[WARNING] Falling back from {candidate} to {chain[index + 1]} after no visible response.")
+        if last_error is not None:
+            raise last_error
+        raise RuntimeError(f"No healthy model available: circuit open for {', '.join(chain)}")
+
+    async def _maybe_hedged(
+        self,
+        open_stream: Callable[[str], AsyncIterator[StreamUpdate]],
+        model: str,
+        hedge_model: str,
+        hedge_delay: float | None,
+    ) -> AsyncIterator[StreamUpdate]:
+        """Run one stream, or a TTFT-hedged race, and report hedge cost on the usage record."""
+        if hedge_delay is None:
+            async with aclosing(open_stream(model)) as updates:
+                async for update in updates:
+                    yield update
+            return
+        outcome = {"hedged": False, "hedge_won": False}
+
+        def record(hedged: bool, hedge_won: bool) -> None:
+            outcome["hedged"], outcome["hedge_won"] = hedged, hedge_won
+
+        async with aclosing(race_streams(open_stream, model, hedge_model, hedge_delay, on_outcome=record)) as updates:
+            async for update in updates:
+                if update.usage is not None:
+                    # The cancelled contender was billed for its prompt but produced no tokens.
+                    extra_tokens = update.usage.get("prompt", 0) if outcome["hedged"] else 0
+                    self.hedging.record_outcome(
+                        model, hedged=outcome["hedged"], hedge_won=outcome["hedge_won"], extra_tokens=extra_tokens,
+                    )
+                    update = replace(update, usage={
+                        **update.usage,
+                        "hedged": int(outcome["hedged"]),
+                        "hedge_wins": int(outcome["hedge_won"]),
+                        "hedge_extra_tokens": extra_tokens,
+                    })
                 yield update
 
     async def stream_chat(
@@ -94,6 +326,7 @@ class LLMClient:
         messages: list[dict[str, str]],
         model: str,
         reasoning_effort: str = "medium",
+        role: str = "follow_up_chat",
     ) -> AsyncIterator[StreamUpdate]:
         """Stream a follow-up conversation, including provider reasoning when supplied."""
         if self.mock_mode:
@@ -105,13 +338,15 @@ class LLMClient:
             yield StreamUpdate(usage={"prompt": 100, "completion": 50, "total": 150})
             return
 
-        async for update in self._stream_messages(
+        async with aclosing(self._stream_messages(
             messages,
             model=model,
             reasoning_effort=reasoning_effort,
             include_reasoning=True,
-        ):
-            yield update
+            role=role,
+        )) as updates:
+            async for update in updates:
+                yield update
 
     async def _stream_messages(
         self,
@@ -121,24 +356,51 @@ class LLMClient:
         reasoning_effort: Optional[str] = None,
         include_reasoning: bool = False,
         first_response_timeout_seconds: float | None = None,
+        deadline: float | None = None,
+        role: str = "other",
     ) -> AsyncIterator[StreamUpdate]:
         """Shared NVIDIA stream implementation for council work and follow-up chat."""
 
         target_model = model if model else DEFAULT_MODEL_MAP["generator_1"]
+        base_url = self.settings.nvidia_api_base_url
+        # Leave out what this model already refused so the first request is the right one.
+        known = self.capabilities.accepts(base_url, target_model)
         kwargs: dict[str, Any] = {
             "model": target_model,
             "messages": messages,
             "stream": True,
-            "stream_options": {"include_usage": True},
         }
-        if reasoning_effort is not None:
+        if known.get("stream_options", True):
+            kwargs["stream_options"] = {"include_usage": True}
+        if reasoning_effort is not None and known.get("reasoning_effort", True):
             kwargs["reasoning_effort"] = reasoning_effort
-        if schema:
-            kwargs["response_format"] = {"type": "json_object"}
+        structured_mode = self._structured_mode(self.structured_output.default_mode if schema else "off", known)
+        kwargs.update(self.structured_output.request_params(target_model, schema, structured_mode))
+        rejected: dict[str, bool] = {}
         timeout_seconds = first_response_timeout_seconds or self.settings.nvidia_first_response_timeout_seconds
+        stall_timeout = self.stalls.timeout
+        # Text already sent to the caller, kept only when a stall may be continued from it.
+        sent_text: list[str] | None = [] if self.stalls.should_continue(0) else None
+        stitch_buffer: str | None = None
+        continuations = 0
+        # Usage reported by stalled attempts that were continued; the caller is billed for all of them.
+        continued_usage: UsageDict = {"prompt": 0, "completion": 0, "total": 0}
+
+        limiter = self.limiters.get(self.key_id, target_model) if self.limiters else None
+        self.retries.record_request(target_model)
 
-        for attempt in range(4):
+        attempt = 0
+        while True:
             emitted_content = False
+            # Hold a provider slot for the whole stream; waiters queue FIFO behind the model limit.
+            lease = await limiter.acquire() if limiter else None
+            attempt_started = time.perf_counter()
+            first_chunk_latency: float | None = None
+            first_token_at: float | None = None
+            last_chunk_at = attempt_started
+            max_gap = 0.0
+            stream = None
+            terminal_usage: UsageDict | None = None
             try:
                 print("\n[DEBUG] Starting NVIDIA NIM stream:")
                 print(f"Model: {target_model}")
@@ -146,16 +408,23 @@ class LLMClient:
                     self.openai_client.chat.completions.create(**kwargs),
                     timeout=timeout_seconds,
                 )
-                terminal_usage: UsageDict | None = None
                 stream_iterator = stream.__aiter__()
                 while True:
+                    # Before content the first-response limit applies; after it, the stall limit.
+                    chunk_timeout = stall_timeout if emitted_content else timeout_seconds
                     try:
                         chunk = await asyncio.wait_for(
                             anext(stream_iterator),
-                            timeout=timeout_seconds,
-                        ) if not emitted_content else await anext(stream_iterator)
+                            timeout=chunk_timeout,
+                        ) if chunk_timeout else await anext(stream_iterator)
                     except StopAsyncIteration:
                         break
+                    chunk_at = time.perf_counter()
+                    if emitted_content:
+                        max_gap = max(max_gap, chunk_at - last_chunk_at)
+                    last_chunk_at = chunk_at
+                    if first_chunk_latency is None:
+                        first_chunk_latency = time.perf_counter() - attempt_started
                     if chunk.usage:
                         terminal_usage = {
                             "prompt": chunk.usage.prompt_tokens or 0,
@@ -165,49 +434,121 @@ class LLMClient:
                     if not chunk.choices:
                         continue
                     stream_delta = chunk.choices[0].delta
-                    if include_reasoning:
+                    delta = stream_delta.content or ""
+                    reasoning = ""
+                    if include_reasoning or first_token_at is None:
                         # NVIDIA-compatible implementations use either field depending on runtime version.
+                        # Without reasoning delivery it is only read until the first token is timed.
                         reasoning = getattr(stream_delta, "reasoning_content", None) or getattr(stream_delta, "reasoning", None) or ""
-                        if isinstance(reasoning, str) and reasoning:
-                            yield StreamUpdate(reasoning=reasoning)
-                    delta = stream_delta.content or ""
+                    if first_token_at is None and (delta or reasoning):
+                        first_token_at = time.perf_counter()
+                        self.hedging.record_ttft(target_model, first_token_at - attempt_started)
+                        self.metrics.ttft.observe(first_token_at - attempt_started, target_model, role)
+                    if include_reasoning and isinstance(reasoning, str) and reasoning:
+                        yield StreamUpdate(reasoning=reasoning)
                     if delta:
                         emitted_content = True
-                        yield StreamUpdate(delta=delta)
-                yield StreamUpdate(usage=terminal_usage or {"prompt": 0, "completion": 0, "total": 0}, model=target_model)
+                        if stitch_buffer is not None:
+                            stitch_buffer += delta
+                            if len(stitch_buffer) < STITCH_WINDOW_CHARS:
+                                continue
+                            delta = stitch_buffer[stitch_overlap("".join(sent_text), stitch_buffer):]
+                            stitch_buffer = None
+                        if sent_text is not None:
+                            sent_text.append(delta)
+                        if delta:
+                            yield StreamUpdate(delta=delta)
+                if stitch_buffer:
+                    # The continuation ended inside the stitch window.
+                    yield StreamUpdate(delta=stitch_buffer[stitch_overlap("".join(sent_text), stitch_buffer):])
+                if lease:
+                    lease.release("success", first_chunk_latency)
+                self.stalls.record_stream(target_model, max_gap)
+                self.capabilities.record(base_url, target_model, {name: True for name in sent_parameters(kwargs)} | rejected)
+                usage = {key: continued_usage[key] + (terminal_usage or {}).get(key, 0) for key in continued_usage}
+                self.metrics.observe_usage(
+                    target_model, role, usage, time.perf_counter() - first_token_at if first_token_at is not None else None,
+                )
+                yield StreamUpdate(usage=usage, model=target_model)
                 return
             except TimeoutError as exc:
+                if lease:
+                    # A first-token timeout signals overload; a stall after output says nothing
+                    # about how many requests the model can take, so it must not shrink the limit.
+                    lease.release("neutral" if emitted_content else "overload")
+                if emitted_content:
+                    stalled = time.perf_counter() - last_chunk_at
+                    partial = "".join(sent_text or ())
+                    continued = bool(partial) and self.stalls.should_continue(continuations)
+                    self.stalls.record_stall(target_model, stalled, continued=continued)
+                    self.metrics.timeouts.inc(target_model, "stall")
+                    if not continued:
+                        raise RuntimeError(
+                            f"NVIDIA NIM stream from {target_model} stalled for {stalled:.0f}s after partial output"
+                        ) from exc
+                    continuations += 1
+                    if terminal_usage is not None:
+                        continued_usage = {key: continued_usage[key] + terminal_usage.get(key, 0) for key in continued_usage}
+                    print(f"[WARNING] NVIDIA NIM stream from {target_model} stalled for {stalled:.0f}s; asking it to continue.")
+                    # A schema constraint would force a fresh JSON document, not the rest of this one.
+                    kwargs.pop("response_format", None)
+                    kwargs.pop("extra_body", None)
+                    kwargs["messages"] = continuation_messages(messages, partial)
+                    stitch_buffer = ""
+                    continue
+                self.metrics.timeouts.inc(target_model, "first_response")
                 raise RuntimeError(
                     f"NVIDIA NIM did not produce a response from {target_model} within "
                     f"{timeout_seconds:.0f}s"
                 ) from exc
             except APIStatusError as exc:
                 print(f"[ERROR] NVIDIA NIM stream status error: {exc.status_code} - {exc}")
-                if exc.status_code in [400, 422] and not emitted_content:
-                    if "response_format" in kwargs:
-                        print("[WARNING] Retrying NVIDIA NIM stream without response_format.")
-                        del kwargs["response_format"]
-                        continue
-                    if "reasoning_effort" in kwargs:
-                        # Preserve compatibility with custom NIM models that do not expose this control.
-                        del kwargs["reasoning_effort"]
+                parameter = rejected_parameter(exc, kwargs) if exc.status_code in [400, 422] and not emitted_content else None
+                if parameter is not None:
+                    # Remembered as rejected only once the stripped request succeeds, so a 400
+                    # caused by something else (an oversized prompt) never poisons the cache.
+                    rejected[parameter] = False
+                    if parameter in ("reasoning_effort", "stream_options"):
+                        # Custom NIM models may not expose reasoning control or usage reporting.
+                        del kwargs[parameter]
                         continue
-                    if "stream_options" in kwargs:
-                        # Some OpenAI-compatible NIM deployments omit usage support.
-                        del kwargs["stream_options"]
-                        continue
-                retryable = exc.status_code in [429, 500, 502, 503, 504]
-                if emitted_content or not retryable or attempt == 3:
+                    # Step down json_schema/guided_json -> json_object -> no constraint.
+                    structured_mode = self._structured_mode(downgrade_mode(parameter), known)
+                    print(f"[WARNING] Retrying NVIDIA NIM stream with structured output mode {structured_mode}.")
+                    kwargs.pop("response_format", None)
+                    kwargs.pop("extra_body", None)
+                    kwargs.update(self.structured_output.request_params(target_model, schema, structured_mode))
+                    continue
+                if lease and is_retryable(exc):
+                    # Shrink the model's concurrency before any retry re-enters the queue.
+                    lease.release("overload")
+                delay = None if emitted_content else self.retries.next_delay(target_model, exc, attempt, deadline=deadline)
+                if delay is None:
                     raise RuntimeError(f"NVIDIA NIM stream failed: {exc}") from exc
             except Exception as exc:
-                retryable = any(code in str(exc) for code in ("429", "500", "502", "503", "504"))
-                if emitted_content or not retryable or attempt == 3:
+                delay = None if emitted_content else self.retries.next_delay(target_model, exc, attempt, deadline=deadline)
+                if delay is None:
                     raise RuntimeError(f"NVIDIA NIM stream failed: {exc}") from exc
+            finally:
+                if lease:
+                    lease.release()
+                # An abandoned consumer (client disconnect, hedge loser) must not leave the HTTP
+                # response open; closing it returns the connection to the pool immediately.
+                if stream is not None:
+                    await close_upstream(stream)
 
-            delay = 2 * (2 ** attempt) + (random.random() * 0.5)
+            attempt += 1
+            self.metrics.retries.inc(target_model)
             print(f"[WARNING] NVIDIA NIM stream retrying in {delay:.2f}s.")
             await asyncio.sleep(delay)
 
+    @staticmethod
+    def _structured_mode(mode: str, known: dict[str, bool]) -> str:
+        """First mode at or below ``mode`` that the model has not rejected."""
+        while mode != "off" and not known.get(mode, True):
+            mode = downgrade_mode(mode)
+        return mode
+
     async def _mock_generate(self, prompt: str, schema: Optional[Any] = None):
         await asyncio.sleep(0.5)
         
@@ -238,13 +579,16 @@ class LLMClient:
             "messages": [{"role": "user", "content": prompt}],
         }
         
+        base_url = self.settings.nvidia_api_base_url
+        known = self.capabilities.accepts(base_url, target_model)
         if schema:
-            kwargs["response_format"] = {"type": "json_object"}
+            mode = self._structured_mode(self.structured_output.default_mode, known)
+            kwargs.update(self.structured_output.request_params(target_model, schema, mode))
+        rejected: dict[str, bool] = {}
         
-        max_retries = 3
-        base_delay = 2
-        
-        for attempt in range(max_retries + 1):
+        self.retries.record_request(target_model)
+        attempt = 0
+        while True:
             try:
                 print("\n[DEBUG] Sending request to NVIDIA NIM:")
                 print(f"Model: {kwargs.get('model')}")
@@ -254,6 +598,8 @@ class LLMClient:
                      raise ValueError("Received empty response or no choices from API")
                 
                 content = response.choices[0].message.content
+                if rejected:
+                    self.capabilities.record(base_url, target_model, {name: True for name in sent_parameters(kwargs)} | rejected)
                 usage = {
                     "prompt": response.usage.prompt_tokens if response.usage else 0,
                     "completion": response.usage.completion_tokens if response.usage else 0,
@@ -267,40 +613,37 @@ class LLMClient:
                 if hasattr(e, 'body'):
                     print(f"[ERROR BODY] {e.body}")
 
-                # 422 FIX: If Unprocessable Content and we used json_object, try removing it.
-                if e.status_code == 422 and "response_format" in kwargs:
-                    print("[WARNING] 422 Unprocessable Content received. Retrying WITHOUT response_format constraint...")
-                    del kwargs["response_format"]
+                # A rejected structured output mode steps down the same ladder as streamed calls.
+                parameter = rejected_parameter(e, kwargs) if e.status_code in [400, 422] else None
+                if parameter is not None:
+                    rejected[parameter] = False
+                    mode = self._structured_mode(downgrade_mode(parameter), known)
+                    print(f"[WARNING] {e.status_code} received. Retrying with structured output mode {mode}...")
+                    kwargs.pop("response_format", None)
+                    kwargs.pop("extra_body", None)
+                    kwargs.update(self.structured_output.request_params(target_model, schema, mode))
                     continue
 
-                if attempt == max_retries:
-                    return f"Error calling NVIDIA NIM after {max_retries} retries: {error_msg}", {"prompt":0, "completion":0, "total":0}
-                
-                # Check for retryable codes
                 # Note: 422 is usually permanent unless params change, so we only filtered it above.
-                if e.status_code in [429, 500, 502, 503, 504]:
-                     delay = base_delay * (2 ** attempt) + (random.random() * 0.5)
-                     print(f"[Warning] Server error {e.status_code}. Retrying in {delay:.2f}s...")
-                     await asyncio.sleep(delay)
-                     continue
-                
-                # If not retryable or fixed
-                return f"Error calling NVIDIA NIM: {error_msg}", {"prompt":0, "completion":0, "total":0}
+                delay = self.retries.next_delay(target_model, e, attempt)
+                if delay is None:
+                    if attempt:
+                        return f"Error calling NVIDIA NIM after {attempt} retries: {error_msg}", {"prompt":0, "completion":0, "total":0}
+                    return f"Error calling NVIDIA NIM: {error_msg}", {"prompt":0, "completion":0, "total":0}
+                print(f"[Warning] Server error {e.status_code}. Retrying in {delay:.2f}s...")
 
             except Exception as e:
                 error_msg = str(e)
                 print(f"[ERROR] Generic API Call Failed: {error_msg}")
-                if attempt == max_retries:
-                    return f"Error calling NVIDIA NIM after {max_retries} retries: {error_msg}", {"prompt":0, "completion":0, "total":0}
-                
-                # Loose check for string-based errors (legacy or other libraries)
-                if "429" in error_msg or "500" in error_msg or "503" in error_msg:
-                    delay = base_delay * (2 ** attempt) + (random.random() * 0.5)
-                    print(f"[Warning] Error encountered. Retrying in {delay:.2f}s...")
-                    await asyncio.sleep(delay)
-                    continue # Try again
-                
-                return f"Error calling NVIDIA NIM: {error_msg}", {"prompt":0, "completion":0, "total":0}
+                delay = self.retries.next_delay(target_model, e, attempt)
+                if delay is None:
+                    if attempt:
+                        return f"Error calling NVIDIA NIM after {attempt} retries: {error_msg}", {"prompt":0, "completion":0, "total":0}
+                    return f"Error calling NVIDIA NIM: {error_msg}", {"prompt":0, "completion":0, "total":0}
+                print(f"[Warning] Error encountered. Retrying in {delay:.2f}s...")
+
+            attempt += 1
+            await asyncio.sleep(delay)
 
     async def check_connection(self, model: str) -> bool:
         """
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import argparse
 import asyncio
 import json
 
@@ -7,7 +8,7 @@ from .settings import PERSONA
 from .workflow import CouncilWorkflow, WorkflowRequest
 
 
-async def main() -> None:
+async def main(reasoning_mode: str = "none") -> None:
     council = CouncilWorkflow()
 
     print("Welcome to LLM Council")
@@ -32,7 +33,8 @@ async def main() -> None:
     ]
 
     print("Working...")
-    async for event in council.stream(WorkflowRequest(query=query, selected_agents=selected_agents)):
+    request = WorkflowRequest(query=query, selected_agents=selected_agents, reasoning_mode=reasoning_mode)
+    async for event in council.stream(request):
         event_type = event["type"]
         if event_type == "generator_start":
             print(f"Spawning {event['agent']} ({event['model']})")
@@ -43,6 +45,12 @@ async def main() -> None:
         elif event_type == "architect_result":
             print("[Architect] Blueprint ready")
             print(json.dumps(event, indent=2))
+        elif event_type == "generator_thinking_done" and "reasoning_chars" in event:
+            print(f"[{event['agent']}] reasoned for {event['reasoning_chars']} chars")
+        elif event_type == "finalizer_thinking" and reasoning_mode == "full":
+            print(event["chunk"], end="", flush=True)
+        elif event_type == "finalizer_thinking_done" and reasoning_mode == "full":
+            print()
         elif event_type == "finalizer_chunk":
             print(event["chunk"], end="", flush=True)
         elif event_type == "finalizer_done":
@@ -57,7 +65,15 @@ async def main() -> None:
 
 
 def cli() -> None:
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Run an LLM Council meeting from the terminal.")
+    parser.add_argument(
+        "--reasoning",
+        choices=("none", "summary", "full"),
+        default="none",
+        help="reasoning delivery: none skips it, summary prints character counts, full streams the finalizer's reasoning",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.reasoning))
 
 
 if __name__ == "__main__":
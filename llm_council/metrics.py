@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from typing import Any, Callable, Iterable
+
+from .settings import DEFAULT_MODEL_MAP, Settings, get_settings
+
+# Label value for model ids outside the configured model map and fallback chains.
+OTHER_MODEL = "other"
+# Upper bounds in seconds for the time to first token and for council phases.
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+COUNCIL_BUCKETS = (5.0, 10.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0, 180.0, 300.0, 600.0)
+TOKEN_RATE_BUCKETS = (1.0, 5.0, 10.0, 20.0, 40.0, 80.0, 160.0, 320.0, 640.0)
+
+LabelValues = tuple[str, ...]
+Collector = Callable[[], Iterable[tuple[LabelValues, float]]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric:
+    """One metric family: a name, its label names, and a value per label combination.
+
+    Recording is a dict lookup and an addition with no lock, so every instrument must be
+    updated from the event loop thread; the trace workers never record.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: dict[LabelValues, Any] = {}
+        # Set by ``CouncilMetrics`` so a ``model`` label cannot grow with caller-chosen ids.
+        self.model_label: Callable[[str], str] | None = None
+
+    def _key(self, labels: LabelValues) -> LabelValues:
+        if self.model_label is None or "model" not in self.labels:
+            return labels
+        index = self.labels.index("model")
+        return (*labels[:index], self.model_label(labels[index]), *labels[index + 1:])
+
+    def _label_text(self, values: LabelValues, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labels, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def _samples(self) -> Iterable[tuple[str, LabelValues, str, float]]:
+        """(suffix, label values, extra label, value) for every exposed sample."""
+        for values, value in self._values.items():
+            yield "", values, "", value
+
+    def render(self, lines: list[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.documentation}")
+        lines.append(f"# TYPE {self.name} {self.kind}")
+        for suffix, values, extra, value in self._samples():
+            lines.append(f"{self.name}{suffix}{self._label_text(values, extra)} {_format_value(value)}")
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        labels = self._key(labels)
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+
+class Gauge(Metric):
+    """A current value; with ``collect``, read from its source at scrape time instead."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = (), collect: Collector | None = None) -> None:
+        super().__init__(name, documentation, labels)
+        self.collect = collect
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        labels = self._key(labels)
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        labels = self._key(labels)
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def _samples(self) -> Iterable[tuple[str, LabelValues, str, float]]:
+        if self.collect is None:
+            yield from super()._samples()
+            return
+        try:
+            collected = list(self.collect())
+        except Exception as exc:  # pragma: no cover - a broken source must not fail the scrape
+            print(f"[WARNING] Metric {self.name} could not be collected: {exc}")
+            return
+        # Collapsed model ids share one sample, so values landing on the same labels are summed.
+        totals: dict[LabelValues, float] = {}
+        for values, value in collected:
+            key = self._key(values)
+            totals[key] = totals.get(key, 0.0) + value
+        for values, value in totals.items():
+            yield "", values, "", value
+
+
+class Histogram(Metric):
+    """Fixed buckets; each label combination keeps per-bucket counts plus a running sum."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        labels = self._key(labels)
+        state = self._values.get(labels)
+        if state is None:
+            # One slot per bucket, one for +Inf, then the sum.
+            state = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def _samples(self) -> Iterable[tuple[str, LabelValues, str, float]]:
+        for values, state in self._values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), state):
+                cumulative += count
+                yield "_bucket", values, f'le="{_format_value(bound)}"', cumulative
+            yield "_sum", values, "", state[-1]
+            yield "_count", values, "", cumulative
+
+    def snapshot(self, *labels: str) -> dict[str, float]:
+        state = self._values.get(self._key(labels))
+        if state is None:
+            return {"count": 0, "sum": 0.0}
+        return {"count": sum(state[:-1]), "sum": state[-1]}
+
+
+class CouncilMetrics:
+    """Process-wide counters and histograms served at ``/metrics`` in Prometheus text format.
+
+    ``LLMClient`` records each NIM stream at its first token and its usage record, labelled
+    by the model that answered and the council role that asked; the workflow records phase
+    and council durations; the server counts SSE clients and registers queue-depth gauges
+    that are read only when scraped.
+
+    Callers can name any model, so with ``known_models`` set a ``model`` label outside it
+    is recorded as ``other``; ``None`` records every model id as given.
+    """
+
+    def __init__(self, known_models: Iterable[str] | None = None) -> None:
+        self.known_models = frozenset(known_models) if known_models is not None else None
+        self._metrics: dict[str, Metric] = {}
+        self.ttft = self._add(Histogram(
+            "llm_council_llm_time_to_first_token_seconds",
+            "Time from sending a NIM request to its first content or reasoning token.",
+            ("model", "role"),
+        ))
+        self.token_rate = self._add(Histogram(
+            "llm_council_llm_tokens_per_second",
+            "Completion tokens per second after the first token, per stream.",
+            ("model", "role"),
+            TOKEN_RATE_BUCKETS,
+        ))
+        self.tokens = self._add(Counter(
+            "llm_council_llm_tokens_total",
+            "Tokens reported by NIM usage records.",
+            ("model", "role", "kind"),
+        ))
+        self.retries = self._add(Counter(
+            "llm_council_llm_retries_total",
+            "NIM requests retried after a retryable failure.",
+            ("model",),
+        ))
+        self.timeouts = self._add(Counter(
+            "llm_council_llm_timeouts_total",
+            "NIM streams that timed out before the first response or stalled after partial output.",
+            ("model", "kind"),
+        ))
+        self.fallbacks = self._add(Counter(
+            "llm_council_llm_fallbacks_total",
+            "Calls handed to the next model in a fallback chain (reason: error or circuit_open).",
+            ("model", "reason"),
+        ))
+        self.phase_duration = self._add(Histogram(
+            "llm_council_phase_duration_seconds",
+            "Wall time of each council phase.",
+            ("phase",),
+        ))
+        self.council_duration = self._add(Histogram(
+            "llm_council_council_duration_seconds",
+            "Wall time of a live council run.",
+            ("pipeline", "outcome"),
+            COUNCIL_BUCKETS,
+        ))
+        self.councils_in_flight = self._add(Gauge("llm_council_councils_in_flight", "Live council runs."))
+        self.councils_in_flight.inc(amount=0)  # exposed as 0 before the first run
+        self.sse_clients = self._add(Gauge("llm_council_sse_clients", "Open SSE responses.", ("endpoint",)))
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "CouncilMetrics":
+        chained = (model for chain in settings.fallback_chains.values() for model in chain)
+        return cls(known_models={*DEFAULT_MODEL_MAP.values(), *chained})
+
+    def model_label(self, model: str) -> str:
+        if self.known_models is None or model in self.known_models:
+            return model
+        return OTHER_MODEL
+
+    def _add(self, metric: Any) -> Any:
+        if "model" in metric.labels:
+            metric.model_label = self.model_label
+        self._metrics[metric.name] = metric
+        return metric
+
+    def watch(self, name: str, documentation: str, labels: tuple[str, ...], collect: Collector) -> Gauge:
+        """Register (or replace) a gauge read from ``collect`` at scrape time."""
+        return self._add(Gauge(name, documentation, labels, collect))
+
+    def observe_usage(self, model: str, role: str, usage: dict[str, int], streaming_seconds: float | None) -> None:
+        """A completed stream's usage record; ``streaming_seconds`` runs from its first token."""
+        prompt, completion = usage.get("prompt", 0), usage.get("completion", 0)
+        if prompt:
+            self.tokens.inc(model, role, "prompt", amount=prompt)
+        if completion:
+            self.tokens.inc(model, role, "completion", amount=completion)
+            if streaming_seconds:
+                self.token_rate.observe(completion / streaming_seconds, model, role)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            metric.render(lines)
+        return "\n".join(lines) + "\n"
+
+
+_default_metrics: CouncilMetrics | None = None
+
+
+def get_metrics(settings: Settings | None = None) -> CouncilMetrics:
+    global _default_metrics
+    if _default_metrics is None:
+        _default_metrics = CouncilMetrics.from_settings(settings or get_settings())
+    return _default_metrics
@@ -20,6 +20,8 @@ class PromptSet:
     critic: str
     architect: str
     finalizer: str
+    express: str
+    finalizer_section: str
 
 
 @lru_cache(maxsize=1)
@@ -29,5 +31,7 @@ def load_prompt_set() -> PromptSet:
         critic=load_prompt("2_critic.txt"),
         architect=load_prompt("3_architect.txt"),
         finalizer=load_prompt("4_finalizer.txt"),
+        express=load_prompt("5_express.txt"),
+        finalizer_section=load_prompt("6_finalizer_section.txt"),
     )
 
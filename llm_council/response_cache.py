@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from .json_repair import repair_json
+from .settings import Settings
+
+UsageDict = dict[str, int]
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    content: str
+    reasoning: str
+    usage: UsageDict
+    model: str
+    created_at: float
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.content.encode("utf-8")) + len(self.reasoning.encode("utf-8"))
+
+
+def response_cache_key(key_id: str, model: str, prompt: str, schema: Any, reasoning_effort: str | None) -> str:
+    """Key on (API key fingerprint, model, prompt hash, schema, reasoning effort).
+
+    The fingerprint keeps one tenant's answers from being replayed to another key, and
+    hashing the prompt avoids keeping prompts in memory twice.
+    """
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    schema_name = getattr(schema, "__name__", None) or (str(schema) if schema else None)
+    material = json.dumps([key_id, model, prompt_hash, schema_name, reasoning_effort])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(content: str, schema: Any) -> bool:
+    """Whether a completed answer is worth replaying: non-empty and, for a schema, valid JSON for it.
+
+    Replaying an empty answer or unparseable critic/architect JSON would repeat the failure
+    on every identical call until the entry expires.
+    """
+    if not content.strip():
+        return False
+    if schema is None:
+        return True
+    try:
+        value = repair_json(content).value
+        validate = getattr(schema, "model_validate", None)
+        if validate is not None:
+            validate(value)
+    except (ValueError, TypeError):
+        return False
+    return True
+
+
+class ResponseCache:
+    """Exact-match cache of completed phase streams.
+
+    The memory tier is an LRU bounded by ``max_bytes`` of cached text; entries older than
+    ``ttl_seconds`` are treated as misses and dropped. When ``disk_dir`` is set, completed
+    responses are also written there as JSON and promoted back into memory on a later hit,
+    so warm answers survive restarts. Disk reads and writes run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 3600.0,
+        disk_dir: Path | None = None,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_writes = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ResponseCache":
+        return cls(
+            max_bytes=settings.response_cache_max_bytes,
+            ttl_seconds=settings.response_cache_ttl_seconds,
+            disk_dir=settings.response_cache_dir,
+        )
+
+    def _expired(self, entry: CachedResponse) -> bool:
+        return self.ttl_seconds > 0 and time.time() - entry.created_at > self.ttl_seconds
+
+    async def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._expired(entry):
+                self._drop(key)
+                self.expirations += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+        if self.disk_dir is not None:
+            entry = await asyncio.to_thread(self._read_disk, key)
+            if entry is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                self._store(key, entry)
+                return entry
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, entry: CachedResponse) -> None:
+        self._store(key, entry)
+        if self.disk_dir is not None:
+            await asyncio.to_thread(self._write_disk, key, entry)
+            self.disk_writes += 1
+
+    def _store(self, key: str, entry: CachedResponse) -> None:
+        if entry.nbytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = entry
+        self._bytes += entry.nbytes
+        while self._bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.nbytes
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"  # type: ignore[operator]
+
+    def _read_disk(self, key: str) -> CachedResponse | None:
+        path = self._disk_path(key)
+        try:
+            entry = CachedResponse(**json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+        if self._expired(entry):
+            path.unlink(missing_ok=True)
+            self.expirations += 1
+            return None
+        return entry
+
+    def _write_disk(self, key: str, entry: CachedResponse) -> None:
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(".tmp")
+            temp_path.write_text(json.dumps(asdict(entry)), encoding="utf-8")
+            temp_path.replace(path)
+        except OSError as exc:  # pragma: no cover - cache writes must never fail a council phase
+            print(f"[WARNING] Response cache disk write failed: {exc}")
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "disk_writes": self.disk_writes,
+        }
+
+
+_default_cache: ResponseCache | None = None
+
+
+def get_response_cache(settings: Settings) -> ResponseCache | None:
+    """Return the process-wide cache, or ``None`` when RESPONSE_CACHE_ENABLED is off."""
+    global _default_cache
+    if not settings.response_cache_enabled:
+        return None
+    if _default_cache is None:
+        _default_cache = ResponseCache.from_settings(settings)
+    return _default_cache
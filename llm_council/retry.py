@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import email.utils
+import random
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from openai import APIConnectionError, APIStatusError
+
+from .settings import Settings
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+RATE_LIMIT_RESET_HEADERS = ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Classify by exception type and status code instead of searching error text."""
+    if isinstance(exc, APIStatusError):
+        return exc.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exc, APIConnectionError)
+
+
+def _parse_duration(raw: str) -> float | None:
+    """Parse `Retry-After` style values: seconds, HTTP dates, or Go durations such as `1m30s`."""
+    value = raw.strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(number + unit for number, unit in parts) == value:
+        scale = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+        return sum(float(number) * scale[unit] for number, unit in parts)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Return the provider's requested wait from `Retry-After` or exhausted `x-ratelimit-*` headers."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        parsed = _parse_duration(retry_after_ms)
+        if parsed is not None:
+            return parsed / 1000.0
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        parsed = _parse_duration(retry_after)
+        if parsed is not None:
+            return parsed
+    hints = []
+    for reset_header in RATE_LIMIT_RESET_HEADERS:
+        remaining = headers.get(reset_header.replace("reset", "remaining"))
+        reset = headers.get(reset_header)
+        if reset and remaining is not None and remaining.strip() == "0":
+            parsed = _parse_duration(reset)
+            if parsed is not None:
+                hints.append(parsed)
+    return max(hints) if hints else None
+
+
+@dataclass
+class _ModelRetryState:
+    tokens: float
+    refilled_at: float = field(default_factory=time.monotonic)
+    blocked_until: float = 0.0
+    scheduled: int = 0
+    header_hints: int = 0
+    denied_budget: int = 0
+    denied_deadline: int = 0
+    denied_retry_after: int = 0
+
+
+class RetryScheduler:
+    """Shared per-model retry policy for every NIM call in the process.
+
+    Delays use full-jitter exponential backoff so concurrent failures spread out instead of
+    retrying in lockstep. A provider `Retry-After`/rate-limit reset closes a per-model gate
+    that later retries for that model wait behind; first attempts are not held by it.
+    Retries draw from a per-model token bucket refilled by traffic (``budget_ratio`` per
+    request) and by ``budget_refill_per_second`` while idle, so a brownout cannot multiply
+    load by the retry count. A retry whose wait would pass the caller's
+    deadline is refused rather than slept.
+
+    Model ids come from callers, so past ``max_entries`` the least recently used models
+    whose gate has expired and whose budget has refilled are dropped; such an entry is
+    indistinguishable from a fresh one apart from its counters.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_retries: int = 3,
+        base_delay_seconds: float = 2.0,
+        max_delay_seconds: float = 30.0,
+        budget_ratio: float = 0.2,
+        budget_min: float = 10.0,
+        budget_refill_per_second: float = 0.1,
+        max_entries: int = 512,
+    ) -> None:
+        self.max_retries = max_retries
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.budget_ratio = budget_ratio
+        self.budget_min = budget_min
+        self.budget_refill_per_second = budget_refill_per_second
+        self.max_entries = max(1, max_entries)
+        self.evictions = 0
+        self._models: OrderedDict[str, _ModelRetryState] = OrderedDict()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RetryScheduler":
+        return cls(
+            max_retries=settings.nvidia_max_retries,
+            base_delay_seconds=settings.nvidia_retry_base_delay_seconds,
+            max_delay_seconds=settings.nvidia_retry_max_delay_seconds,
+            budget_ratio=settings.nvidia_retry_budget_ratio,
+            budget_min=settings.nvidia_retry_budget_min,
+            budget_refill_per_second=settings.nvidia_retry_budget_refill_per_second,
+            max_entries=settings.model_registry_max_entries,
+        )
+
+    def _state(self, model: str) -> _ModelRetryState:
+        state = self._models.get(model)
+        now = time.monotonic()
+        if state is None:
+            state = _ModelRetryState(tokens=self.budget_min)
+            self._models[model] = state
+            self._evict_idle(keep=model, now=now)
+        else:
+            self._models.move_to_end(model)
+        # Refill slowly while idle so a quiet model regains its minimum budget without
+        # letting a sustained brownout retry at one extra request per second.
+        elapsed = now - state.refilled_at
+        state.tokens = min(self.budget_min, state.tokens + elapsed * self.budget_refill_per_second)
+        state.refilled_at = now
+        return state
+
+    def _evict_idle(self, *, keep: str, now: float) -> None:
+        excess = len(self._models) - self.max_entries
+        if excess <= 0:
+            return
+        idle = [
+            model for model, state in self._models.items()
+            if model != keep
+            and state.blocked_until <= now
+            and state.tokens + (now - state.refilled_at) * self.budget_refill_per_second >= self.budget_min
+        ]
+        for model in idle[:excess]:
+            del self._models[model]
+            self.evictions += 1
+
+    def record_request(self, model: str) -> None:
+        state = self._state(model)
+        state.tokens = min(self.budget_min, state.tokens + self.budget_ratio)
+
+    def next_delay(
+        self,
+        model: str,
+        exc: BaseException,
+        attempt: int,
+        *,
+        deadline: float | None = None,
+    ) -> float | None:
+        """Return seconds to wait before retry ``attempt + 1``, or ``None`` to give up now."""
+        if attempt >= self.max_retries or not is_retryable(exc):
+            return None
+        state = self._state(model)
+        now = time.monotonic()
+        hint = retry_after_seconds(exc)
+        if hint is not None:
+            state.header_hints += 1
+            if hint > self.max_delay_seconds:
+                # The provider asked for a longer pause than we are willing to hold a run open.
+                state.denied_retry_after += 1
+                return None
+            state.blocked_until = max(state.blocked_until, now + hint)
+        backoff = random.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * (2 ** attempt)))
+        gate = state.blocked_until - now
+        if gate > 0:
+            # Spread gated callers over a short window after the reset instead of one instant.
+            backoff = gate + random.uniform(0, max(0.25, gate * 0.25))
+        if deadline is not None and now + backoff >= deadline:
+            state.denied_deadline += 1
+            return None
+        if state.tokens < 1.0:
+            state.denied_budget += 1
+            return None
+        state.tokens -= 1.0
+        state.scheduled += 1
+        return backoff
+
+    def stats(self) -> list[dict[str, Any]]:
+        now = time.monotonic()
+        return [
+            {
+                "model": model,
+                "budget_tokens": round(state.tokens, 2),
+                "retries_scheduled": state.scheduled,
+                "header_hints": state.header_hints,
+                "denied_budget": state.denied_budget,
+                "denied_deadline": state.denied_deadline,
+                "denied_retry_after": state.denied_retry_after,
+                "gate_seconds_remaining": round(max(0.0, state.blocked_until - now), 3),
+            }
+            for model, state in self._models.items()
+        ]
+
+
+_default_scheduler: RetryScheduler | None = None
+
+
+def get_retry_scheduler(settings: Settings) -> RetryScheduler:
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = RetryScheduler.from_settings(settings)
+    return _default_scheduler
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
-from typing import List, Dict
+from functools import lru_cache
+from pydantic import BaseModel, Field, create_model
+from typing import List, Dict, Sequence
 
 class CriticOutput(BaseModel):
     winner_id: str = Field(description="The ID of the winning response")
@@ -17,6 +18,32 @@ class CriticScorecard(BaseModel):
 class CriticBatchOutput(BaseModel):
     reviews: Dict[str, CriticScorecard] = Field(description="Scorecards keyed by the reviewed agent name")
 
+class MetricScores(BaseModel):
+    accuracy: int = Field(ge=1, le=10)
+    relevance: int = Field(ge=1, le=10)
+    completeness: int = Field(ge=1, le=10)
+    clarity: int = Field(ge=1, le=10)
+    practical_usefulness: int = Field(ge=1, le=10)
+
+
+class GuidedCriticScorecard(BaseModel):
+    metric_scores: MetricScores
+    critique: str = Field(min_length=1, description="Specific, useful critique for this response")
+
+
+@lru_cache(maxsize=256)
+def critic_batch_model(agent_names: Sequence[str]) -> type[BaseModel]:
+    """``CriticBatchOutput`` narrowed to one batch: exactly these agents, five metrics each, scores 1-10.
+
+    Used only to guide decoding; ``agent_names`` must be hashable (a tuple).
+    """
+    reviews = create_model(
+        "CriticBatchReviews",
+        **{f"agent_{index}": (GuidedCriticScorecard, Field(alias=name)) for index, name in enumerate(agent_names)},
+    )
+    return create_model("CriticBatchOutput", reviews=(reviews, Field(description="Scorecards keyed by the reviewed agent name")))
+
+
 class ArchitectBlueprint(BaseModel):
     structure: List[str] = Field(description="Ordered list of section headers with instructions")
     tone_guidelines: str = Field(description="Voice and style instructions")
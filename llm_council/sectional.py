@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import aclosing
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Callable, Sequence
+
+from .llm_client import StreamUpdate
+
+UsageDict = dict[str, int]
+SECTION_SEPARATOR = "\n\n"
+
+
+def section_title(section: str) -> str:
+    """``"Section 1: Intro - What goes here"`` -> ``"Section 1: Intro"``."""
+    return section.split(" - ", 1)[0].strip()
+
+
+def build_section_outline(sections: Sequence[str]) -> str:
+    """Short numbered outline every section writer shares, so sections know their neighbours."""
+    return "\n".join(f"{index}. {section_title(section)}" for index, section in enumerate(sections, start=1))
+
+
+@dataclass
+class SectionReport:
+    index: int
+    title: str
+    time_taken: float
+    usage: UsageDict
+    model: str | None = None
+    cache_hit: bool = False
+    error: str | None = None
+
+    def as_event(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class SectionalFinalizer:
+    """Write blueprint sections concurrently and replay them as one ordered stream.
+
+    ``open_stream(index, section)`` starts the model stream for one section. All sections
+    start at once, on ``start()`` or on the first read of ``stream()``, so a caller can begin
+    writing while it is still busy with other output. The section being shown streams straight through, while later sections
+    that produce text early are buffered until every section before them has finished.
+    Reasoning is passed through as it arrives. The terminal update carries the summed usage,
+    and ``reports`` holds per-section timing, usage, and any error once the stream ends. A
+    failed section is left out of the text and reported instead of failing the answer.
+    """
+
+    def __init__(
+        self,
+        open_stream: Callable[[int, str], AsyncIterator[Any]],
+        sections: Sequence[str],
+        *,
+        spawn: Callable[[Any], asyncio.Task[Any]] = asyncio.create_task,
+    ) -> None:
+        self.open_stream = open_stream
+        self.sections = list(sections)
+        self.spawn = spawn
+        self.reports: list[SectionReport | None] = [None] * len(self.sections)
+        self._queue: asyncio.Queue[tuple[str, int, Any]] = asyncio.Queue()
+        self._tasks: list[asyncio.Task[Any]] = []
+        self._started = 0.0
+
+    @property
+    def failed(self) -> list[SectionReport]:
+        return [report for report in self.reports if report is not None and report.error]
+
+    def start(self) -> None:
+        """Spawn every section writer; their output is buffered until ``stream()`` reads it."""
+        if self._tasks:
+            return
+        self._started = time.perf_counter()
+        self._tasks = [self.spawn(self._pump(index, section)) for index, section in enumerate(self.sections)]
+
+    async def cancel(self) -> None:
+        """Stop section writers whose output will not be read."""
+        pending = [task for task in self._tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _pump(self, index: int, section: str) -> None:
+        queue = self._queue
+        usage: UsageDict = {"prompt": 0, "completion": 0, "total": 0}
+        model: str | None = None
+        cache_hit = False
+        try:
+            async with aclosing(self.open_stream(index, section)) as updates:
+                async for update in updates:
+                    reasoning = getattr(update, "reasoning", "")
+                    if reasoning:
+                        await queue.put(("reasoning", index, reasoning))
+                    if update.delta:
+                        await queue.put(("delta", index, update.delta))
+                    if update.usage is not None:
+                        usage = update.usage
+                        model = getattr(update, "model", None)
+                        cache_hit = getattr(update, "cache_hit", False)
+            error = None
+        except Exception as exc:
+            error = str(exc)
+        report = SectionReport(
+            index=index + 1,
+            title=section_title(section),
+            time_taken=time.perf_counter() - self._started,
+            usage=usage,
+            model=model,
+            cache_hit=cache_hit,
+            error=error,
+        )
+        await queue.put(("done", index, report))
+
+    async def stream(self) -> AsyncIterator[StreamUpdate]:
+        self.start()
+        queue = self._queue
+        buffers: list[list[str]] = [[] for _ in self.sections]
+        current = 0
+        wrote_text = False
+        opened: set[int] = set()
+
+        def release(index: int, text: str) -> StreamUpdate:
+            nonlocal wrote_text
+            if index not in opened:
+                opened.add(index)
+                if wrote_text:
+                    text = SECTION_SEPARATOR + text
+            wrote_text = True
+            return StreamUpdate(delta=text)
+
+        try:
+            unfinished = len(self._tasks)
+            while unfinished:
+                kind, index, payload = await queue.get()
+                if kind == "reasoning":
+                    yield StreamUpdate(reasoning=payload)
+                elif kind == "delta":
+                    if index == current:
+                        yield release(index, payload)
+                    else:
+                        buffers[index].append(payload)
+                else:
+                    self.reports[index] = payload
+                    unfinished -= 1
+                    while current < len(self.sections) and self.reports[current] is not None:
+                        current += 1
+                        if current < len(self.sections) and buffers[current]:
+                            yield release(current, "".join(buffers[current]))
+                            buffers[current].clear()
+        finally:
+            await self.cancel()
+
+        completed = [report for report in self.reports if report is not None]
+        usage = {key: sum(report.usage.get(key, 0) for report in completed) for key in ("prompt", "completion", "total")}
+        model = next((report.model for report in completed if report.model), None)
+        yield StreamUpdate(
+            usage=usage,
+            model=model,
+            cache_hit=bool(completed) and all(report.cache_hit for report in completed),
+        )
@@ -2,22 +2,52 @@ from __future__ import annotations
 
 import json
 import asyncio
-from typing import Any, AsyncIterator, Literal, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Literal, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from openai import APIStatusError, OpenAIError
 from pydantic import BaseModel, Field, model_validator
 
+from .capabilities import close_capability_cache, get_capability_cache
+from .circuit_breaker import get_breaker_registry
+from .coalesce import DeltaCoalescer
+from .client_pool import api_key_fingerprint, close_client_pool, get_client_pool
+from .concurrency import get_limiter_registry
+from .council_cache import get_council_cache
+from .hedging import get_hedge_controller
+from .json_repair import get_json_repair_stats
 from .llm_client import LLMClient
+from .metrics import get_metrics
+from .response_cache import get_response_cache
+from .retry import get_retry_scheduler
 from .settings import DEFAULT_MODEL_MAP, PERSONA, get_settings
+from .stalls import get_stall_monitor
+from .structured_output import get_structured_output_compiler
+from .trace_export import close_trace_exporter, get_trace_exporter
+from .trace_sampling import get_trace_sampler
+from .trace_sink import close_trace_sinks, get_trace_sink, render_markdown
 from .tracer import WorkflowTracer
 from .workflow import CouncilWorkflow, WorkflowRequest
 
 settings = get_settings()
 workflow = CouncilWorkflow(settings=settings)
-app = FastAPI(title="LLM Council API")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Close pooled NIM connections instead of leaving them to interpreter teardown.
+    await close_client_pool()
+    await close_capability_cache()
+    # Flush queued LangSmith runs off the loop; the worker is bounded by its flush timeout.
+    await asyncio.to_thread(close_trace_exporter)
+    await asyncio.to_thread(close_trace_sinks)
+
+
+app = FastAPI(title="LLM Council API", lifespan=lifespan)
 SSE_HEARTBEAT_SECONDS = 10
 
 app.add_middleware(
@@ -43,6 +73,13 @@ class SummonRequest(BaseModel):
     custom_api_key: Optional[str] = None
     custom_model_map: Optional[dict[str, str]] = None
     agents: Optional[list[AgentDefinitionRequest]] = Field(default=None, max_length=12)
+    use_council_cache: bool = True
+    reasoning_mode: Literal["none", "summary", "full"] = "full"
+    pipeline: Literal["full", "express"] = "full"
+    finalizer_mode: Literal["single", "sectional"] = "single"
+    generator_quorum: Optional[int] = Field(default=None, ge=0)
+    straggler_timeout_seconds: Optional[float] = Field(default=None, ge=0)
+    straggler_after_drafts: Optional[int] = Field(default=None, ge=0)
 
     @model_validator(mode="after")
     def validate_agent_registry(self) -> "SummonRequest":
@@ -101,7 +138,45 @@ def format_sse(event_type: str, data: dict[str, Any]) -> str:
     return f"event: {event_type}\ndata: {json.dumps(payload)}\n\n"
 
 
-def new_tracer() -> WorkflowTracer:
+def format_sse_batch(events: list[dict[str, Any]]) -> str:
+    """Encode several events into one write; SSE clients split them on blank lines."""
+    return "".join(format_sse(event.get("type", "message"), event) for event in events)
+
+
+def _queue_depths() -> list[tuple[tuple[str, ...], float]]:
+    depths = [(("trace_export",), float(get_trace_exporter(settings).stats()["queued"]))]
+    if settings.enable_trace_logs:
+        depths.append((("trace_sink",), float(get_trace_sink(settings).stats()["queued"])))
+    return depths
+
+
+def _limiter_totals(field: str) -> Callable[[], list[tuple[tuple[str, ...], float]]]:
+    """Sum one limiter stat per model across API keys."""
+
+    def collect() -> list[tuple[tuple[str, ...], float]]:
+        totals: dict[str, float] = {}
+        for limiter in get_limiter_registry(settings).stats():
+            totals[limiter["model"]] = totals.get(limiter["model"], 0.0) + limiter[field]
+        return [((model,), value) for model, value in totals.items()]
+
+    return collect
+
+
+metrics = get_metrics(settings)
+metrics.watch("llm_council_queue_depth", "Items waiting in background trace queues.", ("queue",), _queue_depths)
+metrics.watch("llm_council_nim_queue_depth", "Requests waiting for a NIM concurrency slot.", ("model",), _limiter_totals("queue_depth"))
+metrics.watch("llm_council_nim_in_flight", "NIM streams holding a concurrency slot.", ("model",), _limiter_totals("in_flight"))
+
+
+def visible_key_ids(api_key: Optional[str]) -> set[str]:
+    """Key fingerprints a caller may inspect: the server key's, plus its own key's if it sent one."""
+    key_ids = {api_key_fingerprint(settings.nvidia_api_key)}
+    if api_key:
+        key_ids.add(api_key_fingerprint(api_key))
+    return key_ids
+
+
+def new_tracer(owner: str | None = None) -> WorkflowTracer:
     return WorkflowTracer(
         enabled=settings.enable_trace_logs,
         log_dir=settings.trace_log_dir,
@@ -109,6 +184,8 @@ def new_tracer() -> WorkflowTracer:
         langsmith_api_key=settings.langsmith_api_key,
         langsmith_endpoint=settings.langsmith_endpoint,
         langsmith_project=settings.langsmith_project,
+        settings=settings,
+        owner=owner,
     )
 
 
@@ -120,24 +197,44 @@ async def stream_workflow(request: SummonRequest) -> AsyncIterator[str]:
             custom_api_key=request.custom_api_key,
             custom_model_map=request.custom_model_map,
             custom_agents=[agent.model_dump() for agent in request.agents] if request.agents else None,
+            use_council_cache=request.use_council_cache,
+            reasoning_mode=request.reasoning_mode,
+            pipeline=request.pipeline,
+            finalizer_mode=request.finalizer_mode,
+            generator_quorum=request.generator_quorum,
+            straggler_timeout_seconds=request.straggler_timeout_seconds,
+            straggler_after_drafts=request.straggler_after_drafts,
         )
     ).__aiter__()
+    # Token deltas are merged per stream so each write carries many tokens, not one.
+    coalescer = DeltaCoalescer.from_settings(settings)
     pending_event = asyncio.ensure_future(anext(event_iterator))
+    metrics.sse_clients.inc("summon")
     try:
         while True:
-            completed, _ = await asyncio.wait({pending_event}, timeout=SSE_HEARTBEAT_SECONDS)
+            flush_in = coalescer.seconds_until_flush()
+            timeout = SSE_HEARTBEAT_SECONDS if flush_in is None else min(SSE_HEARTBEAT_SECONDS, flush_in)
+            completed, _ = await asyncio.wait({pending_event}, timeout=timeout)
             if not completed:
-                # Keep Render and browser proxies from closing quiet streams while NIM reasons.
-                yield ": keepalive\n\n"
+                if flush_in is not None:
+                    yield format_sse_batch(coalescer.flush())
+                else:
+                    # Keep Render and browser proxies from closing quiet streams while NIM reasons.
+                    yield ": keepalive\n\n"
                 continue
             try:
                 event = pending_event.result()
             except StopAsyncIteration:
+                remaining = coalescer.flush()
+                if remaining:
+                    yield format_sse_batch(remaining)
                 break
-            event_type = event.get("type", "message")
-            yield format_sse(event_type, event)
+            ready = coalescer.push(event)
+            if ready:
+                yield format_sse_batch(ready)
             pending_event = asyncio.ensure_future(anext(event_iterator))
     finally:
+        metrics.sse_clients.dec("summon")
         if not pending_event.done():
             pending_event.cancel()
             await asyncio.gather(pending_event, return_exceptions=True)
@@ -147,7 +244,7 @@ async def stream_workflow(request: SummonRequest) -> AsyncIterator[str]:
 async def stream_follow_up_chat(request: FollowUpChatRequest) -> AsyncIterator[str]:
     """Stream a report-grounded conversation without exposing council internals as context."""
     client = LLMClient(api_key=request.custom_api_key, settings=settings)
-    tracer = new_tracer()
+    tracer = new_tracer(owner=client.key_id)
     messages = [
         {
             "role": "system",
@@ -174,8 +271,9 @@ async def stream_follow_up_chat(request: FollowUpChatRequest) -> AsyncIterator[s
     )
     content = ""
     usage = {"prompt": 0, "completion": 0, "total": 0}
-    yield format_sse("chat_start", {"model": request.model})
+    metrics.sse_clients.inc("follow_up_chat")
     try:
+        yield format_sse("chat_start", {"model": request.model})
         async for update in client.stream_chat(messages, model=request.model, reasoning_effort="medium"):
             if update.reasoning:
                 yield format_sse("chat_reasoning_chunk", {"chunk": update.reasoning})
@@ -188,7 +286,7 @@ async def stream_follow_up_chat(request: FollowUpChatRequest) -> AsyncIterator[s
                 yield format_sse("chat_done", {"model": request.model, "usage": update.usage})
     except asyncio.CancelledError:
         chat_trace.finish(outputs={"visible_output": content}, usage=usage, error="Follow-up chat cancelled")
-        tracer.finish_root(error="Follow-up chat cancelled", usage=usage)
+        tracer.finish_root(error="Follow-up chat cancelled", usage=usage, metadata={"aborted": True})
         raise
     except Exception as exc:
         chat_trace.finish(outputs={"visible_output": content}, usage=usage, error=exc)
@@ -198,6 +296,8 @@ async def stream_follow_up_chat(request: FollowUpChatRequest) -> AsyncIterator[s
         chat_trace.finish(outputs={"visible_output": content}, usage=usage)
         tracer.finish_root(outputs={"visible_output": content}, usage=usage)
     finally:
+        await client.aclose()
+        metrics.sse_clients.dec("follow_up_chat")
         tracer.finalize()
 
 
@@ -242,14 +342,75 @@ async def get_config_defaults() -> dict[str, Any]:
     }
 
 
+@app.get("/api/runtime-stats")
+async def get_runtime_stats() -> dict[str, Any]:
+    response_cache = get_response_cache(settings)
+    council_cache = get_council_cache(settings)
+    return {
+        "client_pool": get_client_pool(settings).stats(),
+        "concurrency": get_limiter_registry(settings).stats(),
+        "retries": get_retry_scheduler(settings).stats(),
+        "hedging": get_hedge_controller(settings).stats(),
+        "response_cache": response_cache.stats() if response_cache else None,
+        "council_cache": council_cache.stats() if council_cache else None,
+        "json_repair": get_json_repair_stats().stats(),
+        "structured_output": get_structured_output_compiler(settings).stats(),
+        "capabilities": get_capability_cache(settings).stats(),
+        "stalls": get_stall_monitor(settings).stats(),
+        "trace_export": get_trace_exporter(settings).stats(),
+        "trace_sampling": get_trace_sampler(settings).stats(),
+        "trace_sink": get_trace_sink(settings).stats() if settings.enable_trace_logs else None,
+    }
+
+
+@app.get("/metrics")
+async def get_prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/api/circuit-breakers")
+async def get_circuit_breakers(x_nvidia_api_key: Optional[str] = Header(default=None)) -> dict[str, Any]:
+    # Other tenants' breakers reveal which models their keys call, so a caller only sees the
+    # server-default key's breakers plus those of the key it sends in X-NVIDIA-API-Key.
+    return {
+        "enabled": settings.circuit_breaker_enabled,
+        "breakers": get_breaker_registry(settings).snapshot(key_ids=visible_key_ids(x_nvidia_api_key)),
+        "fallback_chains": {role: list(models) for role, models in settings.fallback_chains.items()},
+    }
+
+
+@app.get("/api/model-capabilities")
+async def get_model_capabilities() -> dict[str, Any]:
+    cache = get_capability_cache(settings)
+    return {"ttl_seconds": cache.ttl_seconds, "models": cache.snapshot()}
+
+
+@app.delete("/api/model-capabilities")
+async def reset_model_capabilities(model: Optional[str] = None, base_url: Optional[str] = None) -> dict[str, Any]:
+    return {"removed": get_capability_cache(settings).reset(base_url=base_url, model=model)}
+
+
+@app.get("/api/traces/{run_id}")
+async def get_trace(run_id: str, x_nvidia_api_key: Optional[str] = Header(default=None)) -> PlainTextResponse:
+    if not settings.enable_trace_logs:
+        raise HTTPException(status_code=404, detail="Local trace logs are disabled")
+    records = await asyncio.to_thread(get_trace_sink(settings).read_run, run_id)
+    # Traces hold prompts and answers, so a run is served only to the key that made it; a
+    # run from another key, or from before owners were recorded, reads as not found.
+    owner = next((record.get("owner") for record in records if record.get("kind") == "start"), None)
+    if not records or owner not in visible_key_ids(x_nvidia_api_key):
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return PlainTextResponse(render_markdown(records), media_type="text/markdown")
+
+
 @app.post("/api/check-model")
 async def check_model(request: CheckModelRequest) -> dict[str, Any]:
     if not request.model_id:
         raise HTTPException(status_code=400, detail="Model ID is empty")
 
     try:
-        client = LLMClient(api_key=request.api_key, settings=settings)
-        await client.check_connection(request.model_id)
+        async with LLMClient(api_key=request.api_key, settings=settings) as client:
+            await client.check_connection(request.model_id)
         return {"valid": True, "message": "Model verified"}
     except OpenAIError as exc:
         raise HTTPException(
@@ -273,8 +434,8 @@ async def check_credentials(request: CheckCredentialsRequest) -> dict[str, Any]:
     test_model = DEFAULT_MODEL_MAP["generator_1"]
 
     try:
-        client = LLMClient(api_key=request.api_key, settings=settings)
-        await client.check_connection(test_model)
+        async with LLMClient(api_key=request.api_key, settings=settings) as client:
+            await client.check_connection(test_model)
         return {"valid": True, "message": "Credentials verified"}
     except OpenAIError as exc:
         raise HTTPException(status_code=503, detail="Unable to initialize the NVIDIA client with this API key") from exc
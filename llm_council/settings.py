@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import os
 from dataclasses import dataclass
 from pathlib import Path
@@ -28,6 +29,26 @@ def _env_csv(name: str, default: tuple[str, ...]) -> tuple[str, ...]:
     return values or default
 
 
+def _env_model_chains(name: str) -> dict[str, tuple[str, ...]]:
+    """Parse a JSON object of role -> ordered fallback model ids, e.g. {"critic": ["a", "b"]}."""
+    raw = os.getenv(name)
+    if not raw or not raw.strip():
+        return {}
+    try:
+        payload = json.loads(raw)
+    except json.JSONDecodeError:
+        print(f"[WARNING] Ignoring {name}: expected a JSON object of role to model lists.")
+        return {}
+    if not isinstance(payload, dict):
+        print(f"[WARNING] Ignoring {name}: expected a JSON object of role to model lists.")
+        return {}
+    return {
+        str(role): tuple(str(model).strip() for model in models if str(model).strip())
+        for role, models in payload.items()
+        if isinstance(models, list)
+    }
+
+
 def _env_optional(name: str) -> str | None:
     raw = os.getenv(name)
     if raw is None:
@@ -36,6 +57,11 @@ def _env_optional(name: str) -> str | None:
     return value or None
 
 
+def _env_optional_path(name: str) -> Path | None:
+    value = _env_optional(name)
+    return Path(value) if value else None
+
+
 PERSONA: Final[dict[str, dict[str, str]]] = {
     "The Academic": {
         "description": "You are a rigorous researcher. Focus on definitions, historical context, theoretical frameworks, and first principles. Cite logical fallacies if present. Use formal, precise language. Prioritize accuracy and depth over simplicity."
@@ -72,16 +98,75 @@ class Settings:
     nvidia_api_key: str | None
     nvidia_api_base_url: str
     nvidia_first_response_timeout_seconds: float
+    nvidia_structured_output: str
+    nvidia_capability_ttl_seconds: float
+    nvidia_capability_cache_path: Path | None
+    nvidia_stall_timeout_seconds: float
+    nvidia_stall_recovery: str
+    nvidia_stall_continuations: int
+    nvidia_client_pool_size: int
+    nvidia_max_connections: int
+    nvidia_max_keepalive_connections: int
+    nvidia_keepalive_expiry_seconds: float
+    nvidia_http2: bool
+    nvidia_adaptive_concurrency: bool
+    nvidia_concurrency_initial_limit: int
+    nvidia_concurrency_min_limit: int
+    nvidia_concurrency_max_limit: int
+    nvidia_concurrency_latency_threshold_seconds: float
+    model_registry_max_entries: int
+    nvidia_max_retries: int
+    nvidia_retry_base_delay_seconds: float
+    nvidia_retry_max_delay_seconds: float
+    nvidia_retry_budget_ratio: float
+    nvidia_retry_budget_min: float
+    nvidia_retry_budget_refill_per_second: float
+    council_run_budget_seconds: float
+    nvidia_hedging: bool
+    nvidia_hedge_percentile: float
+    nvidia_hedge_min_samples: int
+    nvidia_hedge_min_delay_seconds: float
+    circuit_breaker_enabled: bool
+    circuit_breaker_failure_threshold: int
+    circuit_breaker_window_seconds: float
+    circuit_breaker_cooldown_seconds: float
+    response_cache_enabled: bool
+    response_cache_max_bytes: int
+    response_cache_ttl_seconds: float
+    response_cache_dir: Path | None
+    council_cache_mode: str
+    council_cache_similarity: float
+    council_cache_max_entries: int
+    council_cache_max_bytes: int
+    council_cache_ttl_seconds: float
+    generator_quorum: int
+    generator_straggler_timeout_seconds: float
+    generator_straggler_after_drafts: int
+    critic_scheduling: str
+    critic_batch_timeout_seconds: float
+    critic_reask_attempts: int
+    sse_coalesce_window_ms: float
+    sse_coalesce_max_bytes: int
     cors_allow_origins: tuple[str, ...]
     cors_allow_origin_regex: str | None
     enable_trace_logs: bool
     trace_log_dir: Path
+    trace_log_max_bytes: int
+    trace_log_max_age_seconds: float
+    trace_log_retention: int
+    trace_sample_rate: float
+    trace_tail_sampling: bool
+    trace_tail_latency_seconds: float
     langsmith_tracing: bool
     langsmith_api_key: str | None
     langsmith_endpoint: str
     langsmith_project: str
+    langsmith_export_queue_size: int
+    langsmith_export_batch_size: int
+    langsmith_export_flush_timeout_seconds: float
     port: int
     reload: bool
+    fallback_chains: dict[str, tuple[str, ...]]
 
 
 def get_settings() -> Settings:
@@ -90,6 +175,55 @@ def get_settings() -> Settings:
         nvidia_api_key=_env_optional("NVIDIA_API_KEY"),
         nvidia_api_base_url=os.getenv("NVIDIA_API_BASE_URL", "https://integrate.api.nvidia.com/v1"),
         nvidia_first_response_timeout_seconds=float(os.getenv("NVIDIA_FIRST_RESPONSE_TIMEOUT_SECONDS", "20")),
+        nvidia_structured_output=os.getenv("NVIDIA_STRUCTURED_OUTPUT", "json_object").strip().lower(),
+        nvidia_capability_ttl_seconds=float(os.getenv("NVIDIA_CAPABILITY_TTL_SECONDS", "86400")),
+        nvidia_capability_cache_path=_env_optional_path("NVIDIA_CAPABILITY_CACHE_PATH"),
+        nvidia_stall_timeout_seconds=float(os.getenv("NVIDIA_STALL_TIMEOUT_SECONDS", "0")),
+        nvidia_stall_recovery=os.getenv("NVIDIA_STALL_RECOVERY", "fail").strip().lower(),
+        nvidia_stall_continuations=int(os.getenv("NVIDIA_STALL_CONTINUATIONS", "1")),
+        nvidia_client_pool_size=int(os.getenv("NVIDIA_CLIENT_POOL_SIZE", "16")),
+        nvidia_max_connections=int(os.getenv("NVIDIA_MAX_CONNECTIONS", "100")),
+        nvidia_max_keepalive_connections=int(os.getenv("NVIDIA_MAX_KEEPALIVE_CONNECTIONS", "20")),
+        nvidia_keepalive_expiry_seconds=float(os.getenv("NVIDIA_KEEPALIVE_EXPIRY_SECONDS", "60")),
+        nvidia_http2=_env_flag("NVIDIA_HTTP2", False),
+        nvidia_adaptive_concurrency=_env_flag("NVIDIA_ADAPTIVE_CONCURRENCY", True),
+        nvidia_concurrency_initial_limit=int(os.getenv("NVIDIA_CONCURRENCY_INITIAL_LIMIT", "8")),
+        nvidia_concurrency_min_limit=int(os.getenv("NVIDIA_CONCURRENCY_MIN_LIMIT", "1")),
+        nvidia_concurrency_max_limit=int(os.getenv("NVIDIA_CONCURRENCY_MAX_LIMIT", "64")),
+        nvidia_concurrency_latency_threshold_seconds=float(os.getenv("NVIDIA_CONCURRENCY_LATENCY_THRESHOLD_SECONDS", "10")),
+        model_registry_max_entries=int(os.getenv("MODEL_REGISTRY_MAX_ENTRIES", "512")),
+        nvidia_max_retries=int(os.getenv("NVIDIA_MAX_RETRIES", "3")),
+        nvidia_retry_base_delay_seconds=float(os.getenv("NVIDIA_RETRY_BASE_DELAY_SECONDS", "2")),
+        nvidia_retry_max_delay_seconds=float(os.getenv("NVIDIA_RETRY_MAX_DELAY_SECONDS", "30")),
+        nvidia_retry_budget_ratio=float(os.getenv("NVIDIA_RETRY_BUDGET_RATIO", "0.2")),
+        nvidia_retry_budget_min=float(os.getenv("NVIDIA_RETRY_BUDGET_MIN", "10")),
+        nvidia_retry_budget_refill_per_second=float(os.getenv("NVIDIA_RETRY_BUDGET_REFILL_PER_SECOND", "0.1")),
+        council_run_budget_seconds=float(os.getenv("COUNCIL_RUN_BUDGET_SECONDS", "900")),
+        nvidia_hedging=_env_flag("NVIDIA_HEDGING", False),
+        nvidia_hedge_percentile=float(os.getenv("NVIDIA_HEDGE_PERCENTILE", "0.9")),
+        nvidia_hedge_min_samples=int(os.getenv("NVIDIA_HEDGE_MIN_SAMPLES", "20")),
+        nvidia_hedge_min_delay_seconds=float(os.getenv("NVIDIA_HEDGE_MIN_DELAY_SECONDS", "1")),
+        circuit_breaker_enabled=_env_flag("CIRCUIT_BREAKER_ENABLED", True),
+        circuit_breaker_failure_threshold=int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5")),
+        circuit_breaker_window_seconds=float(os.getenv("CIRCUIT_BREAKER_WINDOW_SECONDS", "60")),
+        circuit_breaker_cooldown_seconds=float(os.getenv("CIRCUIT_BREAKER_COOLDOWN_SECONDS", "30")),
+        response_cache_enabled=_env_flag("RESPONSE_CACHE_ENABLED", False),
+        response_cache_max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        response_cache_ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600")),
+        response_cache_dir=_env_optional_path("RESPONSE_CACHE_DIR"),
+        council_cache_mode=os.getenv("COUNCIL_CACHE_MODE", "off").strip().lower(),
+        council_cache_similarity=float(os.getenv("COUNCIL_CACHE_SIMILARITY", "0.9")),
+        council_cache_max_entries=int(os.getenv("COUNCIL_CACHE_MAX_ENTRIES", "256")),
+        council_cache_max_bytes=int(os.getenv("COUNCIL_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+        council_cache_ttl_seconds=float(os.getenv("COUNCIL_CACHE_TTL_SECONDS", "86400")),
+        generator_quorum=int(os.getenv("GENERATOR_QUORUM", "0")),
+        generator_straggler_timeout_seconds=float(os.getenv("GENERATOR_STRAGGLER_TIMEOUT_SECONDS", "0")),
+        generator_straggler_after_drafts=int(os.getenv("GENERATOR_STRAGGLER_AFTER_DRAFTS", "0")),
+        critic_scheduling=os.getenv("CRITIC_SCHEDULING", "barrier").strip().lower(),
+        critic_batch_timeout_seconds=float(os.getenv("CRITIC_BATCH_TIMEOUT_SECONDS", "5")),
+        critic_reask_attempts=int(os.getenv("CRITIC_REASK_ATTEMPTS", "1")),
+        sse_coalesce_window_ms=float(os.getenv("SSE_COALESCE_WINDOW_MS", "40")),
+        sse_coalesce_max_bytes=int(os.getenv("SSE_COALESCE_MAX_BYTES", "4096")),
         cors_allow_origins=_env_csv(
             "CORS_ALLOW_ORIGINS",
             ("http://localhost:3000", "http://127.0.0.1:3000"),
@@ -97,10 +231,20 @@ def get_settings() -> Settings:
         cors_allow_origin_regex=_env_optional("CORS_ALLOW_ORIGIN_REGEX"),
         enable_trace_logs=_env_flag("ENABLE_TRACE_LOGS", False),
         trace_log_dir=Path(os.getenv("TRACE_LOG_DIR", str(PACKAGE_DIR / "logs"))),
+        trace_log_max_bytes=int(os.getenv("TRACE_LOG_MAX_BYTES", str(64 * 1024 * 1024))),
+        trace_log_max_age_seconds=float(os.getenv("TRACE_LOG_MAX_AGE_SECONDS", "86400")),
+        trace_log_retention=int(os.getenv("TRACE_LOG_RETENTION", "14")),
+        trace_sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "1")),
+        trace_tail_sampling=_env_flag("TRACE_TAIL_SAMPLING", False),
+        trace_tail_latency_seconds=float(os.getenv("TRACE_TAIL_LATENCY_SECONDS", "60")),
         langsmith_tracing=_env_flag("LANGSMITH_TRACING", False),
         langsmith_api_key=_env_optional("LANGSMITH_API_KEY"),
         langsmith_endpoint=os.getenv("LANGSMITH_ENDPOINT", "https://api.smith.langchain.com"),
         langsmith_project=os.getenv("LANGSMITH_PROJECT", "llm-souncil-prod"),
+        langsmith_export_queue_size=int(os.getenv("LANGSMITH_EXPORT_QUEUE_SIZE", "1000")),
+        langsmith_export_batch_size=int(os.getenv("LANGSMITH_EXPORT_BATCH_SIZE", "50")),
+        langsmith_export_flush_timeout_seconds=float(os.getenv("LANGSMITH_EXPORT_FLUSH_TIMEOUT_SECONDS", "5")),
         port=int(os.getenv("PORT", "8000")),
         reload=_env_flag("RELOAD", False),
+        fallback_chains=_env_model_chains("COUNCIL_FALLBACK_CHAINS"),
     )
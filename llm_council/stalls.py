@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from typing import Any
+
+from .settings import Settings
+
+STALL_RECOVERY_POLICIES = ("fail", "continue")
+# A shorter overlap is as likely to be coincidence ("the ", ", ") as a repeated tail.
+MIN_STITCH_OVERLAP = 8
+CONTINUATION_TAIL_CHARS = 400
+# Continuation output is held back until this much has arrived, then checked for overlap.
+STITCH_WINDOW_CHARS = 200
+
+
+def continuation_messages(messages: list[dict[str, str]], partial: str) -> list[dict[str, str]]:
+    """Messages that ask the model to pick up a stalled answer exactly where it stopped."""
+    tail = partial[-CONTINUATION_TAIL_CHARS:]
+    return [
+        *messages,
+        {"role": "assistant", "content": partial},
+        {
+            "role": "user",
+            "content": (
+                "Your previous reply was cut off. Continue from: "
+                f"\"{tail}\"\n\nWrite only the text that comes next. Do not repeat what is "
+                "already written and do not comment on the interruption."
+            ),
+        },
+    ]
+
+
+def stitch_overlap(partial: str, continuation: str) -> int:
+    """How many leading characters of ``continuation`` repeat the end of ``partial``.
+
+    Models asked to continue often restart a few words back; those characters are dropped
+    so the stitched output reads as one answer.
+    """
+    longest = min(len(partial), len(continuation))
+    for size in range(longest, MIN_STITCH_OVERLAP - 1, -1):
+        if partial.endswith(continuation[:size]):
+            return size
+    return 0
+
+
+class StallMonitor:
+    """Inter-token stall policy and per-model stall counters.
+
+    Once a stream has produced content, a gap longer than ``timeout_seconds`` between
+    chunks is a stall (``0`` disables the check). ``fail`` ends the call with an error;
+    ``continue`` reissues it with the partial answer and a continuation prompt, up to
+    ``max_continuations`` times, and stitches the new output onto what was already sent.
+    """
+
+    def __init__(self, *, timeout_seconds: float = 30.0, recovery: str = "fail", max_continuations: int = 1) -> None:
+        if recovery not in STALL_RECOVERY_POLICIES:
+            print(f"[WARNING] Unknown NVIDIA_STALL_RECOVERY={recovery!r}; failing stalled streams.")
+            recovery = "fail"
+        self.timeout_seconds = timeout_seconds
+        self.recovery = recovery
+        self.max_continuations = max(0, max_continuations)
+        self._models: dict[str, dict[str, float]] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "StallMonitor":
+        return cls(
+            timeout_seconds=settings.nvidia_stall_timeout_seconds,
+            recovery=settings.nvidia_stall_recovery,
+            max_continuations=settings.nvidia_stall_continuations,
+        )
+
+    @property
+    def timeout(self) -> float | None:
+        """``asyncio.wait_for`` timeout for chunks after the first content delta."""
+        return self.timeout_seconds if self.timeout_seconds > 0 else None
+
+    def _state(self, model: str) -> dict[str, float]:
+        return self._models.setdefault(
+            model,
+            {"streams": 0, "stalls": 0, "continued": 0, "failed": 0, "stall_seconds": 0.0, "max_gap_seconds": 0.0},
+        )
+
+    def record_stream(self, model: str, max_gap_seconds: float) -> None:
+        """A stream that finished; its longest gap between chunks helps tune the timeout."""
+        state = self._state(model)
+        state["streams"] += 1
+        state["max_gap_seconds"] = max(state["max_gap_seconds"], max_gap_seconds)
+
+    def record_stall(self, model: str, stalled_seconds: float, continued: bool) -> None:
+        state = self._state(model)
+        state["stalls"] += 1
+        state["stall_seconds"] += stalled_seconds
+        state["continued" if continued else "failed"] += 1
+
+    def should_continue(self, continuations: int) -> bool:
+        return self.recovery == "continue" and continuations < self.max_continuations
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "timeout_seconds": self.timeout_seconds,
+            "recovery": self.recovery,
+            "max_continuations": self.max_continuations,
+            "models": [
+                {
+                    "model": model,
+                    "streams": int(state["streams"]),
+                    "stalls": int(state["stalls"]),
+                    "continued": int(state["continued"]),
+                    "failed": int(state["failed"]),
+                    "stall_seconds": round(state["stall_seconds"], 3),
+                    "max_gap_seconds": round(state["max_gap_seconds"], 3),
+                }
+                for model, state in self._models.items()
+            ],
+        }
+
+
+_default_monitor: StallMonitor | None = None
+
+
+def get_stall_monitor(settings: Settings) -> StallMonitor:
+    global _default_monitor
+    if _default_monitor is None:
+        _default_monitor = StallMonitor.from_settings(settings)
+    return _default_monitor
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+from .settings import Settings
+
+# Ordered from most to least constrained; a rejected mode steps down to the next one.
+STRUCTURED_OUTPUT_MODES = ("json_schema", "guided_json", "json_object", "off")
+# A rejected mode steps down json_schema -> guided_json -> json_object -> off.
+_DOWNGRADES = {"json_schema": "guided_json", "guided_json": "json_object", "json_object": "off", "off": "off"}
+
+
+def compile_json_schema(schema: Any) -> dict[str, Any]:
+    """JSON Schema for a Pydantic model with ``$defs`` inlined and closed objects.
+
+    Guided-decoding backends differ in ``$ref`` support, so references are expanded, and
+    objects with declared properties get ``additionalProperties: false`` so the decoder
+    cannot wander into keys the validator would ignore.
+    """
+    raw = schema.model_json_schema()
+    definitions = raw.pop("$defs", {})
+
+    def expand(node: Any) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str) and ref.startswith("#/$defs/"):
+                return expand(copy.deepcopy(definitions[ref.rsplit("/", 1)[1]]))
+            expanded = {key: expand(value) for key, value in node.items() if key != "title"}
+            if expanded.get("type") == "object" and "properties" in expanded:
+                expanded.setdefault("additionalProperties", False)
+            return expanded
+        if isinstance(node, list):
+            return [expand(item) for item in node]
+        return node
+
+    return expand(raw)
+
+
+def downgrade_mode(mode: str) -> str:
+    return _DOWNGRADES.get(mode, "off")
+
+
+class StructuredOutputCompiler:
+    """Turn a Pydantic schema into provider request parameters for one model.
+
+    ``json_schema`` sends an OpenAI-style ``response_format`` schema, which NIM enforces
+    with guided decoding; ``guided_json`` sends the same schema through NIM's
+    ``nvext.guided_json`` extension; ``json_object`` only asks for some JSON object, as
+    before; ``off`` sends nothing. Compiled parameters are cached per (model, mode, schema)
+    so a schema is compiled once, not on every call.
+    """
+
+    def __init__(self, *, default_mode: str = "json_object", max_entries: int = 256) -> None:
+        if default_mode not in STRUCTURED_OUTPUT_MODES:
+            print(f"[WARNING] Unknown NVIDIA_STRUCTURED_OUTPUT={default_mode!r}; using json_object.")
+            default_mode = "json_object"
+        self.default_mode = default_mode
+        self.max_entries = max_entries
+        self._cache: dict[tuple[str, str, Any], dict[str, Any]] = {}
+        self.compiled = 0
+        self.hits = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "StructuredOutputCompiler":
+        return cls(default_mode=settings.nvidia_structured_output)
+
+    def request_params(self, model: str, schema: Any, mode: str) -> dict[str, Any]:
+        """Keyword arguments to merge into ``chat.completions.create``; empty for ``off``."""
+        if mode == "off" or not schema:
+            return {}
+        if mode == "json_object" or not hasattr(schema, "model_json_schema"):
+            return {"response_format": {"type": "json_object"}}
+        key = (model, mode, schema)
+        params = self._cache.get(key)
+        if params is not None:
+            self.hits += 1
+            return params
+        compiled = compile_json_schema(schema)
+        if mode == "guided_json":
+            params = {"extra_body": {"nvext": {"guided_json": compiled}}}
+        else:
+            params = {"response_format": {"type": "json_schema", "json_schema": {"name": schema.__name__, "schema": compiled}}}
+        if len(self._cache) >= self.max_entries:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = params
+        self.compiled += 1
+        return params
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "default_mode": self.default_mode,
+            "cached_schemas": len(self._cache),
+            "compiled": self.compiled,
+            "cache_hits": self.hits,
+        }
+
+
+_default_compiler: StructuredOutputCompiler | None = None
+
+
+def get_structured_output_compiler(settings: Settings) -> StructuredOutputCompiler:
+    global _default_compiler
+    if _default_compiler is None:
+        _default_compiler = StructuredOutputCompiler.from_settings(settings)
+    return _default_compiler
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Any
+
+# Strings shorter than this are cheaper to redact and write inline than to hash.
+MIN_BLOB_CHARS = 512
+_SEARCH_PREFIX_CHARS = 32
+
+_NVIDIA_KEY = re.compile(r"nvapi-[A-Za-z0-9_-]+")
+_LANGSMITH_KEY = re.compile(r"lsv2_pt_[A-Za-z0-9_-]+")
+
+
+def redact_text(value: str) -> str:
+    value = _NVIDIA_KEY.sub("[REDACTED_NVIDIA_KEY]", value)
+    return _LANGSMITH_KEY.sub("[REDACTED_LANGSMITH_KEY]", value)
+
+
+def blob_hash(value: str) -> str:
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class BlobTable:
+    """Per-run, content-addressed store for the large strings a council traces repeatedly.
+
+    The same draft is traced as generator output, inside every critic prompt, and in the
+    architect and finalizer prompts. ``redact`` memoizes redaction per distinct large
+    string. ``compact`` turns a string into a reference the first time it is seen. It also
+    cuts out earlier blobs embedded in a larger string, so a critic prompt becomes
+    ``{"$concat": [...]}`` of template text and draft references. New blobs come back as
+    records for the caller to write once, before the record that refers to them.
+
+    ``compact`` must only be called from one thread (the trace sink's worker); ``redact``
+    may also run on the LangSmith exporter's thread, where a race only redacts twice.
+    """
+
+    def __init__(self, min_chars: int = MIN_BLOB_CHARS) -> None:
+        self.min_chars = min_chars
+        self._redacted: dict[str, str] = {}
+        self._blobs: dict[str, str] = {}  # hash -> raw text
+        self._search_order: list[tuple[str, str]] = []  # longest first, so no blob splits a larger one
+        self.redactions_saved = 0
+        self.references = 0
+        self.blob_chars = 0
+
+    def redact(self, value: str) -> str:
+        if len(value) < self.min_chars:
+            return redact_text(value)
+        cached = self._redacted.get(value)
+        if cached is not None:
+            self.redactions_saved += 1
+            return cached
+        cached = self._redacted[value] = redact_text(value)
+        return cached
+
+    def compact(self, value: str, new_blobs: list[dict[str, Any]], *, searchable: bool = False) -> Any:
+        """A string, ``{"$blob": hash}``, or ``{"$concat": [...]}`` that rebuilds ``value`` redacted.
+
+        Only ``searchable`` blobs (model outputs, which later prompts embed) are looked for
+        inside other strings; prompts are deduplicated by hash alone.
+        """
+        if len(value) < self.min_chars:
+            return redact_text(value)
+        parts: list[Any] = [value]
+        for blob_key, raw in self._search_order:
+            split: list[Any] = []
+            for part in parts:
+                if isinstance(part, str):
+                    self._split(part, blob_key, raw, split)
+                else:
+                    split.append(part)
+            parts = split
+        if len(parts) == 1 and parts[0] is value:
+            # Nothing embedded: hash it, so a repeat of the same text is one reference.
+            key = blob_hash(value)
+            if key in self._blobs:
+                self.references += 1
+                return {"$blob": key}
+            return self._store(key, value, new_blobs, searchable)
+        if len(parts) == 1:
+            return parts[0]
+        return {"$concat": [self.compact(part, new_blobs) if isinstance(part, str) else part for part in parts]}
+
+    def _split(self, part: str, blob_key: str, raw: str, into: list[Any]) -> None:
+        # Searching for a short prefix and confirming with startswith is much cheaper than
+        # ``raw in part``: CPython preprocesses long needles on every call.
+        prefix = raw[:_SEARCH_PREFIX_CHARS]
+        start = 0
+        position = part.find(prefix)
+        while position >= 0:
+            if part.startswith(raw, position):
+                if position > start:
+                    into.append(part[start:position])
+                into.append({"$blob": blob_key})
+                self.references += 1
+                start = position + len(raw)
+                position = part.find(prefix, start)
+            else:
+                position = part.find(prefix, position + 1)
+        if start < len(part):
+            into.append(part[start:] if start else part)
+
+    def _store(self, key: str, value: str, new_blobs: list[dict[str, Any]], searchable: bool) -> dict[str, str]:
+        self._blobs[key] = value
+        if searchable:
+            self._search_order.append((key, value))
+            self._search_order.sort(key=lambda item: len(item[1]), reverse=True)
+        self.blob_chars += len(value)
+        new_blobs.append({"hash": key, "text": self.redact(value)})
+        return {"$blob": key}
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "blobs": len(self._blobs),
+            "blob_chars": self.blob_chars,
+            "references": self.references,
+            "redactions_saved": self.redactions_saved,
+        }
+
+
+def resolve(value: Any, blobs: dict[str, str]) -> Any:
+    """Rebuild a compacted value from a run's blob records."""
+    if isinstance(value, dict):
+        if "$blob" in value:
+            return blobs.get(value["$blob"], f"[missing trace blob {value['$blob']}]")
+        if "$concat" in value:
+            return "".join(resolve(part, blobs) for part in value["$concat"])
+    return value
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import abc
+import atexit
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+from .settings import Settings
+
+ExportOp = Callable[[], None]
+
+
+class BackgroundBatcher(abc.ABC):
+    """Bounded queue drained in batches by a daemon worker thread.
+
+    Callers only enqueue, so nothing here runs on the event loop. The worker takes up to
+    ``batch_size`` items per wake-up and hands them, in order, to ``_process_batch``.
+    When the queue is full, new items are dropped and counted instead of blocking a
+    council stream. ``close`` flushes what is queued, waiting at most
+    ``flush_timeout_seconds``.
+    """
+
+    worker_name = "background-batcher"
+
+    def __init__(self, *, max_queue: int = 1000, batch_size: int = 50, flush_timeout_seconds: float = 5.0) -> None:
+        self.max_queue = max_queue
+        self.batch_size = max(1, batch_size)
+        self.flush_timeout_seconds = flush_timeout_seconds
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue)
+        self._worker: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.enqueued = 0
+        self.dropped = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+
+    def submit(self, item: Any) -> bool:
+        """Queue one item; ``False`` means it was dropped."""
+        if self._closed:
+            self.dropped += 1
+            return False
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name=self.worker_name, daemon=True)
+                self._worker.start()
+                atexit.register(self.close)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            # Flush markers are set only after everything queued before them is processed.
+            markers = [item for item in batch if isinstance(item, threading.Event)]
+            items = [item for item in batch if item is not None and not isinstance(item, threading.Event)]
+            started = time.perf_counter()
+            if items:
+                self._process_batch(items)
+                self.batches += 1
+            self.busy_seconds += time.perf_counter() - started
+            for marker in markers:
+                marker.set()
+            if stop:
+                self._on_stop()
+                return
+
+    @abc.abstractmethod
+    def _process_batch(self, items: list[Any]) -> None:
+        """Handle one batch of queued items; runs on the worker thread."""
+
+    def _on_stop(self) -> None:
+        """Release resources held by the worker; runs on the worker thread."""
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until everything queued so far has been processed; ``False`` on timeout."""
+        if self._worker is None or not self._worker.is_alive():
+            return True
+        marker = threading.Event()
+        wait = self.flush_timeout_seconds if timeout is None else timeout
+        try:
+            self._queue.put(marker, timeout=wait)
+        except queue.Full:
+            return False
+        return marker.wait(wait)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        flushed = self.flush()
+        self._closed = True
+        if not flushed:
+            print(f"[WARNING] {self.worker_name} queue not drained within {self.flush_timeout_seconds:.0f}s; {self._queue.qsize()} items lost.")
+            return
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join(self.flush_timeout_seconds)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "max_queue": self.max_queue,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 4),
+        }
+
+
+class TraceExporter(BackgroundBatcher):
+    """Runs LangSmith run create/patch calls off the event loop.
+
+    Operations run in the order they were queued, so a child is always created after its
+    parent and a run is patched after it was posted. The LangSmith client then sends what
+    it was given as one batched request.
+    """
+
+    worker_name = "langsmith-export"
+
+    def __init__(self, *, max_queue: int = 1000, batch_size: int = 50, flush_timeout_seconds: float = 5.0) -> None:
+        super().__init__(max_queue=max_queue, batch_size=batch_size, flush_timeout_seconds=flush_timeout_seconds)
+        self.exported = 0
+        self.failed = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "TraceExporter":
+        return cls(
+            max_queue=settings.langsmith_export_queue_size,
+            batch_size=settings.langsmith_export_batch_size,
+            flush_timeout_seconds=settings.langsmith_export_flush_timeout_seconds,
+        )
+
+    def _process_batch(self, items: list[ExportOp]) -> None:
+        for op in items:
+            try:
+                op()
+                self.exported += 1
+            except Exception as exc:  # pragma: no cover - tracing must never break application work
+                self.failed += 1
+                print(f"[WARNING] LangSmith trace export failed: {exc}")
+
+    def stats(self) -> dict[str, Any]:
+        return {**super().stats(), "exported": self.exported, "failed": self.failed}
+
+
+_default_exporter: TraceExporter | None = None
+
+
+def get_trace_exporter(settings: Settings) -> TraceExporter:
+    global _default_exporter
+    if _default_exporter is None:
+        _default_exporter = TraceExporter.from_settings(settings)
+    return _default_exporter
+
+
+def close_trace_exporter() -> None:
+    """Flush queued LangSmith operations at shutdown."""
+    if _default_exporter is not None:
+        _default_exporter.close()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import random
+import threading
+from typing import Any
+
+from .settings import Settings
+
+# Why a tail-sampled run was kept anyway, in precedence order.
+TAIL_KEEP_REASONS = ("cancelled", "error", "slow")
+
+
+class TraceSampler:
+    """Decides which runs are traced, locally and in LangSmith.
+
+    Head sampling keeps ``head_rate`` of runs (``1`` keeps all), decided when the tracer is
+    created. Without tail sampling, the other runs do no trace work at all. With tail
+    sampling, their records and LangSmith operations are held unbuilt in the tracer, and
+    released only if the run was cancelled, errored, or took at least
+    ``latency_threshold_seconds`` (``0`` disables the latency rule); otherwise they are
+    dropped before any redaction or export.
+    """
+
+    def __init__(
+        self,
+        *,
+        head_rate: float = 1.0,
+        tail: bool = False,
+        latency_threshold_seconds: float = 60.0,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.head_rate = min(1.0, max(0.0, head_rate))
+        self.tail = tail
+        self.latency_threshold_seconds = latency_threshold_seconds
+        self._random = rng or random.Random()
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.head_kept = 0
+        self.tail_kept = {reason: 0 for reason in TAIL_KEEP_REASONS}
+        self.tail_dropped = 0
+        self.head_dropped = 0
+        self.buffered_operations = 0
+        self.discarded_operations = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "TraceSampler":
+        return cls(
+            head_rate=settings.trace_sample_rate,
+            tail=settings.trace_tail_sampling,
+            latency_threshold_seconds=settings.trace_tail_latency_seconds,
+        )
+
+    def head(self) -> bool | None:
+        """``True`` to trace the run, ``False`` to skip it, ``None`` to buffer it for ``tail``."""
+        with self._lock:
+            self.runs += 1
+            if self.head_rate >= 1.0 or self._random.random() < self.head_rate:
+                self.head_kept += 1
+                return True
+            if self.tail:
+                return None
+            self.head_dropped += 1
+            return False
+
+    def tail_reason(self, *, cancelled: bool, errored: bool, duration_seconds: float) -> str | None:
+        """Why a buffered run should be kept, or ``None`` to drop it."""
+        if cancelled:
+            return "cancelled"
+        if errored:
+            return "error"
+        if self.latency_threshold_seconds > 0 and duration_seconds >= self.latency_threshold_seconds:
+            return "slow"
+        return None
+
+    def record_tail(self, reason: str | None, operations: int) -> None:
+        with self._lock:
+            self.buffered_operations += operations
+            if reason is None:
+                self.tail_dropped += 1
+                self.discarded_operations += operations
+            else:
+                self.tail_kept[reason] += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "head_rate": self.head_rate,
+            "tail": self.tail,
+            "latency_threshold_seconds": self.latency_threshold_seconds,
+            "runs": self.runs,
+            "head_kept": self.head_kept,
+            "head_dropped": self.head_dropped,
+            "tail_kept": dict(self.tail_kept),
+            "tail_dropped": self.tail_dropped,
+            "buffered_operations": self.buffered_operations,
+            "discarded_operations": self.discarded_operations,
+        }
+
+
+_default_sampler: TraceSampler | None = None
+
+
+def get_trace_sampler(settings: Settings) -> TraceSampler:
+    global _default_sampler
+    if _default_sampler is None:
+        _default_sampler = TraceSampler.from_settings(settings)
+    return _default_sampler
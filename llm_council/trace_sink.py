@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import datetime
+import gzip
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import IO, Any, Callable
+
+from .settings import Settings
+from .trace_blobs import resolve
+from .trace_export import BackgroundBatcher
+
+ACTIVE_SEGMENT = "traces.jsonl"
+# Builds one record, or several to be written together (blobs before the step using them).
+RecordFactory = Callable[[], "dict[str, Any] | list[dict[str, Any]]"]
+
+
+class TraceSink(BackgroundBatcher):
+    """Process-wide, append-only JSONL file for local traces.
+
+    Every tracer writes ``start``, ``step`` and ``end`` records tagged with its own
+    ``run_id``. Records are built (and redacted) on the worker thread, and each batch is a
+    single write and flush. The active segment rotates when it reaches ``max_bytes`` or
+    ``max_age_seconds`` (``0`` disables either limit). Closed segments are gzipped, and only
+    the newest ``retention`` of them are kept. ``read_run`` collects one run's records so
+    its markdown can be rendered on demand.
+    """
+
+    worker_name = "trace-sink"
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_age_seconds: float = 86400.0,
+        retention: int = 14,
+        max_queue: int = 10000,
+        batch_size: int = 200,
+        flush_timeout_seconds: float = 5.0,
+    ) -> None:
+        super().__init__(max_queue=max_queue, batch_size=batch_size, flush_timeout_seconds=flush_timeout_seconds)
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.retention = retention
+        self._file: IO[str] | None = None
+        self._opened_at = 0.0
+        self.records = 0
+        self.write_failures = 0
+        self.rotations = 0
+        self.segments_removed = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings, directory: Path | None = None) -> "TraceSink":
+        return cls(
+            directory or settings.trace_log_dir,
+            max_bytes=settings.trace_log_max_bytes,
+            max_age_seconds=settings.trace_log_max_age_seconds,
+            retention=settings.trace_log_retention,
+        )
+
+    @property
+    def active_path(self) -> Path:
+        return self.directory / ACTIVE_SEGMENT
+
+    def write(self, make_record: RecordFactory) -> bool:
+        """Queue a record; it is built on the worker so redaction stays off the event loop."""
+        return self.submit(make_record)
+
+    def _process_batch(self, items: list[RecordFactory]) -> None:
+        lines = []
+        for make_record in items:
+            try:
+                built = make_record()
+                for record in built if isinstance(built, list) else [built]:
+                    lines.append(json.dumps(record, ensure_ascii=False, default=str))
+            except Exception as exc:  # pragma: no cover - tracing must never break application work
+                self.write_failures += 1
+                print(f"[WARNING] Trace record could not be serialized: {exc}")
+        if not lines:
+            return
+        try:
+            if self._file is not None and self.max_age_seconds > 0 and time.time() - self._opened_at >= self.max_age_seconds:
+                self._rotate()
+            if self._file is None:
+                self._open()
+            self._file.write("\n".join(lines) + "\n")  # type: ignore[union-attr]
+            self._file.flush()  # type: ignore[union-attr]
+            self.records += len(lines)
+            if self.max_bytes > 0 and self._file.tell() >= self.max_bytes:  # type: ignore[union-attr]
+                self._rotate()
+        except OSError as exc:  # pragma: no cover - tracing must never break application work
+            self.write_failures += len(lines)
+            print(f"[WARNING] Trace sink write failed: {exc}")
+
+    def _open(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.active_path, "a", encoding="utf-8")
+        self._opened_at = time.time()
+        if self._file.tell():
+            # A segment left by an earlier process keeps aging from its first record.
+            with open(self.active_path, encoding="utf-8") as existing:
+                try:
+                    self._opened_at = float(json.loads(existing.readline())["ts"])
+                except (ValueError, KeyError, TypeError):
+                    pass
+
+    def _rotate(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if not self.active_path.exists():
+            return
+        stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        closed = self.directory / f"traces-{stamp}.jsonl"
+        self.active_path.replace(closed)
+        with open(closed, "rb") as source, gzip.open(closed.with_suffix(".jsonl.gz"), "wb") as target:
+            shutil.copyfileobj(source, target)
+        closed.unlink()
+        self.rotations += 1
+        if self.retention > 0:
+            for old in self._segments()[:-self.retention]:
+                old.unlink(missing_ok=True)
+                self.segments_removed += 1
+
+    def _segments(self) -> list[Path]:
+        """Closed segments, oldest first (their names sort by rotation time)."""
+        return sorted(self.directory.glob("traces-*.jsonl.gz"))
+
+    def _on_stop(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def read_run(self, run_id: str) -> list[dict[str, Any]]:
+        """Every record of one run, in write order. Reads files; call it off the event loop."""
+        self.flush()
+        needle = json.dumps({"run_id": run_id})[1:-1]
+        collected: list[list[dict[str, Any]]] = []
+        # Newest segment first: a run is almost always in the active file, so stop at its start.
+        for path in [self.active_path, *reversed(self._segments())]:
+            if not path.exists():
+                continue
+            opener = gzip.open if path.suffix == ".gz" else open
+            with opener(path, "rt", encoding="utf-8") as segment:
+                records = [json.loads(line) for line in segment if needle in line]
+            collected.append(records)
+            if any(record.get("kind") == "start" for record in records):
+                break
+        return [record for records in reversed(collected) for record in records]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **super().stats(),
+            "directory": str(self.directory),
+            "records": self.records,
+            "write_failures": self.write_failures,
+            "rotations": self.rotations,
+            "segments_removed": self.segments_removed,
+        }
+
+
+def render_markdown(records: list[dict[str, Any]]) -> str:
+    """The per-run flight recorder markdown, rebuilt from a run's sink records."""
+    if not records:
+        return ""
+    run_id = records[0]["run_id"]
+    blobs = {record["hash"]: record["text"] for record in records if record.get("kind") == "blob"}
+    started = datetime.datetime.fromtimestamp(records[0]["ts"]).strftime("%Y%m%d_%H%M%S")
+    parts = [
+        f"# Flight Recorder Trace: {started} ({run_id})\n\n",
+        "This file logs the entire lifecycle of the request.\n\n",
+    ]
+    for record in records:
+        if record.get("kind") == "step":
+            timestamp = datetime.datetime.fromtimestamp(record["ts"]).strftime("%H:%M:%S")
+            parts.append(
+                f"## Phase: {record['phase']}\n"
+                f"**Timestamp:** {timestamp}\n"
+                f"**Agent:** {record['agent']}\n\n"
+                "### Inputs\n"
+                f"```text\n{resolve(record['input'], blobs)}\n```\n\n"
+                "### Outputs\n"
+                f"```json\n{resolve(record['output'], blobs)}\n```\n"
+                "---\n\n"
+            )
+        elif record.get("kind") == "end":
+            parts.append("\n# End of Trace\n")
+    return "".join(parts)
+
+
+_sinks: dict[Path, TraceSink] = {}
+
+
+def get_trace_sink(settings: Settings, directory: Path | None = None) -> TraceSink:
+    """The one sink that writes to ``directory`` (the configured trace directory by default)."""
+    key = Path(directory or settings.trace_log_dir).resolve()
+    sink = _sinks.get(key)
+    if sink is None:
+        sink = _sinks[key] = TraceSink.from_settings(settings, key)
+    return sink
+
+
+def close_trace_sinks() -> None:
+    """Write out queued trace records and close the active segments at shutdown."""
+    for sink in _sinks.values():
+        sink.close()
@@ -3,32 +3,41 @@ from __future__ import annotations
 import datetime
 import re
 import time
+import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from langsmith import Client
 from langsmith.run_trees import RunTree
 
+from .settings import Settings, get_settings
+from .trace_blobs import BlobTable, redact_text
+from .trace_export import TraceExporter, get_trace_exporter
+from .trace_sampling import TraceSampler, get_trace_sampler
+from .trace_sink import TraceSink, get_trace_sink
+
 
 UsageDict = dict[str, int]
 
 
-def _redact(value: Any) -> Any:
-    """Keep application content while excluding credentials from all trace sinks."""
+def _redact(value: Any, text: Callable[[str], str] = redact_text) -> Any:
+    """Keep application content while excluding credentials from all trace sinks.
+
+    ``text`` redacts one string; tracers pass their run's memoizing ``BlobTable.redact``.
+    """
     if isinstance(value, dict):
         return {
-            key: "[REDACTED]" if re.search(r"(?:api[_-]?key|authorization)", key, re.IGNORECASE) else _redact(item)
+            key: "[REDACTED]" if re.search(r"(?:api[_-]?key|authorization)", key, re.IGNORECASE) else _redact(item, text)
             for key, item in value.items()
             if key.casefold() not in {"reasoning", "reasoning_content", "thinking"}
         }
     if isinstance(value, list):
-        return [_redact(item) for item in value]
+        return [_redact(item, text) for item in value]
     if isinstance(value, tuple):
-        return tuple(_redact(item) for item in value)
+        return tuple(_redact(item, text) for item in value)
     if isinstance(value, str):
-        value = re.sub(r"nvapi-[A-Za-z0-9_-]+", "[REDACTED_NVIDIA_KEY]", value)
-        return re.sub(r"lsv2_pt_[A-Za-z0-9_-]+", "[REDACTED_LANGSMITH_KEY]", value)
+        return text(value)
     return value
 
 
@@ -36,8 +45,12 @@ def _redact(value: Any) -> Any:
 class TraceRun:
     tree: RunTree | None
     started_at: float
+    # Wall-clock start for LangSmith; the run is created later, on the exporter's thread.
+    start_time: datetime.datetime | None = None
     first_delta_at: float | None = None
     closed: bool = False
+    # Set for traced runs; with LangSmith, ``tree`` is created and patched on the exporter's thread.
+    tracer: "WorkflowTracer | None" = None
 
     def mark_first_delta(self) -> None:
         if self.first_delta_at is None:
@@ -54,29 +67,55 @@ class TraceRun:
         if self.closed:
             return
         self.closed = True
-        if self.tree is None:
+        if self.tracer is None:
+            return
+        self.tracer._observe(self, error=error, metadata=metadata)
+        exporter = self.tracer.exporter
+        if exporter is None:
             return
+        end_time = datetime.datetime.now(datetime.timezone.utc)
         timing = {"duration_seconds": round(time.perf_counter() - self.started_at, 4)}
         if self.first_delta_at is not None:
             timing["time_to_first_delta_seconds"] = round(self.first_delta_at - self.started_at, 4)
-        run_metadata = {"timing": timing}
-        if usage is not None:
-            run_metadata["usage"] = _redact(usage)
-        if metadata:
-            run_metadata.update(_redact(metadata))
-        try:
+        # Shallow copies: the caller may keep updating its dicts after the run is queued.
+        outputs = dict(outputs or {})
+        usage = dict(usage) if usage is not None else None
+        metadata = dict(metadata or {})
+        error = str(error) if error else None
+
+        text = self.tracer.blobs.redact
+
+        def export() -> None:
+            if self.tree is None:  # the create was dropped from a full queue
+                return
+            run_metadata: dict[str, Any] = {"timing": timing}
+            if usage is not None:
+                run_metadata["usage"] = _redact(usage)
+            run_metadata.update(_redact(metadata, text))
             self.tree.end(
-                outputs=_redact(outputs or {}),
-                error=_redact(str(error)) if error else None,
+                outputs=_redact(outputs, text),
+                error=_redact(error) if error else None,
+                end_time=end_time,
                 metadata=run_metadata,
             )
             self.tree.patch()
-        except Exception as exc:  # pragma: no cover - tracing must never break application work
-            print(f"[WARNING] LangSmith trace finalization failed: {exc}")
+
+        self.tracer._submit(exporter.submit, export)
 
 
 class WorkflowTracer:
-    """Writes optional local traces and a best-effort LangSmith parent/child run tree."""
+    """Writes optional local traces and a best-effort LangSmith parent/child run tree.
+
+    Local traces go to the process-wide JSONL sink for ``log_dir`` under a unique
+    ``run_id``; ``render_markdown`` turns a run's records back into the flight recorder
+    layout on demand. ``owner`` is the API key fingerprint the run was made with; it is
+    stored on the ``start`` record so the trace endpoint only serves a run to that key.
+
+    ``settings`` configures the shared sampler, exporter, and sink when they are not passed
+    in; it defaults to the process settings. The ``sampler`` decides at construction whether the run is traced. A run held for tail
+    sampling queues its records and LangSmith operations unbuilt until ``finalize``, which
+    releases or discards them.
+    """
 
     def __init__(
         self,
@@ -87,29 +126,48 @@ class WorkflowTracer:
         langsmith_api_key: str | None = None,
         langsmith_endpoint: str = "https://api.smith.langchain.com",
         langsmith_project: str = "llm-souncil-prod",
+        exporter: TraceExporter | None = None,
+        sink: TraceSink | None = None,
+        sampler: TraceSampler | None = None,
+        settings: Settings | None = None,
+        owner: str | None = None,
     ) -> None:
+        settings = settings or get_settings()
         self.enabled = enabled
-        self.file = None
-        self.filename = None
+        self.run_id: str | None = None
+        self.sink: TraceSink | None = None
+        self._finalized = False
+        self._started_at = time.perf_counter()
+        # ``True`` traces the run, ``False`` skips it, ``None`` holds it in ``_pending`` for tail sampling.
+        self.sampler: TraceSampler | None = None
+        self.sampled: bool | None = True
+        self._pending: list[tuple[Callable[[Any], Any], Any]] = []
+        self._cancelled = False
+        self._errored = False
+        # One blob table per run: drafts are redacted once and written to the sink once.
+        self.blobs = BlobTable()
         self.root: TraceRun | None = None
         self.langsmith_project = langsmith_project
         self.langsmith_client: Client | None = None
-        if langsmith_tracing and langsmith_api_key:
+        self.exporter: TraceExporter | None = None
+        langsmith_tracing = bool(langsmith_tracing and langsmith_api_key)
+        if enabled or langsmith_tracing:
+            self.sampler = sampler or get_trace_sampler(settings)
+            self.sampled = self.sampler.head()
+        if self.sampled is False:
+            return
+        if langsmith_tracing:
             try:
                 self.langsmith_client = Client(api_url=langsmith_endpoint, api_key=langsmith_api_key)
+                self.exporter = exporter or get_trace_exporter(settings)
             except Exception as exc:  # pragma: no cover - defensive configuration boundary
                 print(f"[WARNING] LangSmith tracing disabled: {exc}")
 
         if not self.enabled:
             return
-        log_path = Path(log_dir)
-        log_path.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.filename = str(log_path / f"trace_{timestamp}.md")
-        self.file = open(self.filename, "w", encoding="utf-8")
-        self.file.write(f"# Flight Recorder Trace: {timestamp}\n\n")
-        self.file.write("This file logs the entire lifecycle of the request.\n\n")
-        self.file.flush()
+        self.run_id = uuid.uuid4().hex
+        self.sink = sink or get_trace_sink(settings, Path(log_dir))
+        self._record("start", owner=owner)
 
     @property
     def langsmith_enabled(self) -> bool:
@@ -118,6 +176,8 @@ class WorkflowTracer:
     def start_root(self, name: str, inputs: dict[str, Any], *, metadata: dict[str, Any] | None = None) -> TraceRun:
         if self.root is not None:
             return self.root
+        if self.run_id is not None:
+            metadata = {**(metadata or {}), "trace_run_id": self.run_id}
         self.root = self._start_run(name, "chain", inputs, metadata=metadata)
         return self.root
 
@@ -133,30 +193,45 @@ class WorkflowTracer:
         metadata: dict[str, Any] | None,
     ) -> TraceRun:
         started_at = time.perf_counter()
-        if self.langsmith_client is None:
+        if self.sampler is None or self.sampled is False:
             return TraceRun(None, started_at)
-        try:
-            if self.root is None:
-                tree = RunTree(
+        run = TraceRun(None, started_at, start_time=datetime.datetime.now(datetime.timezone.utc), tracer=self)
+        if self.langsmith_client is None or self.exporter is None:
+            return run
+        parent = self.root
+        client = self.langsmith_client
+        project = self.langsmith_project
+        text = self.blobs.redact
+        inputs = dict(inputs)
+        metadata = dict(metadata or {})
+
+        # Redaction, run-tree construction, and the post all happen on the export thread, so
+        # the start and end times are taken here and in ``finish``, not when the worker runs.
+        def export() -> None:
+            if parent is None:
+                run.tree = RunTree(
                     name=name,
                     run_type=run_type,
-                    inputs=_redact(inputs),
-                    project_name=self.langsmith_project,
-                    extra={"metadata": _redact(metadata or {})},
-                    ls_client=self.langsmith_client,
+                    inputs=_redact(inputs, text),
+                    project_name=project,
+                    extra={"metadata": _redact(metadata, text)},
+                    start_time=run.start_time,
+                    ls_client=client,
                 )
-            else:
-                tree = self.root.tree.create_child(  # type: ignore[union-attr]
+            elif parent.tree is not None:
+                run.tree = parent.tree.create_child(
                     name=name,
                     run_type=run_type,
-                    inputs=_redact(inputs),
-                    extra={"metadata": _redact(metadata or {})},
+                    inputs=_redact(inputs, text),
+                    extra={"metadata": _redact(metadata, text)},
+                    start_time=run.start_time,
                 )
-            tree.post()
-            return TraceRun(tree, started_at)
-        except Exception as exc:  # pragma: no cover - tracing must never break application work
-            print(f"[WARNING] LangSmith trace creation failed: {exc}")
-            return TraceRun(None, started_at)
+            else:  # the parent's create was dropped; an orphan child would show up as its own trace
+                return
+            run.tree.post()
+
+        self._submit(self.exporter.submit, export)
+        return run
 
     def finish_root(
         self,
@@ -171,34 +246,58 @@ class WorkflowTracer:
 
     def close_unfinished(self, reason: str) -> None:
         """Best-effort close for cancelled SSE streams and abandoned generators."""
+        self._cancelled = True
         if self.root is not None and not self.root.closed:
             self.root.finish(error=reason)
         self.finalize()
 
-    def log_step(self, phase_name: str, agent_tag: str, input_data: str, output_data: str) -> None:
-        if not self.enabled or not self.file:
+    def _observe(self, run: TraceRun, *, error: Exception | str | None, metadata: dict[str, Any] | None) -> None:
+        """Note what tail sampling keeps a run for."""
+        if error:
+            self._errored = True
+        if run is self.root and metadata and metadata.get("aborted"):
+            self._cancelled = True
+
+    def _submit(self, target: Callable[[Any], Any], item: Any) -> None:
+        if self.sampled:
+            target(item)
+        elif self.sampled is None:
+            self._pending.append((target, item))
+
+    def _record(self, kind: str, **fields: Any) -> None:
+        if self.sink is None or self._finalized:
             return
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        entry = (
-            f"## Phase: {phase_name}\n"
-            f"**Timestamp:** {timestamp}\n"
-            f"**Agent:** {agent_tag}\n\n"
-            "### Inputs\n"
-            f"```text\n{_redact(input_data)}\n```\n\n"
-            "### Outputs\n"
-            f"```json\n{_redact(output_data)}\n```\n"
-            "---\n\n"
-        )
-        self.file.write(entry)
-        self.file.flush()
+        run_id, ts, blobs = self.run_id, time.time(), self.blobs
+
+        def build() -> list[dict[str, Any]]:
+            new_blobs: list[dict[str, Any]] = []
+            record = {"run_id": run_id, "ts": ts, "kind": kind}
+            for name, value in fields.items():
+                record[name] = blobs.compact(value, new_blobs, searchable=name == "output") if isinstance(value, str) else _redact(value)
+            return [*({"run_id": run_id, "ts": ts, "kind": "blob", **blob} for blob in new_blobs), record]
+
+        self._submit(self.sink.write, build)
+
+    def log_step(self, phase_name: str, agent_tag: str, input_data: str, output_data: str) -> None:
+        self._record("step", phase=phase_name, agent=agent_tag, input=input_data, output=output_data)
 
     def finalize(self) -> str | None:
-        if not self.enabled or not self.file:
-            return self.filename
-        self.file.write("\n# End of Trace\n")
-        self.file.close()
-        self.file = None
-        return self.filename
+        """Close the local trace; returns its ``run_id`` (``None`` when logs are disabled)."""
+        self._record("end")
+        self._finalized = True
+        if self.sampled is None and self.sampler is not None:
+            reason = self.sampler.tail_reason(
+                cancelled=self._cancelled,
+                errored=self._errored,
+                duration_seconds=time.perf_counter() - self._started_at,
+            )
+            pending, self._pending = self._pending, []
+            self.sampler.record_tail(reason, len(pending))
+            self.sampled = reason is not None
+            if self.sampled:
+                for target, item in pending:
+                    target(item)
+        return self.run_id
 
     def __del__(self) -> None:  # pragma: no cover - last-resort cleanup for abandoned async streams
         try:
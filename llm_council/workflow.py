@@ -4,20 +4,32 @@ import asyncio
 import json
 import re
 import time
-from dataclasses import dataclass
-from typing import Any, AsyncIterator, Callable, Optional, Sequence
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Literal, Optional, Sequence
 
+from .client_pool import api_key_fingerprint
+from .council_cache import CouncilCache, council_context_key, get_council_cache
+from .json_repair import get_json_repair_stats, repair_json
+from .json_stream import WILDCARD, IncrementalJsonParser
 from .llm_client import LLMClient
+from .metrics import CouncilMetrics, get_metrics
 from .prompts import PromptSet, load_prompt_set
-from .schemas import ArchitectBlueprint, CriticBatchOutput
+from .schemas import ArchitectBlueprint, CriticScorecard, critic_batch_model
+from .sectional import SectionalFinalizer, build_section_outline
 from .settings import DEFAULT_MODEL_MAP, PERSONA, Settings, get_settings
 from .tracer import WorkflowTracer
 
 
 UsageDict = dict[str, int]
 CouncilEvent = dict[str, Any]
+ReasoningMode = Literal["none", "summary", "full"]
+PipelineMode = Literal["full", "express"]
+FinalizerMode = Literal["single", "sectional"]
 SCORE_METRICS = ("accuracy", "relevance", "completeness", "clarity", "practical_usefulness")
 CONFIGURED_PHASE_TIMEOUT_SECONDS = 30.0
+TASK_CANCEL_TIMEOUT_SECONDS = 5.0
+EXPRESS_MARKER = "=== FINAL ANSWER ==="
 
 
 @dataclass(frozen=True)
@@ -27,6 +39,90 @@ class WorkflowRequest:
     custom_api_key: str | None = None
     custom_model_map: dict[str, str] | None = None
     custom_agents: list[dict[str, str]] | None = None
+    use_council_cache: bool = True
+    # full streams *_thinking deltas, summary only counts them, none never requests them.
+    reasoning_mode: ReasoningMode = "full"
+    # express plans and writes the answer in one call and skips the critic for one or two drafts.
+    pipeline: PipelineMode = "full"
+    # sectional writes each blueprint section concurrently and streams them back in order.
+    finalizer_mode: FinalizerMode = "single"
+    # Straggler policy; None uses the GENERATOR_* server defaults and 0 switches that rule off.
+    generator_quorum: int | None = None
+    straggler_timeout_seconds: float | None = None
+    straggler_after_drafts: int | None = None
+
+
+@dataclass(frozen=True)
+class GeneratorQuorum:
+    """When the generator phase stops waiting for slower personas."""
+
+    required_drafts: int
+    straggler_timeout_seconds: float | None
+    straggler_after_drafts: int
+
+
+def resolve_generator_quorum(request: WorkflowRequest, settings: Settings, agent_count: int) -> GeneratorQuorum:
+    """Combine per-request overrides with server defaults for a council of ``agent_count``.
+
+    The phase ends as soon as ``required_drafts`` drafts are done (0 means every agent), or
+    ``straggler_timeout_seconds`` after the ``straggler_after_drafts``-th draft (0 means a
+    majority). Remaining generators are cancelled either way.
+    """
+    quorum = settings.generator_quorum if request.generator_quorum is None else request.generator_quorum
+    timeout = settings.generator_straggler_timeout_seconds if request.straggler_timeout_seconds is None else request.straggler_timeout_seconds
+    after = settings.generator_straggler_after_drafts if request.straggler_after_drafts is None else request.straggler_after_drafts
+    return GeneratorQuorum(
+        required_drafts=min(quorum, agent_count) if quorum > 0 else agent_count,
+        straggler_timeout_seconds=timeout if timeout > 0 else None,
+        straggler_after_drafts=min(after, agent_count) if after > 0 else agent_count // 2 + 1,
+    )
+
+
+@dataclass
+class CouncilRunScope:
+    """Owns every task a council run starts so an abandoned run can cancel them together."""
+
+    phase: str = "setup"
+    total_tokens: UsageDict = field(default_factory=lambda: {"prompt": 0, "completion": 0, "total": 0})
+    tasks: set[asyncio.Task[Any]] = field(default_factory=set)
+    # LLM clients opened for the run; their pooled connections are returned when it ends.
+    clients: list[Any] = field(default_factory=list)
+    metrics: CouncilMetrics | None = None
+    phase_started_at: float = field(default_factory=time.perf_counter)
+
+    def enter_phase(self, phase: str) -> None:
+        self.end_phase()
+        self.phase = phase
+
+    def end_phase(self) -> None:
+        """Record how long the current phase has run; the next phase starts timing now."""
+        now = time.perf_counter()
+        if self.metrics is not None:
+            self.metrics.phase_duration.observe(now - self.phase_started_at, self.phase)
+        self.phase_started_at = now
+
+    def spawn(self, coroutine: Any) -> asyncio.Task[Any]:
+        task = asyncio.create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def cancel_all(self, timeout: float = TASK_CANCEL_TIMEOUT_SECONDS) -> tuple[int, int]:
+        """Cancel live tasks and wait up to ``timeout``; return (cancelled, still running)."""
+        pending = [task for task in self.tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if not pending:
+            return 0, 0
+        _done, still_running = await asyncio.wait(pending, timeout=timeout)
+        return len(pending), len(still_running)
+
+    async def close_clients(self) -> None:
+        clients, self.clients = self.clients, []
+        for client in clients:
+            close = getattr(client, "aclose", None)
+            if close is not None:
+                await close()
 
 
 def select_active_agents(selected_agents: list[str]) -> list[str]:
@@ -46,6 +142,24 @@ def build_auto_win(agent_name: str) -> dict[str, Any]:
     }
 
 
+def build_unreviewed_finalists(agent_names: Sequence[str]) -> dict[str, Any]:
+    """Critic result for an express run that skips review because it has at most two drafts."""
+    if len(agent_names) == 1:
+        result = build_auto_win(agent_names[0])
+    else:
+        result = {
+            "winner_id": " & ".join(agent_names),
+            "rankings": list(agent_names),
+            "reasoning": "Express mode - critic skipped, both drafts are finalists.",
+            "scores": {},
+            "flaws": {},
+            "time_taken": 0.0,
+            "model": "N/A",
+            "usage": {"prompt": 0, "completion": 0, "total": 0},
+        }
+    return {**result, "finalists": list(agent_names), "scorecards": {}, "skipped": True}
+
+
 def fallback_architect_blueprint() -> dict[str, Any]:
     return {
         "structure": [
@@ -59,9 +173,32 @@ def fallback_architect_blueprint() -> dict[str, Any]:
     }
 
 
+# Blueprint fields the section writers need; the architect writes them before its critique plan.
+SECTION_BRIEF_FIELDS = ("structure", "tone_guidelines", "missing_facts_to_add")
+
+
+def section_brief(blueprint: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "structure": [str(section) for section in blueprint.get("structure") or []],
+        "tone_guidelines": blueprint.get("tone_guidelines", ""),
+        "missing_facts_to_add": blueprint.get("missing_facts_to_add", []),
+    }
+
+
+def critic_batch_count(draft_count: int) -> int:
+    """Number of critic batches needed to review ``draft_count`` drafts, three at most per batch."""
+    return (draft_count + 2) // 3
+
+
+def next_critic_batch_size(remaining_drafts: int) -> int:
+    """Size of the first batch ``balanced_critic_batches`` would cut from ``remaining_drafts`` drafts."""
+    critic_count = max(1, critic_batch_count(remaining_drafts))
+    return -(-remaining_drafts // critic_count)
+
+
 def balanced_critic_batches(responses: list[dict[str, str]]) -> list[list[dict[str, str]]]:
     """Split drafts into balanced, ordered groups of no more than three."""
-    critic_count = max(1, (len(responses) + 2) // 3)
+    critic_count = max(1, critic_batch_count(len(responses)))
     base_size, remainder = divmod(len(responses), critic_count)
     batches: list[list[dict[str, str]]] = []
     cursor = 0
@@ -87,36 +224,75 @@ def critic_review_schema(agent_names: Sequence[str]) -> str:
     )
 
 
-def parse_critic_batch(raw: str, expected_agents: Sequence[str]) -> dict[str, dict[str, Any]]:
-    payload = CriticBatchOutput.model_validate_json(raw)
+def parse_critic_reviews(raw: str, expected_agents: Sequence[str]) -> tuple[dict[str, dict[str, Any]], dict[str, str]]:
+    """Accept every valid scorecard in a critic batch; the second dict explains each agent left without one."""
+    payload = json.loads(raw)
+    raw_reviews = payload.get("reviews") if isinstance(payload, dict) else None
+    if not isinstance(raw_reviews, dict):
+        raise ValueError("Critic output has no reviews object")
     expected_names = list(expected_agents)
     expected_set = set(expected_names)
-    response_keys = set(payload.reviews)
     placeholder_keys = sorted(
-        (key for key in payload.reviews if re.fullmatch(r"Agent-ID-(\d+)", key)),
+        (key for key in raw_reviews if re.fullmatch(r"Agent-ID-(\d+)", key)),
         key=lambda key: int(key.rsplit("-", 1)[1]),
     )
-    if response_keys != expected_set and len(placeholder_keys) == len(expected_names) and len(payload.reviews) == len(expected_names):
+    if set(raw_reviews) != expected_set and len(placeholder_keys) == len(expected_names) and len(raw_reviews) == len(expected_names):
         # Older prompt versions used Agent-ID-N examples. Preserve valid output by mapping
         # those numbered keys back to the ordered critic batch that produced them.
-        payload.reviews = {
-            agent_name: payload.reviews[placeholder_key]
+        raw_reviews = {
+            agent_name: raw_reviews[placeholder_key]
             for agent_name, placeholder_key in zip(expected_names, placeholder_keys, strict=True)
         }
     reviews: dict[str, dict[str, Any]] = {}
+    problems: dict[str, str] = {}
     for agent_name in expected_names:
-        review = payload.reviews.get(agent_name)
+        try:
+            review = CriticScorecard.model_validate(raw_reviews.get(agent_name))
+        except ValueError:
+            review = None
         if review is None or set(review.metric_scores) != set(SCORE_METRICS):
-            raise ValueError(f"Critic omitted a complete scorecard for {agent_name}")
+            problems[agent_name] = f"Critic omitted a complete scorecard for {agent_name}"
+            continue
         scores = {metric: int(review.metric_scores[metric]) for metric in SCORE_METRICS}
         if any(score < 1 or score > 10 for score in scores.values()):
-            raise ValueError(f"Critic returned an out-of-range score for {agent_name}")
+            problems[agent_name] = f"Critic returned an out-of-range score for {agent_name}"
+            continue
         if not review.critique.strip():
-            raise ValueError(f"Critic omitted a critique for {agent_name}")
+            problems[agent_name] = f"Critic omitted a critique for {agent_name}"
+            continue
         reviews[agent_name] = {"metric_scores": scores, "critique": review.critique.strip()}
+    return reviews, problems
+
+
+def parse_critic_batch(raw: str, expected_agents: Sequence[str]) -> dict[str, dict[str, Any]]:
+    """Strict form of ``parse_critic_reviews``: every agent in the batch needs a valid scorecard."""
+    reviews, problems = parse_critic_reviews(raw, expected_agents)
+    if problems:
+        raise ValueError(next(iter(problems.values())))
     return reviews
 
 
+def critic_review_event(batch_index: int, key: str, review: Any, expected_agents: Sequence[str]) -> CouncilEvent | None:
+    """Preview of one scorecard as soon as its object closes; ``parse_critic_batch`` stays authoritative."""
+    agent = key
+    placeholder = re.fullmatch(r"Agent-ID-(\d+)", key)
+    if agent not in expected_agents and placeholder and 1 <= int(placeholder.group(1)) <= len(expected_agents):
+        agent = expected_agents[int(placeholder.group(1)) - 1]
+    if agent not in expected_agents or not isinstance(review, dict) or not isinstance(review.get("metric_scores"), dict):
+        return None
+    scores = {metric: review["metric_scores"][metric] for metric in SCORE_METRICS if isinstance(review["metric_scores"].get(metric), (int, float))}
+    event: CouncilEvent = {
+        "type": "critic_review",
+        "batch": batch_index,
+        "agent": agent,
+        "metric_scores": scores,
+        "critique": str(review.get("critique") or "").strip(),
+    }
+    if len(scores) == len(SCORE_METRICS):
+        event["average"] = round(sum(scores.values()) / len(SCORE_METRICS), 2)
+    return event
+
+
 def aggregate_critic_reviews(
     reviews: dict[str, dict[str, Any]],
     responses: list[dict[str, str]],
@@ -145,6 +321,52 @@ def aggregate_critic_reviews(
     }
 
 
+def parse_express_blueprint(raw: str) -> tuple[dict[str, Any], tuple[str, ...]]:
+    """Parse the JSON blueprint an express call writes before ``EXPRESS_MARKER``, and the repairs it needed."""
+    recovered = repair_json(raw)
+    return ArchitectBlueprint.model_validate(recovered.value).model_dump(), recovered.repairs
+
+
+class ExpressStreamSplitter:
+    """Split one express stream into blueprint text and answer text at ``EXPRESS_MARKER``.
+
+    Text that could be the start of a marker split across deltas is held back until the
+    next delta decides it, so neither side ever shows a fragment of the marker.
+    """
+
+    def __init__(self, marker: str = EXPRESS_MARKER) -> None:
+        self.marker = marker
+        self.in_answer = False
+        self._pending = ""
+        self._answer_started = False
+
+    def feed(self, delta: str) -> tuple[str, str]:
+        """Return the ``(blueprint, answer)`` text that is safe to emit after ``delta``."""
+        if self.in_answer:
+            return "", self._answer(delta)
+        self._pending += delta
+        index = self._pending.find(self.marker)
+        if index >= 0:
+            blueprint, answer = self._pending[:index], self._pending[index + len(self.marker):]
+            self.in_answer = True
+            self._pending = ""
+            return blueprint, self._answer(answer)
+        safe = max(0, len(self._pending) - len(self.marker) + 1)
+        blueprint, self._pending = self._pending[:safe], self._pending[safe:]
+        return blueprint, ""
+
+    def flush(self) -> str:
+        """Return blueprint text still held back when the stream ends without a marker."""
+        pending, self._pending = self._pending, ""
+        return pending
+
+    def _answer(self, text: str) -> str:
+        if not self._answer_started:
+            text = text.lstrip("\r\n")
+            self._answer_started = bool(text)
+        return text
+
+
 class CouncilWorkflow:
     def __init__(
         self,
@@ -153,11 +375,15 @@ class CouncilWorkflow:
         prompts: PromptSet | None = None,
         client_factory: Callable[..., LLMClient] = LLMClient,
         tracer_factory: Callable[..., WorkflowTracer] = WorkflowTracer,
+        council_cache: CouncilCache | None = None,
+        metrics: CouncilMetrics | None = None,
     ) -> None:
         self.settings = settings or get_settings()
         self.prompts = prompts or load_prompt_set()
         self.client_factory = client_factory
         self.tracer_factory = tracer_factory
+        self.metrics = metrics or get_metrics(self.settings)
+        self.council_cache = council_cache if council_cache is not None else get_council_cache(self.settings)
 
     def _model_for(self, role: str, fallback: str, overrides: Optional[dict[str, str]]) -> str:
         if overrides and role in overrides and overrides[role]:
@@ -172,6 +398,11 @@ class CouncilWorkflow:
         value = overrides.get(role, "").strip()
         return value or None
 
+    def _fallback_chain_for(self, role: str) -> tuple[str, ...]:
+        """Configured fallbacks for a role; `generator` applies to every generator_N slot."""
+        chains = self.settings.fallback_chains
+        return chains.get(role) or chains.get(role.split("_", 1)[0], ())
+
     @staticmethod
     def _reasoning_effort_for(role: str) -> str:
         return {
@@ -187,6 +418,8 @@ class CouncilWorkflow:
         schema: Any,
         role: str,
         overrides: Optional[dict[str, str]],
+        deadline: float | None = None,
+        include_reasoning: bool = True,
     ) -> tuple[str, AsyncIterator[Any]]:
         """Use one configured or default model; council phases never run a model race."""
         configured_model = self._configured_phase_model(role, overrides)
@@ -196,11 +429,14 @@ class CouncilWorkflow:
             schema=schema,
             model=model,
             reasoning_effort=self._reasoning_effort_for(role),
-            include_reasoning=True,
+            include_reasoning=include_reasoning,
             first_response_timeout_seconds=CONFIGURED_PHASE_TIMEOUT_SECONDS if configured_model else None,
+            deadline=deadline,
+            fallback_chain=self._fallback_chain_for(role),
+            role=role,
         )
 
-    def _new_tracer(self) -> WorkflowTracer:
+    def _new_tracer(self, owner: str | None = None) -> WorkflowTracer:
         return self.tracer_factory(
             enabled=self.settings.enable_trace_logs,
             log_dir=self.settings.trace_log_dir,
@@ -208,12 +444,122 @@ class CouncilWorkflow:
             langsmith_api_key=self.settings.langsmith_api_key,
             langsmith_endpoint=self.settings.langsmith_endpoint,
             langsmith_project=self.settings.langsmith_project,
+            settings=self.settings,
+            owner=owner,
         )
 
     async def stream(self, request: WorkflowRequest) -> AsyncIterator[CouncilEvent]:
-        tracer = self._new_tracer()
+        """Run the council, answering near-duplicate questions from the council cache when enabled.
+
+        In ``replay`` mode a cached run is re-emitted after a ``council_cache_hit`` event and no
+        model is called. In ``offer`` mode the hit event carries the cached ``final_report`` as an
+        instant answer and the live council still runs. Only runs without errors are stored.
+        """
+        cache = self.council_cache if request.use_council_cache else None
+        if cache is None:
+            async with aclosing(self._stream_council(request)) as events:
+                async for event in events:
+                    yield event
+            return
+
+        started_at = time.perf_counter()
+        context = council_context_key(
+            request.selected_agents,
+            request.custom_model_map,
+            request.custom_agents,
+            request.pipeline,
+            request.finalizer_mode,
+            request.custom_api_key,
+        )
+        match = cache.lookup(request.query, context)
+        if match is not None:
+            hit_event: CouncilEvent = {
+                "type": "council_cache_hit",
+                "mode": cache.mode,
+                "similarity": round(match.similarity, 4),
+                "age_seconds": round(time.time() - match.entry.created_at, 1),
+            }
+            if cache.mode == "replay":
+                yield hit_event
+                for event in match.entry.events:
+                    if request.reasoning_mode != "full" and event["type"].endswith("_thinking"):
+                        continue
+                    yield dict(event)
+                yield {
+                    "type": "done",
+                    "total_execution_time": time.perf_counter() - started_at,
+                    "total_tokens": {"prompt": 0, "completion": 0, "total": 0},
+                    "cache_hit": True,
+                }
+                return
+            yield {**hit_event, "final_report": match.final_report}
+
+        recorded: list[CouncilEvent] = []
+        failed = False
+        async with aclosing(self._stream_council(request)) as events:
+            async for event in events:
+                if event.get("type") == "error":
+                    failed = True
+                elif event.get("type") != "done":
+                    recorded.append(event)
+                yield event
+        if not failed and any(event.get("type") == "finalizer_done" for event in recorded):
+            cache.store(request.query, context, recorded)
+
+    async def _stream_council(self, request: WorkflowRequest) -> AsyncIterator[CouncilEvent]:
+        """Run one live council inside a scope that owns its tasks and upstream streams.
+
+        A client disconnect arrives as ``GeneratorExit`` (from ``aclose()``) or as
+        ``CancelledError`` (when the consuming task is cancelled). Either way every pump task is
+        cancelled, their NIM streams are closed, and the root trace records the aborted phase.
+        """
+        tracer = self._new_tracer(owner=api_key_fingerprint(request.custom_api_key or self.settings.nvidia_api_key))
+        scope = CouncilRunScope(metrics=self.metrics)
+        started_at = scope.phase_started_at
+        # An exception leaves "failed"; so does an unrecoverable error event.
+        outcome = "failed"
+        failed = False
+        self.metrics.councils_in_flight.inc()
+        try:
+            async with aclosing(self._run_council(request, scope, tracer)) as events:
+                async for event in events:
+                    failed = failed or (event.get("type") == "error" and not event.get("recoverable", True))
+                    yield event
+            outcome = "failed" if failed else "completed"
+        except (asyncio.CancelledError, GeneratorExit):
+            outcome = "cancelled"
+            cancelled, still_running = await scope.cancel_all()
+            if still_running:
+                print(f"[WARNING] {still_running} council task(s) did not stop within {TASK_CANCEL_TIMEOUT_SECONDS:.0f}s of cancellation.")
+            tracer.finish_root(
+                error=f"Council meeting aborted during {scope.phase} phase.",
+                usage=scope.total_tokens,
+                metadata={"aborted": True, "aborted_phase": scope.phase, "cancelled_tasks": cancelled, "tasks_still_running": still_running},
+            )
+            tracer.finalize()
+            raise
+        finally:
+            await scope.close_clients()
+            scope.end_phase()
+            self.metrics.councils_in_flight.dec()
+            self.metrics.council_duration.observe(time.perf_counter() - started_at, request.pipeline, outcome)
+
+    async def _run_council(
+        self,
+        request: WorkflowRequest,
+        scope: CouncilRunScope,
+        tracer: WorkflowTracer,
+    ) -> AsyncIterator[CouncilEvent]:
         workflow_start = time.perf_counter()
-        total_tokens: UsageDict = {"prompt": 0, "completion": 0, "total": 0}
+        # Retries never sleep past the run budget; phases still stream until they finish.
+        run_deadline = (
+            time.monotonic() + self.settings.council_run_budget_seconds
+            if self.settings.council_run_budget_seconds > 0
+            else None
+        )
+        total_tokens = scope.total_tokens
+        request_reasoning = request.reasoning_mode != "none"
+        stream_reasoning = request.reasoning_mode == "full"
         tracer.start_root(
             "Council Meeting",
             {
@@ -225,6 +571,11 @@ class CouncilWorkflow:
             metadata={"workflow": "council", "mock_mode": self.settings.use_mock_mode},
         )
 
+        def thinking_done(event: CouncilEvent, reasoning_chars: int) -> CouncilEvent:
+            if request.reasoning_mode == "summary":
+                event["reasoning_chars"] = reasoning_chars
+            return event
+
         def add_usage(usage: UsageDict) -> None:
             total_tokens["prompt"] += usage.get("prompt", 0)
             total_tokens["completion"] += usage.get("completion", 0)
@@ -270,6 +621,7 @@ class CouncilWorkflow:
             api_key=request.custom_api_key or self.settings.nvidia_api_key,
             settings=self.settings,
         )
+        scope.clients.append(client)
         tracer.log_step(
             "Initialization",
             "System",
@@ -277,9 +629,12 @@ class CouncilWorkflow:
             f"Workflow started. Agents: {[agent['name'] for agent in active_agents]}. Mock mode: {self.settings.use_mock_mode}",
         )
 
+        scope.enter_phase("generator")
         responses_by_agent: dict[str, str] = {}
-        generator_tasks: list[asyncio.Task[None]] = []
-        generator_queue: asyncio.Queue[tuple[str, str, Any]] = asyncio.Queue()
+        generator_tasks: dict[str, asyncio.Task[None]] = {}
+        generator_reasoning_chars: dict[str, int] = {}
+        # Generator and critic pumps share one queue so critic batches can stream while drafts finish.
+        phase_queue: asyncio.Queue[tuple[str, str, Any, Any]] = asyncio.Queue()
 
         for index, agent in enumerate(active_agents):
             agent_name = agent["name"]
@@ -303,113 +658,62 @@ class CouncilWorkflow:
                 started: float = started_at,
                 generator_prompt: str = prompt,
                 trace_run: Any = generator_trace,
+                fallback_chain: tuple[str, ...] = self._fallback_chain_for(f"generator_{index + 1}"),
             ) -> None:
                 content = ""
                 usage: UsageDict = {"prompt": 0, "completion": 0, "total": 0}
+                cache_hit = False
                 try:
                     async for update in client.stream_generate(
                         generator_prompt,
                         model=model,
                         # Keep internal reasoning economical without imposing an output ceiling.
                         reasoning_effort="low",
-                        include_reasoning=True,
+                        include_reasoning=request_reasoning,
+                        deadline=run_deadline,
+                        fallback_chain=fallback_chain,
+                        role="generator",
                     ):
                         reasoning = getattr(update, "reasoning", "")
                         if reasoning:
-                            await generator_queue.put(("thinking", name, reasoning))
+                            generator_reasoning_chars[name] = generator_reasoning_chars.get(name, 0) + len(reasoning)
+                            if stream_reasoning:
+                                await phase_queue.put(("generator", "thinking", name, reasoning))
                         if update.delta:
                             trace_run.mark_first_delta()
                             content += update.delta
-                            await generator_queue.put(("chunk", name, update.delta))
+                            await phase_queue.put(("generator", "chunk", name, update.delta))
                         if update.usage is not None:
                             usage = update.usage
+                            cache_hit = getattr(update, "cache_hit", False)
                     if not content.strip():
                         raise RuntimeError("The model completed without visible answer text. Try running this agent again.")
-                    await generator_queue.put(("thinking_done", name, None))
-                    await generator_queue.put(("done", name, (content, usage, model, started, trace_run)))
+                    await phase_queue.put(("generator", "thinking_done", name, None))
+                    await phase_queue.put(("generator", "done", name, (content, usage, model, started, trace_run, cache_hit)))
                 except asyncio.CancelledError:
                     trace_run.finish(outputs={"visible_output": content}, usage=usage, error="Generator cancelled")
                     raise
                 except Exception as exc:  # pragma: no cover - defensive async boundary
                     trace_run.finish(outputs={"visible_output": content}, usage=usage, error=exc)
-                    await generator_queue.put(("thinking_done", name, None))
-                    await generator_queue.put(("error", name, exc))
-
-            generator_tasks.append(asyncio.create_task(pump_generator()))
-
-        try:
-            unfinished = len(generator_tasks)
-            while unfinished:
-                event_type, agent_name, payload = await generator_queue.get()
-                if event_type == "chunk":
-                    yield {"type": "generator_chunk", "agent": agent_name, "chunk": payload}
-                elif event_type == "thinking":
-                    yield {"type": "generator_thinking", "agent": agent_name, "chunk": payload}
-                elif event_type == "thinking_done":
-                    yield {"type": "generator_thinking_done", "agent": agent_name}
-                elif event_type == "done":
-                    response_content, usage, model_id, started_at, trace_run = payload
-                    duration = time.perf_counter() - started_at
-                    add_usage(usage)
-                    responses_by_agent[agent_name] = response_content
-                    trace_run.finish(
-                        outputs={"visible_output": response_content},
-                        usage=usage,
-                        metadata={"duration_seconds": round(duration, 4)},
-                    )
-                    tracer.log_step("Generators", f"Generator-{agent_name}", request.query, response_content)
-                    yield {
-                        "type": "generator_done", "agent": agent_name, "time_taken": duration,
-                        "model": model_id, "usage": usage,
-                    }
-                    unfinished -= 1
-                else:
-                    exc = payload
-                    yield {
-                        "type": "error",
-                        "message": f"Agent {agent_name} failed: {exc}",
-                        "phase": "generator",
-                        "agent": agent_name,
-                        "recoverable": True,
-                    }
-                    unfinished -= 1
-        except asyncio.CancelledError:
-            for task in generator_tasks:
-                task.cancel()
-            await asyncio.gather(*generator_tasks, return_exceptions=True)
-            tracer.finish_root(error="Council meeting cancelled during generator phase.", usage=total_tokens)
-            tracer.finalize()
-            raise
+                    await phase_queue.put(("generator", "thinking_done", name, None))
+                    await phase_queue.put(("generator", "error", name, exc))
 
-        responses = [
-            {"persona": agent_name, "content": responses_by_agent[agent_name]}
-            for agent in active_agents
-            if agent["name"] in responses_by_agent
-            for agent_name in [agent["name"]]
-        ]
-
-        if not responses:
-            yield {
-                "type": "error",
-                "message": "All generators failed before the council could produce a draft.",
-                "phase": "generator",
-                "recoverable": False,
-            }
-            tracer.finish_root(error="All generators failed before the council could produce a draft.", usage=total_tokens)
-            tracer.finalize()
-            yield {
-                "type": "done",
-                "total_execution_time": time.perf_counter() - workflow_start,
-                "total_tokens": total_tokens,
-            }
-            return
+            generator_tasks[agent_name] = scope.spawn(pump_generator())
 
         critic_model = self._configured_phase_model("critic", request.custom_model_map) or DEFAULT_MODEL_MAP["critic"]
-        critic_batches = balanced_critic_batches(responses)
-        critic_queue: asyncio.Queue[tuple[str, int, Any]] = asyncio.Queue()
+        critic_reasoning_chars: dict[int, int] = {}
         critic_tasks: list[asyncio.Task[None]] = []
 
-        for batch_index, batch in enumerate(critic_batches, start=1):
+        critic_attempts: dict[int, int] = {}
+        # Re-asks are counted through ``reask_of`` only, so clients see a stable batch total.
+        critic_total_batches = 0
+
+        def start_critic_batch(batch: list[dict[str, str]], total_batches: int, reask_of: int | None = None) -> CouncilEvent:
+            nonlocal critic_total_batches
+            batch_index = len(critic_tasks) + 1
+            if reask_of is None:
+                critic_total_batches = total_batches
+            critic_attempts[batch_index] = 0 if reask_of is None else critic_attempts[reask_of] + 1
             formatted_text = self._format_responses_for_critic(batch)
             prompt = self.prompts.critic.format(
                 query=request.query,
@@ -419,9 +723,11 @@ class CouncilWorkflow:
             critic_trace = tracer.start_llm(
                 f"Critic Batch {batch_index}",
                 {"query": request.query, "prompt": prompt, "drafts": batch},
-                metadata={"stage": "critic", "batch": batch_index, "total_batches": len(critic_batches), "model": critic_model, "reasoning_effort": "high"},
+                metadata={
+                    "stage": "critic", "batch": batch_index, "total_batches": total_batches, "model": critic_model,
+                    "reasoning_effort": "high", "reask_of": reask_of,
+                },
             )
-            yield {"type": "critic_start", "model": critic_model, "batch": batch_index, "total_batches": len(critic_batches)}
 
             async def pump_critic(
                 index: int = batch_index,
@@ -433,101 +739,472 @@ class CouncilWorkflow:
                 usage: UsageDict = {"prompt": 0, "completion": 0, "total": 0}
                 started = time.perf_counter()
                 model_used = critic_model
+                cache_hit = False
+                reviews = IncrementalJsonParser([("reviews", WILDCARD)])
+                expected_agents = [response["persona"] for response in critic_batch]
                 try:
                     _model_label, stream = self._phase_stream(
-                        client, critic_prompt, CriticBatchOutput, "critic", request.custom_model_map,
+                        client, critic_prompt, critic_batch_model(tuple(expected_agents)), "critic", request.custom_model_map, run_deadline,
+                        include_reasoning=request_reasoning,
                     )
                     async for update in stream:
                         if getattr(update, "model", None):
                             model_used = update.model
                         reasoning = getattr(update, "reasoning", "")
                         if reasoning:
-                            await critic_queue.put(("thinking", index, reasoning))
+                            critic_reasoning_chars[index] = critic_reasoning_chars.get(index, 0) + len(reasoning)
+                            if stream_reasoning:
+                                await phase_queue.put(("critic", "thinking", index, reasoning))
                         if update.delta:
                             trace_run.mark_first_delta()
                             chunks.append(update.delta)
-                            await critic_queue.put(("chunk", index, update.delta))
+                            await phase_queue.put(("critic", "chunk", index, update.delta))
+                            for (_reviews, agent_key), review in reviews.feed(update.delta):
+                                preview = critic_review_event(index, str(agent_key), review, expected_agents)
+                                if preview is not None:
+                                    await phase_queue.put(("critic", "review", index, preview))
                         if update.usage is not None:
                             usage = update.usage
-                    await critic_queue.put(("done", index, (critic_batch, critic_prompt, "".join(chunks), usage, started, model_used, trace_run)))
+                            cache_hit = getattr(update, "cache_hit", False)
+                    await phase_queue.put(("critic", "done", index, (critic_batch, critic_prompt, "".join(chunks), usage, started, model_used, trace_run, cache_hit)))
                 except asyncio.CancelledError:
                     trace_run.finish(outputs={"visible_output": "".join(chunks)}, usage=usage, error="Critic cancelled")
                     raise
                 except Exception as exc:  # pragma: no cover - defensive async boundary
                     trace_run.finish(outputs={"visible_output": "".join(chunks)}, usage=usage, error=exc)
-                    await critic_queue.put(("error", index, exc))
+                    await phase_queue.put(("critic", "error", index, exc))
+
+            critic_tasks.append(scope.spawn(pump_critic()))
+            event: CouncilEvent = {"type": "critic_start", "model": critic_model, "batch": batch_index, "total_batches": total_batches}
+            if reask_of is not None:
+                event["reask_of"] = reask_of
+            return event
 
-            critic_tasks.append(asyncio.create_task(pump_critic()))
+        # Barrier scheduling reviews drafts in agent order once every generator has finished.
+        # Pipelined scheduling cuts batches in completion order while generators are still running,
+        # so only the last batch waits for the slowest persona.
+        express = request.pipeline == "express"
+        # An express council of one or two agents never needs a critic, so never cut a batch early.
+        pipelined_critics = self.settings.critic_scheduling == "pipelined" and not (express and len(active_agents) <= 2)
+        critic_skipped = False
+        unbatched_drafts: list[dict[str, str]] = []
+        unbatched_since: float | None = None
+        unfinished = len(generator_tasks)
+        responses: list[dict[str, str]] = []
+        quorum = resolve_generator_quorum(request, self.settings, len(generator_tasks))
+        settled_agents: set[str] = set()
+        straggler_deadline: float | None = None
+
+        def cut_off_stragglers(reason: str) -> None:
+            """Cancel unfinished generators; a marker queued behind their last update settles each one."""
+            nonlocal straggler_deadline
+            straggler_deadline = None
+            for name, task in generator_tasks.items():
+                if name not in settled_agents and not task.done():
+                    task.cancel()
+                    phase_queue.put_nowait(("generator", "cutoff", name, reason))
+
+        def ready_critic_batches(timed_out: bool = False) -> list[CouncilEvent]:
+            nonlocal unbatched_since
+            started: list[CouncilEvent] = []
+            if not unfinished:
+                batches = balanced_critic_batches(unbatched_drafts) if unbatched_drafts else []
+                total_batches = len(critic_tasks) + len(batches)
+                started = [start_critic_batch(batch, total_batches) for batch in batches]
+                unbatched_drafts.clear()
+            while unbatched_drafts:
+                remaining = len(unbatched_drafts) + unfinished
+                size = next_critic_batch_size(remaining)
+                if len(unbatched_drafts) < size and not timed_out:
+                    break
+                batch = unbatched_drafts[:size]
+                del unbatched_drafts[:size]
+                # Failed or slow generators can still change this estimate for later batches.
+                total_batches = len(critic_tasks) + 1 + critic_batch_count(remaining - len(batch))
+                started.append(start_critic_batch(batch, total_batches))
+                timed_out = False
+                unbatched_since = None
+            # A stale timer with nothing left to batch would make every queue wait time out at once.
+            if not unbatched_drafts:
+                unbatched_since = None
+            elif unbatched_since is None:
+                unbatched_since = time.monotonic()
+            return started
 
         collected_reviews: dict[str, dict[str, Any]] = {}
         critic_usage: UsageDict = {"prompt": 0, "completion": 0, "total": 0}
         critic_time = 0.0
         critic_models_used: list[str] = []
-        unfinished_critics = len(critic_tasks)
-        try:
-            while unfinished_critics:
-                event_type, batch_index, payload = await critic_queue.get()
+        critic_cache_hits: list[bool] = []
+        critic_repairs: dict[int, list[str]] = {}
+        unfinished_critics = 0
+        while unfinished or unfinished_critics:
+            critic_batch_due = None if unbatched_since is None else unbatched_since + self.settings.critic_batch_timeout_seconds
+            wake_at = min((due for due in (critic_batch_due, straggler_deadline) if due is not None), default=None)
+            timeout = None if wake_at is None else max(0.0, wake_at - time.monotonic())
+            try:
+                phase, event_type, key, payload = await asyncio.wait_for(phase_queue.get(), timeout)
+            except TimeoutError:
+                if straggler_deadline is not None and time.monotonic() >= straggler_deadline:
+                    cut_off_stragglers(
+                        f"no draft within {quorum.straggler_timeout_seconds:g}s after "
+                        f"{quorum.straggler_after_drafts} of {len(generator_tasks)} drafts finished"
+                    )
+                    continue
+                for event in ready_critic_batches(timed_out=True):
+                    unfinished_critics += 1
+                    yield event
+                continue
+
+            if phase == "generator":
+                agent_name = key
+                if agent_name in settled_agents:
+                    # A cut-off marker for a generator whose draft was already queued.
+                    continue
                 if event_type == "chunk":
-                    yield {"type": "critic_chunk", "batch": batch_index, "chunk": payload}
+                    yield {"type": "generator_chunk", "agent": agent_name, "chunk": payload}
                     continue
                 if event_type == "thinking":
-                    yield {"type": "critic_thinking", "batch": batch_index, "chunk": payload}
+                    yield {"type": "generator_thinking", "agent": agent_name, "chunk": payload}
                     continue
-                if event_type == "error":
-                    yield {"type": "error", "message": f"Critic {batch_index} failed: {payload}", "phase": "critic", "recoverable": True}
-                    yield {"type": "critic_thinking_done", "batch": batch_index}
-                    unfinished_critics -= 1
+                if event_type == "thinking_done":
+                    yield thinking_done({"type": "generator_thinking_done", "agent": agent_name}, generator_reasoning_chars.get(agent_name, 0))
                     continue
-
-                batch, prompt, critic_json, usage, started, model_used, trace_run = payload
-                duration = time.perf_counter() - started
-                critic_time += duration
-                critic_models_used.append(model_used)
-                add_usage(usage)
-                for key in critic_usage:
-                    critic_usage[key] += usage.get(key, 0)
-                tracer.log_step("Critics", f"Critic-Batch-{batch_index}", prompt, critic_json)
-                try:
-                    collected_reviews.update(parse_critic_batch(critic_json, [item["persona"] for item in batch]))
-                except (ValueError, TypeError) as exc:
-                    trace_run.finish(outputs={"visible_output": critic_json}, usage=usage, error=exc)
-                    yield {"type": "error", "message": f"Critic {batch_index} returned invalid scorecards: {exc}", "phase": "critic", "recoverable": True}
+                if event_type == "done":
+                    response_content, usage, model_id, started_at, trace_run, cache_hit = payload
+                    duration = time.perf_counter() - started_at
+                    add_usage(usage)
+                    responses_by_agent[agent_name] = response_content
+                    trace_run.finish(
+                        outputs={"visible_output": response_content},
+                        usage=usage,
+                        metadata={"duration_seconds": round(duration, 4)},
+                    )
+                    tracer.log_step("Generators", f"Generator-{agent_name}", request.query, response_content)
+                    yield {
+                        "type": "generator_done", "agent": agent_name, "time_taken": duration,
+                        "model": model_id, "usage": usage, "cache_hit": cache_hit,
+                    }
+                    if pipelined_critics:
+                        unbatched_drafts.append({"persona": agent_name, "content": response_content})
+                elif event_type == "cutoff":
+                    yield thinking_done({"type": "generator_thinking_done", "agent": agent_name}, generator_reasoning_chars.get(agent_name, 0))
+                    yield {
+                        "type": "error",
+                        "message": f"Agent {agent_name} was cut off: {payload}.",
+                        "phase": "generator",
+                        "agent": agent_name,
+                        "recoverable": True,
+                        "cutoff": True,
+                    }
                 else:
-                    trace_run.finish(outputs={"visible_output": critic_json}, usage=usage)
-                yield {"type": "critic_thinking_done", "batch": batch_index}
+                    yield {
+                        "type": "error",
+                        "message": f"Agent {agent_name} failed: {payload}",
+                        "phase": "generator",
+                        "agent": agent_name,
+                        "recoverable": True,
+                    }
+                settled_agents.add(agent_name)
+                unfinished -= 1
+
+                if event_type == "done" and unfinished:
+                    if len(responses_by_agent) >= quorum.required_drafts:
+                        cut_off_stragglers(f"quorum of {quorum.required_drafts} drafts reached")
+                    elif (
+                        straggler_deadline is None
+                        and quorum.straggler_timeout_seconds is not None
+                        and len(responses_by_agent) == quorum.straggler_after_drafts
+                    ):
+                        straggler_deadline = time.monotonic() + quorum.straggler_timeout_seconds
+
+                if not unfinished:
+                    responses = [
+                        {"persona": agent["name"], "content": responses_by_agent[agent["name"]]}
+                        for agent in active_agents
+                        if agent["name"] in responses_by_agent
+                    ]
+                    if not responses:
+                        yield {
+                            "type": "error",
+                            "message": "All generators failed before the council could produce a draft.",
+                            "phase": "generator",
+                            "recoverable": False,
+                        }
+                        tracer.finish_root(error="All generators failed before the council could produce a draft.", usage=total_tokens)
+                        tracer.finalize()
+                        yield {
+                            "type": "done",
+                            "total_execution_time": time.perf_counter() - workflow_start,
+                            "total_tokens": total_tokens,
+                        }
+                        return
+                    scope.enter_phase("critic")
+                    if express and len(responses) <= 2 and not critic_tasks:
+                        # Both drafts would be finalists anyway; scorecards only cost a round trip.
+                        critic_skipped = True
+                        unbatched_drafts.clear()
+                    elif not pipelined_critics:
+                        unbatched_drafts.extend(responses)
+                for event in ready_critic_batches():
+                    unfinished_critics += 1
+                    yield event
+                continue
+
+            batch_index = key
+            if event_type == "chunk":
+                yield {"type": "critic_chunk", "batch": batch_index, "chunk": payload}
+                continue
+            if event_type == "thinking":
+                yield {"type": "critic_thinking", "batch": batch_index, "chunk": payload}
+                continue
+            if event_type == "review":
+                yield payload
+                continue
+            if event_type == "error":
+                yield {"type": "error", "message": f"Critic {batch_index} failed: {payload}", "phase": "critic", "recoverable": True}
+                yield thinking_done({"type": "critic_thinking_done", "batch": batch_index}, critic_reasoning_chars.get(batch_index, 0))
                 unfinished_critics -= 1
-        except asyncio.CancelledError:
-            for task in critic_tasks:
-                task.cancel()
-            await asyncio.gather(*critic_tasks, return_exceptions=True)
-            tracer.finish_root(error="Council meeting cancelled during critic phase.", usage=total_tokens)
-            tracer.finalize()
-            raise
+                continue
+
+            batch, prompt, critic_json, usage, started, model_used, trace_run, cache_hit = payload
+            duration = time.perf_counter() - started
+            critic_time += duration
+            critic_models_used.append(model_used)
+            critic_cache_hits.append(cache_hit)
+            add_usage(usage)
+            for usage_key in critic_usage:
+                critic_usage[usage_key] += usage.get(usage_key, 0)
+            tracer.log_step("Critics", f"Critic-Batch-{batch_index}", prompt, critic_json)
+            try:
+                recovered = repair_json(critic_json)
+                reviews, problems = parse_critic_reviews(recovered.text, [item["persona"] for item in batch])
+            except (ValueError, TypeError) as exc:
+                get_json_repair_stats().record(model_used, "critic", None)
+                trace_run.finish(outputs={"visible_output": critic_json}, usage=usage, error=exc)
+                yield {"type": "error", "message": f"Critic {batch_index} returned invalid scorecards: {exc}", "phase": "critic", "recoverable": True}
+            else:
+                get_json_repair_stats().record(model_used, "critic", recovered.repairs)
+                if recovered.repairs:
+                    critic_repairs[batch_index] = list(recovered.repairs)
+                collected_reviews.update(reviews)
+                trace_metadata: dict[str, Any] = {}
+                if recovered.repairs:
+                    trace_metadata["json_repairs"] = list(recovered.repairs)
+                if problems:
+                    trace_metadata["invalid_scorecards"] = problems
+                trace_run.finish(outputs={"visible_output": critic_json}, usage=usage, metadata=trace_metadata or None)
+                if problems:
+                    # Keep the valid scorecards and re-score only the drafts that lack one.
+                    detail = "; ".join(problems.values())
+                    missing = [item for item in batch if item["persona"] in problems]
+                    if critic_attempts[batch_index] < self.settings.critic_reask_attempts:
+                        yield {
+                            "type": "error",
+                            "message": f"Critic {batch_index} left {len(missing)} of {len(batch)} drafts without a valid scorecard ({detail}). Re-scoring just those drafts.",
+                            "phase": "critic",
+                            "recoverable": True,
+                        }
+                        unfinished_critics += 1
+                        yield start_critic_batch(missing, critic_total_batches, reask_of=batch_index)
+                    else:
+                        yield {"type": "error", "message": f"Critic {batch_index} returned invalid scorecards: {detail}", "phase": "critic", "recoverable": True}
+            yield thinking_done({"type": "critic_thinking_done", "batch": batch_index}, critic_reasoning_chars.get(batch_index, 0))
+            unfinished_critics -= 1
 
-        critic_data = aggregate_critic_reviews(collected_reviews, responses)
-        finalists = critic_data["finalists"]
-        if not finalists:
-            finalists = [response["persona"] for response in responses[:2]]
-            critic_data["finalists"] = finalists
-            critic_data["winner_id"] = " & ".join(finalists)
-            critic_data["reasoning"] = "No critic batch produced valid scorecards; finalists use generator order as a safe fallback."
-            yield {"type": "error", "message": "No valid critic scorecards were available; using the first drafts as finalists.", "phase": "critic", "recoverable": True}
-        critic_data["time_taken"] = critic_time
-        critic_data["model"] = critic_models_used[0] if critic_models_used else critic_model
-        critic_data["usage"] = critic_usage
-        yield {"type": "critic_result", **critic_data}
+        if critic_skipped:
+            critic_data = build_unreviewed_finalists([response["persona"] for response in responses])
+            finalists = critic_data["finalists"]
+        else:
+            critic_data = aggregate_critic_reviews(collected_reviews, responses)
+            finalists = critic_data["finalists"]
+            if not finalists:
+                finalists = [response["persona"] for response in responses[:2]]
+                critic_data["finalists"] = finalists
+                critic_data["winner_id"] = " & ".join(finalists)
+                critic_data["reasoning"] = "No critic batch produced valid scorecards; finalists use generator order as a safe fallback."
+                yield {"type": "error", "message": "No valid critic scorecards were available; using the first drafts as finalists.", "phase": "critic", "recoverable": True}
+            critic_data["time_taken"] = critic_time
+            critic_data["model"] = critic_models_used[0] if critic_models_used else critic_model
+            critic_data["usage"] = critic_usage
+            critic_data["cache_hit"] = bool(critic_cache_hits) and all(critic_cache_hits)
+        # Repairs are reported to the client only; critic_data also feeds the architect prompt.
+        yield {"type": "critic_result", **critic_data, **({"json_repairs": critic_repairs} if critic_repairs else {})}
         yield {"type": "critic_done"}
 
         finalist_responses = [response for response in responses if response["persona"] in finalists]
         finalist_context = self._format_finalists(finalist_responses, critic_data.get("scorecards", {}))
 
+        if express:
+            # One call plans and writes the answer; its stream is split back into the
+            # architect_* and finalizer_* events the timeline already understands.
+            scope.enter_phase("express")
+            express_prompt = self.prompts.express.format(
+                query=request.query,
+                finalist_responses=finalist_context,
+                critiques=json.dumps(critic_data),
+                marker=EXPRESS_MARKER,
+            )
+            express_model, express_stream = self._phase_stream(
+                client, express_prompt, None, "architect", request.custom_model_map, run_deadline,
+                include_reasoning=request_reasoning,
+            )
+            express_trace = tracer.start_llm(
+                "Express Synthesis",
+                {"query": request.query, "prompt": express_prompt, "finalists": finalist_responses, "critic_data": critic_data},
+                metadata={"stage": "express", "model": express_model, "reasoning_effort": "medium"},
+            )
+            yield {"type": "architect_start", "model": express_model}
+            started_at = time.perf_counter()
+            splitter = ExpressStreamSplitter()
+            blueprint_chunks: list[str] = []
+            final_chunks: list[str] = []
+            express_usage: UsageDict = {"prompt": 0, "completion": 0, "total": 0}
+            express_model_used = express_model
+            express_cache_hit = False
+            reasoning_chars = {"architect": 0, "finalizer": 0}
+            blueprint_duration = 0.0
+            blueprint_parser = IncrementalJsonParser([("structure", WILDCARD)])
+
+            def blueprint_events(marker_found: bool) -> list[CouncilEvent]:
+                nonlocal blueprint_duration
+                blueprint_duration = time.perf_counter() - started_at
+                events = [thinking_done({"type": "architect_thinking_done"}, reasoning_chars["architect"])]
+                blueprint_raw = "".join(blueprint_chunks)
+                try:
+                    if not marker_found:
+                        raise ValueError("no final answer marker")
+                    blueprint, repairs = parse_express_blueprint(blueprint_raw)
+                    get_json_repair_stats().record(express_model_used, "architect", repairs)
+                    if repairs:
+                        blueprint["json_repairs"] = list(repairs)
+                except ValueError:
+                    if marker_found:
+                        get_json_repair_stats().record(express_model_used, "architect", None)
+                    events.append({
+                        "type": "error",
+                        "message": "Express mode returned no valid blueprint. Using a safe fallback blueprint.",
+                        "phase": "architect",
+                        "recoverable": True,
+                    })
+                    blueprint = fallback_architect_blueprint()
+                tracer.log_step("Architect", "Express-Planner", express_prompt, blueprint_raw)
+                events.append({
+                    "type": "architect_result", **blueprint, "time_taken": blueprint_duration, "model": express_model_used,
+                    "usage": {"prompt": 0, "completion": 0, "total": 0}, "cache_hit": express_cache_hit, "express": True,
+                })
+                events.append({"type": "finalizer_start", "model": express_model_used})
+                return events
+
+            try:
+                async with aclosing(express_stream):
+                    async for update in express_stream:
+                        if getattr(update, "model", None):
+                            express_model_used = update.model
+                        stage = "finalizer" if splitter.in_answer else "architect"
+                        reasoning = getattr(update, "reasoning", "")
+                        if reasoning:
+                            reasoning_chars[stage] += len(reasoning)
+                            if stream_reasoning:
+                                yield {"type": f"{stage}_thinking", "chunk": reasoning}
+                        if update.delta:
+                            express_trace.mark_first_delta()
+                            blueprint_text, answer_text = splitter.feed(update.delta)
+                            if blueprint_text:
+                                blueprint_chunks.append(blueprint_text)
+                                yield {"type": "architect_chunk", "chunk": blueprint_text}
+                                for (_structure, section_index), section in blueprint_parser.feed(blueprint_text):
+                                    yield {"type": "architect_section", "index": section_index, "section": section}
+                            if splitter.in_answer and stage == "architect":
+                                for event in blueprint_events(marker_found=True):
+                                    yield event
+                            if answer_text:
+                                final_chunks.append(answer_text)
+                                yield {"type": "finalizer_chunk", "chunk": answer_text}
+                        if update.usage is not None:
+                            express_usage = update.usage
+                            express_cache_hit = getattr(update, "cache_hit", False)
+            except (asyncio.CancelledError, GeneratorExit):
+                express_trace.finish(outputs={"visible_output": "".join(blueprint_chunks + final_chunks)}, usage=express_usage, error="Express cancelled")
+                raise
+            except Exception as exc:
+                express_trace.finish(outputs={"visible_output": "".join(blueprint_chunks + final_chunks)}, usage=express_usage, error=exc)
+                tracer.finish_root(error=exc, usage=total_tokens)
+                tracer.finalize()
+                raise
+            if not splitter.in_answer:
+                # Without a marker the model most likely answered directly, so show it as the answer.
+                leftover = splitter.flush()
+                if leftover:
+                    blueprint_chunks.append(leftover)
+                    yield {"type": "architect_chunk", "chunk": leftover}
+                for event in blueprint_events(marker_found=False):
+                    yield event
+                final_chunks = list(blueprint_chunks)
+                yield {"type": "finalizer_chunk", "chunk": "".join(final_chunks)}
+            yield thinking_done({"type": "finalizer_thinking_done"}, reasoning_chars["finalizer"])
+            final_output = "".join(final_chunks)
+            add_usage(express_usage)
+            express_trace.finish(
+                outputs={"visible_output": final_output, "blueprint": "".join(blueprint_chunks)},
+                usage=express_usage,
+                metadata={"blueprint_seconds": round(blueprint_duration, 4)},
+            )
+            tracer.log_step("Finalizer", "Express-Writer", express_prompt, final_output)
+            yield {
+                "type": "finalizer_done",
+                "time_taken": time.perf_counter() - started_at - blueprint_duration,
+                "model": express_model_used,
+                "usage": express_usage,
+                "cache_hit": express_cache_hit,
+                "express": True,
+            }
+            tracer.finish_root(
+                outputs={"final_report": final_output, "finalists": finalists, "critic_data": critic_data},
+                usage=total_tokens,
+                metadata={"total_execution_time_seconds": round(time.perf_counter() - workflow_start, 4), "pipeline": "express"},
+            )
+            tracer.finalize()
+            yield {
+                "type": "done",
+                "total_execution_time": time.perf_counter() - workflow_start,
+                "total_tokens": total_tokens,
+            }
+            return
+
+        def start_sectional(brief: dict[str, Any]) -> SectionalFinalizer:
+            sections = brief["structure"]
+            outline = build_section_outline(sections)
+
+            def open_section(index: int, section: str) -> AsyncIterator[Any]:
+                section_prompt = self.prompts.finalizer_section.format(
+                    query=request.query,
+                    outline=outline,
+                    section=section,
+                    section_number=index + 1,
+                    section_count=len(sections),
+                    tone_guidelines=brief["tone_guidelines"],
+                    missing_facts=json.dumps(brief["missing_facts_to_add"]),
+                    context=finalist_context,
+                )
+                return self._phase_stream(
+                    client, section_prompt, None, "finalizer", request.custom_model_map, run_deadline,
+                    include_reasoning=request_reasoning,
+                )[1]
+
+            sectional = SectionalFinalizer(open_section, sections, spawn=scope.spawn)
+            sectional.start()
+            return sectional
+
+        scope.enter_phase("architect")
         architect_prompt = self.prompts.architect.format(
             query=request.query,
             finalist_responses=finalist_context,
             critiques=json.dumps(critic_data),
         )
         architect_model, architect_stream = self._phase_stream(
-            client, architect_prompt, ArchitectBlueprint, "architect", request.custom_model_map,
+            client, architect_prompt, ArchitectBlueprint, "architect", request.custom_model_map, run_deadline,
+            include_reasoning=request_reasoning,
         )
         architect_trace = tracer.start_llm(
             "Blueprint Architect",
@@ -539,38 +1216,65 @@ class CouncilWorkflow:
         architect_chunks: list[str] = []
         architect_usage: UsageDict = {"prompt": 0, "completion": 0, "total": 0}
         architect_model_used = architect_model
+        architect_cache_hit = False
+        architect_reasoning_chars = 0
+        blueprint_parser = IncrementalJsonParser([("structure", WILDCARD), *((field,) for field in SECTION_BRIEF_FIELDS)])
+        # Sectional writers start once their brief has closed, while the architect is still
+        # streaming its critique plan; the final parse below decides whether they are kept.
+        early_brief: dict[str, Any] | None = None
+        early_sectional: SectionalFinalizer | None = None
         try:
-            async for update in architect_stream:
-                if getattr(update, "model", None):
-                    architect_model_used = update.model
-                reasoning = getattr(update, "reasoning", "")
-                if reasoning:
-                    yield {"type": "architect_thinking", "chunk": reasoning}
-                if update.delta:
-                    architect_trace.mark_first_delta()
-                    architect_chunks.append(update.delta)
-                    yield {"type": "architect_chunk", "chunk": update.delta}
-                if update.usage is not None:
-                    architect_usage = update.usage
-        except asyncio.CancelledError:
+            async with aclosing(architect_stream):
+                async for update in architect_stream:
+                    if getattr(update, "model", None):
+                        architect_model_used = update.model
+                    reasoning = getattr(update, "reasoning", "")
+                    if reasoning:
+                        architect_reasoning_chars += len(reasoning)
+                        if stream_reasoning:
+                            yield {"type": "architect_thinking", "chunk": reasoning}
+                    if update.delta:
+                        architect_trace.mark_first_delta()
+                        architect_chunks.append(update.delta)
+                        yield {"type": "architect_chunk", "chunk": update.delta}
+                        for path, value in blueprint_parser.feed(update.delta):
+                            if len(path) == 2:
+                                yield {"type": "architect_section", "index": path[1], "section": value}
+                        partial = blueprint_parser.top_level()
+                        if (
+                            request.finalizer_mode == "sectional"
+                            and early_sectional is None
+                            and all(field in partial for field in SECTION_BRIEF_FIELDS)
+                            and len(section_brief(partial)["structure"]) >= 2
+                        ):
+                            early_brief = section_brief(partial)
+                            early_sectional = start_sectional(early_brief)
+                    if update.usage is not None:
+                        architect_usage = update.usage
+                        architect_cache_hit = getattr(update, "cache_hit", False)
+        except (asyncio.CancelledError, GeneratorExit):
+            # The run scope records the abort on the root trace; only this phase run closes here.
             architect_trace.finish(outputs={"visible_output": "".join(architect_chunks)}, usage=architect_usage, error="Architect cancelled")
-            tracer.finish_root(error="Council meeting cancelled during architect phase.", usage=total_tokens)
-            tracer.finalize()
             raise
         except Exception as exc:
+            if early_sectional is not None:
+                await early_sectional.cancel()
             architect_trace.finish(outputs={"visible_output": "".join(architect_chunks)}, usage=architect_usage, error=exc)
             tracer.finish_root(error=exc, usage=total_tokens)
             tracer.finalize()
             raise
-        yield {"type": "architect_thinking_done"}
+        yield thinking_done({"type": "architect_thinking_done"}, architect_reasoning_chars)
         architect_raw = "".join(architect_chunks)
         architect_duration = time.perf_counter() - started_at
         add_usage(architect_usage)
         tracer.log_step("Architect", "Architect-Planner", architect_prompt, architect_raw)
 
         try:
-            architect_data = json.loads(architect_raw)
-        except json.JSONDecodeError:
+            recovered = repair_json(architect_raw)
+            if not isinstance(recovered.value, dict):
+                raise ValueError("Architect JSON is not an object.")
+        except ValueError:
+            get_json_repair_stats().record(architect_model_used, "architect", None)
             architect_trace.finish(outputs={"visible_output": architect_raw}, usage=architect_usage, error="Architect returned invalid JSON")
             yield {
                 "type": "error",
@@ -581,67 +1285,123 @@ class CouncilWorkflow:
             architect_data = fallback_architect_blueprint()
             architect_raw = json.dumps(architect_data)
         else:
-            architect_trace.finish(outputs={"visible_output": architect_raw}, usage=architect_usage)
+            get_json_repair_stats().record(architect_model_used, "architect", recovered.repairs)
+            architect_data = recovered.value
+            if recovered.repairs:
+                # Damaged output may have lost trailing fields; keep the finalizer prompt complete.
+                architect_data = {**fallback_architect_blueprint(), **architect_data}
+                architect_raw = json.dumps(architect_data)
+            architect_trace.finish(
+                outputs={"visible_output": architect_raw},
+                usage=architect_usage,
+                metadata={"json_repairs": list(recovered.repairs)} if recovered.repairs else None,
+            )
+            if recovered.repairs:
+                architect_data["json_repairs"] = list(recovered.repairs)
 
         architect_data["time_taken"] = architect_duration
         architect_data["model"] = architect_model_used
         architect_data["usage"] = architect_usage
+        architect_data["cache_hit"] = architect_cache_hit
         yield {"type": "architect_result", **architect_data}
 
+        scope.enter_phase("finalizer")
         finalizer_prompt = self.prompts.finalizer.format(
             query=request.query,
             blueprint=architect_raw,
             context=finalist_context,
         )
-        finalizer_model, finalizer_stream = self._phase_stream(
-            client, finalizer_prompt, None, "finalizer", request.custom_model_map,
-        )
+        brief = section_brief(architect_data)
+        sections = brief["structure"]
+        sectional: SectionalFinalizer | None = None
+        if request.finalizer_mode == "sectional" and len(sections) >= 2:
+            sectional = early_sectional if early_brief == brief else start_sectional(brief)
+        if early_sectional is not None and sectional is not early_sectional:
+            # Repair or the fallback blueprint changed the brief the early writers were given.
+            await early_sectional.cancel()
+        if sectional is not None:
+            finalizer_model = self._configured_phase_model("finalizer", request.custom_model_map) or DEFAULT_MODEL_MAP["finalizer"]
+            finalizer_stream = sectional.stream()
+        else:
+            finalizer_model, finalizer_stream = self._phase_stream(
+                client, finalizer_prompt, None, "finalizer", request.custom_model_map, run_deadline,
+                include_reasoning=request_reasoning,
+            )
         finalizer_trace = tracer.start_llm(
             "Final Synthesis",
             {"query": request.query, "prompt": finalizer_prompt, "blueprint": architect_raw, "finalists": finalist_responses},
-            metadata={"stage": "finalizer", "model": finalizer_model, "reasoning_effort": "low"},
+            metadata={
+                "stage": "finalizer", "model": finalizer_model, "reasoning_effort": "low",
+                "sections": len(sections) if sectional else 0,
+                "started_during_architect": sectional is not None and sectional is early_sectional,
+            },
         )
         yield {"type": "finalizer_start", "model": finalizer_model}
         started_at = time.perf_counter()
         final_chunks: list[str] = []
         final_usage: UsageDict = {"prompt": 0, "completion": 0, "total": 0}
         finalizer_model_used = finalizer_model
+        finalizer_cache_hit = False
+        finalizer_reasoning_chars = 0
         try:
-            async for update in finalizer_stream:
-                if getattr(update, "model", None):
-                    finalizer_model_used = update.model
-                reasoning = getattr(update, "reasoning", "")
-                if reasoning:
-                    yield {"type": "finalizer_thinking", "chunk": reasoning}
-                if update.delta:
-                    finalizer_trace.mark_first_delta()
-                    final_chunks.append(update.delta)
-                    yield {"type": "finalizer_chunk", "chunk": update.delta}
-                if update.usage is not None:
-                    final_usage = update.usage
-        except asyncio.CancelledError:
+            async with aclosing(finalizer_stream):
+                async for update in finalizer_stream:
+                    if getattr(update, "model", None):
+                        finalizer_model_used = update.model
+                    reasoning = getattr(update, "reasoning", "")
+                    if reasoning:
+                        finalizer_reasoning_chars += len(reasoning)
+                        if stream_reasoning:
+                            yield {"type": "finalizer_thinking", "chunk": reasoning}
+                    if update.delta:
+                        finalizer_trace.mark_first_delta()
+                        final_chunks.append(update.delta)
+                        yield {"type": "finalizer_chunk", "chunk": update.delta}
+                    if update.usage is not None:
+                        final_usage = update.usage
+                        finalizer_cache_hit = getattr(update, "cache_hit", False)
+            if sectional and not final_chunks:
+                raise RuntimeError("No finalizer section produced any text.")
+        except (asyncio.CancelledError, GeneratorExit):
+            # The run scope records the abort on the root trace; only this phase run closes here.
             finalizer_trace.finish(outputs={"visible_output": "".join(final_chunks)}, usage=final_usage, error="Finalizer cancelled")
-            tracer.finish_root(error="Council meeting cancelled during finalizer phase.", usage=total_tokens)
-            tracer.finalize()
             raise
         except Exception as exc:
             finalizer_trace.finish(outputs={"visible_output": "".join(final_chunks)}, usage=final_usage, error=exc)
             tracer.finish_root(error=exc, usage=total_tokens)
             tracer.finalize()
             raise
-        yield {"type": "finalizer_thinking_done"}
+        yield thinking_done({"type": "finalizer_thinking_done"}, finalizer_reasoning_chars)
         final_output = "".join(final_chunks)
         final_duration = time.perf_counter() - started_at
         add_usage(final_usage)
-        finalizer_trace.finish(outputs={"visible_output": final_output}, usage=final_usage)
+        section_reports: list[dict[str, Any]] = []
+        if sectional:
+            section_reports = [report.as_event() for report in sectional.reports if report]
+            for report in sectional.failed:
+                yield {
+                    "type": "error",
+                    "message": f"Finalizer section {report.index} ({report.title}) failed and was left out: {report.error}",
+                    "phase": "finalizer",
+                    "recoverable": True,
+                }
+        finalizer_trace.finish(
+            outputs={"visible_output": final_output},
+            usage=final_usage,
+            metadata={"sections": section_reports} if sectional else None,
+        )
         tracer.log_step("Finalizer", "Finalizer-Writer", finalizer_prompt, final_output)
 
-        yield {
+        finalizer_done: CouncilEvent = {
             "type": "finalizer_done",
             "time_taken": final_duration,
             "model": finalizer_model_used,
             "usage": final_usage,
+            "cache_hit": finalizer_cache_hit,
         }
+        if sectional:
+            finalizer_done["sections"] = section_reports
+        yield finalizer_done
 
         tracer.finish_root(
             outputs={"final_report": final_output, "finalists": finalists, "critic_data": critic_data},
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import types
+import unittest
+from dataclasses import replace
+
+from llm_council.circuit_breaker import BreakerRegistry
+from llm_council.concurrency import LimiterRegistry
+from llm_council.hedging import HedgeController
+from llm_council.llm_client import LLMClient
+from llm_council.retry import RetryScheduler
+from llm_council.settings import get_settings
+from llm_council.workflow import CouncilWorkflow, WorkflowRequest
+
+
+class EndlessUpstream:
+    """Stand-in for an OpenAI ``AsyncStream`` that never finishes on its own."""
+
+    opened = 0
+    closed = 0
+
+    def __init__(self):
+        EndlessUpstream.opened += 1
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(0.01)
+        return types.SimpleNamespace(
+            usage=None,
+            choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content="token "))],
+        )
+
+    async def close(self):
+        EndlessUpstream.closed += 1
+
+
+class RecordingRun:
+    def mark_first_delta(self):
+        pass
+
+    def finish(self, **kwargs):
+        self.finished = kwargs
+
+
+class RecordingTracer:
+    def __init__(self):
+        self.root_finish = None
+        self.finalized = False
+
+    def start_root(self, name, inputs, **kwargs):
+        return RecordingRun()
+
+    def start_llm(self, name, inputs, **kwargs):
+        return RecordingRun()
+
+    def finish_root(self, **kwargs):
+        self.root_finish = kwargs
+
+    def log_step(self, *args, **kwargs):
+        pass
+
+    def finalize(self):
+        self.finalized = True
+
+
+class DisconnectCancellationTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        EndlessUpstream.opened = EndlessUpstream.closed = 0
+        self.settings = replace(
+            get_settings(),
+            use_mock_mode=False,
+            nvidia_api_key="nvapi-test-key",
+            nvidia_hedging=False,
+            response_cache_enabled=False,
+            council_cache_mode="off",
+        )
+        self.tracer = RecordingTracer()
+
+        async def create(**kwargs):
+            return EndlessUpstream()
+
+        def client_factory(api_key, settings):
+            client = LLMClient(
+                api_key=api_key,
+                settings=settings,
+                limiters=LimiterRegistry.from_settings(self.settings),
+                retries=RetryScheduler.from_settings(self.settings),
+                hedging=HedgeController.from_settings(self.settings),
+                breakers=BreakerRegistry.from_settings(self.settings),
+            )
+            client.openai_client = types.SimpleNamespace(
+                chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)),
+            )
+            return client
+
+        self.workflow = CouncilWorkflow(
+            settings=self.settings,
+            client_factory=client_factory,
+            tracer_factory=lambda **kwargs: self.tracer,
+        )
+
+    def assert_nothing_left_running(self):
+        self.assertEqual(asyncio.all_tasks(), {asyncio.current_task()})
+        self.assertGreater(EndlessUpstream.opened, 0)
+        self.assertEqual(EndlessUpstream.closed, EndlessUpstream.opened)
+
+    async def test_closing_the_stream_cancels_generators_and_upstream_connections(self):
+        request = WorkflowRequest(query="Disconnect", selected_agents=["The Academic", "The Skeptic", "The Futurist"])
+        stream = self.workflow.stream(request)
+        async for event in stream:
+            if event["type"] == "generator_chunk":
+                break
+        await stream.aclose()
+
+        self.assert_nothing_left_running()
+        self.assertEqual(EndlessUpstream.opened, 3)
+        self.assertEqual(self.tracer.root_finish["error"], "Council meeting aborted during generator phase.")
+        self.assertEqual(self.tracer.root_finish["metadata"]["cancelled_tasks"], 3)
+        self.assertEqual(self.tracer.root_finish["metadata"]["tasks_still_running"], 0)
+        self.assertTrue(self.tracer.finalized)
+
+    async def test_cancelling_the_consumer_task_cleans_up_the_same_way(self):
+        request = WorkflowRequest(query="Disconnect", selected_agents=["The Academic", "The Skeptic"])
+        first_chunk = asyncio.Event()
+
+        async def consume():
+            async for event in self.workflow.stream(request):
+                if event["type"] == "generator_chunk":
+                    first_chunk.set()
+
+        consumer = asyncio.create_task(consume())
+        await first_chunk.wait()
+        consumer.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await consumer
+
+        self.assert_nothing_left_running()
+        self.assertTrue(self.tracer.root_finish["metadata"]["aborted"])
+
+
+if __name__ == "__main__":
+    unittest.main()
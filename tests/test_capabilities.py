@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import tempfile
+import time
+import types
+import unittest
+from pathlib import Path
+
+import httpx
+from openai import APIStatusError
+
+from llm_council.capabilities import CapabilityCache
+from llm_council.circuit_breaker import BreakerRegistry
+from llm_council.llm_client import LLMClient, sent_parameters
+from llm_council.retry import RetryScheduler
+from llm_council.schemas import ArchitectBlueprint
+from llm_council.settings import get_settings
+from llm_council.structured_output import StructuredOutputCompiler
+
+BASE_URL = get_settings().nvidia_api_base_url
+
+
+class CapabilityCacheTests(unittest.TestCase):
+    def test_capabilities_persist_expire_and_reset(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "capabilities.json"
+            cache = CapabilityCache(path=path)
+            cache.record(BASE_URL, "demo/model", {"json_schema": False, "json_object": True})
+            cache.record("http://other.local/v1", "demo/model", {"reasoning_effort": False})
+
+            restarted = CapabilityCache(path=path)
+            self.assertEqual(restarted.accepts(BASE_URL, "demo/model"), {"json_schema": False, "json_object": True})
+            self.assertEqual(restarted.reset(model="demo/model", base_url="http://other.local/v1"), 1)
+            self.assertEqual(len(CapabilityCache(path=path).snapshot()), 1)
+
+            stale = CapabilityCache(ttl_seconds=60, path=path)
+            stale._entries[(BASE_URL, "demo/model")]["json_schema"] = (False, time.time() - 120)
+            self.assertEqual(stale.accepts(BASE_URL, "demo/model"), {"json_object": True})
+            self.assertEqual(stale.stats()["expirations"], 1)
+
+
+class CapabilityPersistenceTests(unittest.IsolatedAsyncioTestCase):
+    async def test_only_changes_are_written_and_off_the_event_loop(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "capabilities.json"
+            cache = CapabilityCache(path=path)
+            cache.record(BASE_URL, "demo/model", {"json_schema": True})
+            self.assertFalse(path.exists())
+            cache.record(BASE_URL, "demo/model", {"json_schema": True, "stream_options": True})
+            await cache.aclose()
+            cache.record(BASE_URL, "demo/model", {"json_schema": True, "stream_options": True})
+            await cache.aclose()
+
+            self.assertEqual(cache.stats()["writes"], 1)
+            self.assertEqual(CapabilityCache(path=path).accepts(BASE_URL, "demo/model"), {"json_schema": True, "stream_options": True})
+
+
+class CapabilityNegotiationTests(unittest.IsolatedAsyncioTestCase):
+    def client(self, create, cache: CapabilityCache) -> LLMClient:
+        client = LLMClient(
+            api_key="nvapi-test-key", settings=get_settings(), retries=RetryScheduler(), breakers=BreakerRegistry(),
+            response_cache=None, capabilities=cache, structured_output=StructuredOutputCompiler(default_mode="json_schema"),
+        )
+        client.openai_client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+        return client
+
+    async def test_later_calls_send_the_accepted_payload_first_time(self):
+        requests: list[dict] = []
+
+        async def create(**kwargs):
+            requests.append(kwargs)
+            if "reasoning_effort" in kwargs:
+                raise _bad_request("Unrecognized request argument supplied: reasoning_effort")
+            if kwargs.get("response_format", {}).get("type") == "json_schema":
+                raise _bad_request("response_format json_schema is not supported")
+            return _Stream('{"structure": []}')
+
+        cache = CapabilityCache()
+        client = self.client(create, cache)
+        for _ in range(2):
+            updates = [update async for update in client._stream_messages([{"role": "user", "content": "Plan"}], schema=ArchitectBlueprint, model="demo/model", reasoning_effort="high")]
+            self.assertEqual("".join(update.delta for update in updates), '{"structure": []}')
+
+        # The error names reasoning_effort, so the schema stays until its own rejection.
+        self.assertEqual(
+            [(sent_parameters(request)[0], "reasoning_effort" in request) for request in requests],
+            [("json_schema", True), ("json_schema", False), ("guided_json", False), ("guided_json", False)],
+        )
+        self.assertEqual(
+            cache.accepts(BASE_URL, "demo/model"),
+            {"guided_json": True, "json_schema": False, "reasoning_effort": False, "stream_options": True},
+        )
+
+    async def test_rejections_are_not_learned_when_the_request_never_succeeds(self):
+        async def create(**kwargs):
+            raise _bad_request("prompt is too long for this model")
+
+        cache = CapabilityCache()
+        with self.assertRaises(RuntimeError):
+            [update async for update in self.client(create, cache)._stream_messages([{"role": "user", "content": "Plan"}], schema=ArchitectBlueprint, model="demo/model")]
+        self.assertEqual(cache.snapshot(), [])
+
+
+def _bad_request(message: str) -> APIStatusError:
+    return APIStatusError(message, response=httpx.Response(400, request=httpx.Request("POST", BASE_URL)), body=None)
+
+
+class _Stream:
+    def __init__(self, content: str) -> None:
+        self.chunks = [
+            types.SimpleNamespace(usage=None, choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=content))]),
+        ]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+
+    async def close(self):
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import types
+import unittest
+from dataclasses import replace
+from unittest.mock import patch
+
+import httpx
+from openai import APIStatusError
+
+from llm_council.circuit_breaker import BreakerRegistry, CircuitBreaker
+from llm_council.llm_client import LLMClient
+from llm_council.retry import RetryScheduler
+from llm_council.settings import get_settings
+from llm_council.workflow import CouncilWorkflow, WorkflowRequest
+
+
+def failure(status: int | None = None) -> RuntimeError:
+    if status is None:
+        try:
+            raise RuntimeError("NVIDIA NIM did not produce a response") from TimeoutError()
+        except RuntimeError as exc:
+            return exc
+    cause = APIStatusError(
+        "upstream",
+        response=httpx.Response(status, request=httpx.Request("POST", "https://example.nvidia.test/v1")),
+        body=None,
+    )
+    try:
+        raise RuntimeError("NVIDIA NIM stream failed") from cause
+    except RuntimeError as exc:
+        return exc
+
+
+class CircuitBreakerTests(unittest.IsolatedAsyncioTestCase):
+    def test_breaker_opens_then_admits_one_half_open_probe(self):
+        now = [100.0]
+        with patch("llm_council.circuit_breaker.time.monotonic", side_effect=lambda: now[0]):
+            breaker = CircuitBreaker(failure_threshold=2, window_seconds=60, cooldown_seconds=30)
+            breaker.record_failure(timeout=True)
+            breaker.record_failure()
+            self.assertEqual(breaker.state, "open")
+            self.assertFalse(breaker.allow_request())
+
+            now[0] += 30
+            self.assertEqual(breaker.state, "half_open")
+            self.assertTrue(breaker.allow_request())
+            self.assertFalse(breaker.allow_request())
+
+            breaker.record_success()
+            self.assertEqual(breaker.state, "closed")
+
+    def test_client_errors_do_not_trip_the_breaker(self):
+        registry = BreakerRegistry(failure_threshold=1)
+        registry.record_failure("key", "demo/model", failure(401))
+        self.assertEqual(registry.get("key", "demo/model").state, "closed")
+
+        registry.record_failure("key", "demo/model", failure(503))
+        self.assertEqual(registry.get("key", "demo/model").state, "open")
+
+    def test_one_keys_quota_errors_do_not_open_the_breaker_for_other_keys(self):
+        registry = BreakerRegistry(failure_threshold=1)
+        registry.record_failure("tenant-a", "demo/model", failure(429))
+
+        self.assertFalse(registry.allow_request("tenant-a", "demo/model"))
+        self.assertTrue(registry.allow_request("tenant-b", "demo/model"))
+
+    def test_registry_evicts_only_idle_breakers_past_its_bound(self):
+        registry = BreakerRegistry(failure_threshold=1, max_entries=2)
+        registry.record_failure("key", "demo/open-model", failure(503))
+        registry.get("key", "demo/idle-model")
+        registry.get("key", "demo/custom-model")
+
+        self.assertEqual(
+            [entry["model"] for entry in registry.snapshot()],
+            ["demo/open-model", "demo/custom-model"],
+        )
+        self.assertEqual(registry.evictions, 1)
+
+    def test_hedges_skip_half_open_models_without_taking_their_probe(self):
+        now = [1000.0]
+        with patch("llm_council.circuit_breaker.time.monotonic", side_effect=lambda: now[0]):
+            registry = BreakerRegistry(failure_threshold=1, cooldown_seconds=30)
+            registry.record_failure("key", "backup/model", failure())
+            now[0] += 31
+
+            self.assertFalse(registry.is_closed("key", "backup/model"))
+            self.assertTrue(registry.allow_request("key", "backup/model"))
+
+    async def test_open_breaker_routes_straight_to_the_next_model_in_the_chain(self):
+        registry = BreakerRegistry(failure_threshold=1)
+        client = LLMClient(api_key="nvapi-test-key", settings=get_settings(), retries=RetryScheduler(), breakers=registry)
+        registry.record_failure(client.key_id, "down/model", failure())
+        requested = []
+
+        async def stream():
+            yield types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content="Backup answer"))], usage=None)
+
+        async def create(**kwargs):
+            requested.append(kwargs["model"])
+            return stream()
+
+        client.openai_client = types.SimpleNamespace(
+            chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)),
+        )
+
+        updates = [update async for update in client.stream_generate(
+            "Hello", model="down/model", fallback_chain=["backup/model"],
+        )]
+
+        self.assertEqual(requested, ["backup/model"])
+        self.assertEqual(updates[-1].model, "backup/model")
+        snapshot = {entry["model"]: entry for entry in registry.snapshot()}
+        self.assertEqual(snapshot["down/model"]["rejections"], 1)
+        self.assertEqual(snapshot["backup/model"]["successes"], 1)
+        self.assertEqual(snapshot["backup/model"]["api_key"], client.key_id)
+
+    async def test_workflow_passes_role_fallback_chains(self):
+        calls = []
+
+        class RecordingClient:
+            async def stream_generate(self, prompt, **kwargs):
+                calls.append(kwargs)
+                if "Senior Quality Assurance Judge" in prompt:
+                    content = json.dumps({"reviews": {"The Academic": {"metric_scores": {"accuracy": 9, "relevance": 9, "completeness": 9, "clarity": 9, "practical_usefulness": 9}, "critique": "Strong."}}})
+                elif "Chief Solutions Architect" in prompt:
+                    content = json.dumps({"structure": ["Intro"], "tone_guidelines": "Clear", "missing_facts_to_add": [], "critique_integration": "Use it."})
+                else:
+                    content = "Draft"
+                yield types.SimpleNamespace(delta=content, usage=None)
+                yield types.SimpleNamespace(delta="", usage={"prompt": 1, "completion": 1, "total": 2})
+
+        settings = replace(get_settings(), fallback_chains={"generator": ("backup/generator",), "critic": ("backup/critic",)})
+        workflow = CouncilWorkflow(settings=settings, client_factory=lambda **kwargs: RecordingClient())
+        _events = [event async for event in workflow.stream(WorkflowRequest(query="Test", selected_agents=["The Academic"]))]
+
+        self.assertEqual(calls[0]["fallback_chain"], ("backup/generator",))
+        self.assertEqual(calls[1]["fallback_chain"], ("backup/critic",))
+        self.assertEqual(calls[2]["fallback_chain"], ())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import gc
+import unittest
+
+from llm_council.client_pool import ClientPool, api_key_fingerprint
+from llm_council.llm_client import LLMClient
+from llm_council.settings import get_settings
+
+
+class ClientPoolTests(unittest.IsolatedAsyncioTestCase):
+    async def test_same_key_and_base_url_reuse_one_client(self):
+        pool = ClientPool()
+        _key, first = pool.acquire("nvapi-one", "https://example.nvidia.test/v1")
+        _key, second = pool.acquire("nvapi-one", "https://example.nvidia.test/v1")
+        _key, other = pool.acquire("nvapi-two", "https://example.nvidia.test/v1")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(pool.stats()["hits"], 1)
+        self.assertEqual(pool.stats()["misses"], 2)
+        await pool.aclose()
+
+    async def test_raw_api_keys_are_not_used_as_registry_keys(self):
+        pool = ClientPool()
+        key, _client = pool.acquire("nvapi-secret-key", "https://example.nvidia.test/v1")
+
+        self.assertNotIn("nvapi-secret-key", key[0])
+        self.assertEqual(key[0], api_key_fingerprint("nvapi-secret-key"))
+        await pool.aclose()
+
+    async def test_lru_eviction_skips_leased_clients_and_closes_idle_ones(self):
+        pool = ClientPool(max_clients=1)
+        leased_key, leased = pool.acquire("nvapi-leased", "https://example.nvidia.test/v1")
+        idle_key, idle = pool.acquire("nvapi-idle", "https://example.nvidia.test/v1")
+        self.assertEqual(pool.stats()["evictions"], 0)
+
+        pool.release(idle_key, idle)
+        pool.release(leased_key, leased)
+        await pool.aclose()
+
+        self.assertEqual(pool.stats()["evictions"], 1)
+        self.assertTrue(idle.is_closed())
+        self.assertTrue(leased.is_closed())
+
+    async def test_llm_client_returns_its_lease_on_close_once(self):
+        pool = ClientPool()
+        async with LLMClient(api_key="nvapi-test-key", settings=get_settings(), pool=pool) as client:
+            other = LLMClient(api_key="nvapi-test-key", settings=get_settings(), pool=pool)
+            self.assertEqual(pool._clients[(client.key_id, get_settings().nvidia_api_base_url)].leases, 2)
+
+        await client.aclose()
+        self.assertEqual(pool._clients[(client.key_id, get_settings().nvidia_api_base_url)].leases, 1)
+        await other.aclose()
+        self.assertEqual(pool.stats()["leased_clients"], 0)
+        await pool.aclose()
+
+    async def test_llm_client_returns_its_lease_when_collected(self):
+        pool = ClientPool()
+        client = LLMClient(api_key="nvapi-test-key", settings=get_settings(), pool=pool)
+        self.assertEqual(pool.stats()["leased_clients"], 1)
+
+        del client
+        gc.collect()
+
+        self.assertEqual(pool.stats()["leased_clients"], 0)
+        await pool.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
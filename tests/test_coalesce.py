@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import unittest
+from dataclasses import replace
+from unittest.mock import patch
+
+from llm_council import server
+from llm_council.coalesce import DeltaCoalescer
+
+
+class DeltaCoalescerTests(unittest.TestCase):
+    def test_deltas_merge_per_stream_and_flush_before_phase_events(self):
+        coalescer = DeltaCoalescer(window_seconds=60, max_bytes=1000)
+
+        self.assertEqual(coalescer.push({"type": "generator_chunk", "agent": "A", "chunk": "Hel"}), [])
+        self.assertEqual(coalescer.push({"type": "generator_chunk", "agent": "B", "chunk": "Hi"}), [])
+        self.assertEqual(coalescer.push({"type": "generator_thinking", "agent": "A", "chunk": "hm"}), [])
+        self.assertEqual(coalescer.push({"type": "generator_chunk", "agent": "A", "chunk": "lo"}), [])
+
+        ready = coalescer.push({"type": "generator_done", "agent": "A"})
+
+        self.assertEqual(ready, [
+            {"type": "generator_chunk", "agent": "A", "chunk": "Hello"},
+            {"type": "generator_chunk", "agent": "B", "chunk": "Hi"},
+            {"type": "generator_thinking", "agent": "A", "chunk": "hm"},
+            {"type": "generator_done", "agent": "A"},
+        ])
+        self.assertEqual((coalescer.events_in, coalescer.events_out), (5, 4))
+        self.assertIsNone(coalescer.seconds_until_flush())
+
+    def test_byte_limit_and_zero_window_flush_immediately(self):
+        by_size = DeltaCoalescer(window_seconds=60, max_bytes=4)
+        self.assertEqual(by_size.push({"type": "critic_chunk", "batch": 1, "chunk": "ab"}), [])
+        self.assertEqual(by_size.push({"type": "critic_chunk", "batch": 1, "chunk": "cd"}), [
+            {"type": "critic_chunk", "batch": 1, "chunk": "abcd"},
+        ])
+
+        disabled = DeltaCoalescer(window_seconds=0)
+        self.assertEqual(disabled.push({"type": "critic_chunk", "batch": 1, "chunk": "ab"}), [
+            {"type": "critic_chunk", "batch": 1, "chunk": "ab"},
+        ])
+
+
+class CoalescedSummonStreamTests(unittest.TestCase):
+    def test_summon_stream_writes_merged_deltas_and_keeps_event_order(self):
+        async def chatty_events(_request):
+            for word in ("one ", "two ", "three"):
+                yield {"type": "finalizer_chunk", "chunk": word}
+            yield {"type": "finalizer_done", "time_taken": 0, "model": "demo/model", "usage": {}}
+            yield {"type": "done", "total_execution_time": 0, "total_tokens": {"prompt": 0, "completion": 0, "total": 0}}
+
+        async def collect() -> list[str]:
+            settings = replace(server.settings, sse_coalesce_window_ms=60_000)
+            request = server.SummonRequest(query="Test", selected_agents=["The Academic"])
+            with patch.object(server, "settings", settings), patch.object(server.workflow, "stream", side_effect=chatty_events):
+                return [message async for message in server.stream_workflow(request)]
+
+        messages = asyncio.run(collect())
+        frames = [frame for message in messages for frame in message.split("\n\n") if frame]
+        payloads = [json.loads(frame.split("data: ", 1)[1]) for frame in frames]
+
+        self.assertEqual(len(messages), 2)
+        self.assertEqual([payload["type"] for payload in payloads], ["finalizer_chunk", "finalizer_done", "done"])
+        self.assertEqual(payloads[0]["chunk"], "one two three")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import types
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from openai import APIStatusError
+
+from llm_council.circuit_breaker import BreakerRegistry
+from llm_council.concurrency import AdaptiveLimiter, LimiterRegistry
+from llm_council.llm_client import LLMClient
+from llm_council.retry import RetryScheduler
+from llm_council.settings import get_settings
+
+
+class AdaptiveLimiterTests(unittest.IsolatedAsyncioTestCase):
+    async def test_waiters_are_admitted_in_fifo_order(self):
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+        held = await limiter.acquire()
+        admitted: list[int] = []
+
+        async def wait_turn(index: int) -> None:
+            lease = await limiter.acquire()
+            admitted.append(index)
+            lease.release("success", 0.1)
+
+        waiters = [asyncio.create_task(wait_turn(index)) for index in range(3)]
+        await asyncio.sleep(0)
+        self.assertEqual(limiter.queue_depth, 3)
+
+        held.release("success", 0.1)
+        await asyncio.gather(*waiters)
+
+        self.assertEqual(admitted, [0, 1, 2])
+        self.assertEqual(limiter.stats()["waited"], 3)
+
+    async def test_limit_grows_when_healthy_and_halves_once_per_overload_burst(self):
+        limiter = AdaptiveLimiter(initial_limit=4, max_limit=16, latency_threshold_seconds=1.0)
+        for _ in range(8):
+            (await limiter.acquire()).release("success", 0.2)
+        self.assertEqual(limiter.limit, 5)
+
+        burst = [await limiter.acquire() for _ in range(3)]
+        for lease in burst:
+            lease.release("overload")
+
+        self.assertEqual(limiter.limit, 2)
+        self.assertEqual(limiter.stats()["overloads"], 3)
+
+    async def test_slow_successes_hold_the_limit(self):
+        limiter = AdaptiveLimiter(initial_limit=4, latency_threshold_seconds=1.0)
+        for _ in range(8):
+            (await limiter.acquire()).release("success", 5.0)
+        self.assertEqual(limiter.limit, 4)
+
+    async def test_cancelled_waiter_does_not_leak_a_slot(self):
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+        held = await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        held.release()
+
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertEqual(limiter.queue_depth, 0)
+
+    async def test_registry_drops_least_recently_used_idle_limiters(self):
+        registry = LimiterRegistry(max_entries=2)
+        busy = await registry.get("key", "busy/model").acquire()
+        registry.get("key", "idle/model")
+        registry.get("key", "new/model")
+        registry.get("key", "newest/model")
+
+        self.assertEqual([entry["model"] for entry in registry.stats()], ["busy/model", "newest/model"])
+        self.assertEqual(registry.evictions, 2)
+        busy.release()
+
+    async def test_stream_rate_limits_shrink_the_model_limit(self):
+        registry = LimiterRegistry(initial_limit=8)
+        client = LLMClient(api_key="nvapi-test-key", settings=get_settings(), limiters=registry, retries=RetryScheduler(), breakers=BreakerRegistry())
+        rate_limited = APIStatusError(
+            "rate limited",
+            response=httpx.Response(429, request=httpx.Request("POST", "https://example.nvidia.test/v1")),
+            body=None,
+        )
+        client.openai_client = types.SimpleNamespace(
+            chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=AsyncMock(side_effect=rate_limited))),
+        )
+
+        with patch("llm_council.llm_client.asyncio.sleep", new=AsyncMock()):
+            with self.assertRaises(RuntimeError):
+                async for _update in client.stream_generate("Hello", model="demo/model"):
+                    pass
+
+        stats = registry.stats()[0]
+        self.assertEqual(stats["model"], "demo/model")
+        self.assertLess(stats["limit"], 8)
+        self.assertEqual(stats["in_flight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import unittest
+
+from llm_council.council_cache import CouncilCache, compact_events, council_context_key
+from llm_council.settings import get_settings
+from llm_council.workflow import CouncilWorkflow, WorkflowRequest
+
+USAGE = {"prompt": 1, "completion": 1, "total": 2}
+CONTEXT = council_context_key(["The Academic"], None, None)
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def stream_generate(self, *args, **kwargs):
+        responses = [
+            "Draft",
+            json.dumps({"reviews": {"The Academic": {"metric_scores": {"accuracy": 9, "relevance": 9, "completeness": 9, "clarity": 9, "practical_usefulness": 9}, "critique": "Strong."}}}),
+            json.dumps({"structure": ["Intro"], "tone_guidelines": "Clear", "missing_facts_to_add": [], "critique_integration": "Use it."}),
+            "Final answer",
+        ]
+        content = responses[self.calls % len(responses)]
+        self.calls += 1
+        yield type("Update", (), {"delta": content[:3], "usage": None})()
+        await asyncio.sleep(0)
+        yield type("Update", (), {"delta": content[3:], "usage": None})()
+        yield type("Update", (), {"delta": "", "usage": USAGE})()
+
+
+class CouncilCacheTests(unittest.IsolatedAsyncioTestCase):
+    def test_paraphrase_matches_but_a_different_question_does_not(self):
+        cache = CouncilCache(similarity_threshold=0.9)
+        cache.store("What are the main risks of nuclear energy?", CONTEXT, [{"type": "finalizer_chunk", "chunk": "Risks."}])
+
+        match = cache.lookup("Tell me the main risks of nuclear energy, please.", CONTEXT)
+
+        self.assertIsNotNone(match)
+        self.assertEqual(match.final_report, "Risks.")
+        self.assertIsNone(cache.lookup("How do I bake bread?", CONTEXT))
+        self.assertIsNone(cache.lookup("What are the main risks of nuclear energy?", council_context_key(["The Skeptic"], None, None)))
+        other_tenant = council_context_key(["The Academic"], None, None, custom_api_key="nvapi-other-tenant")
+        self.assertIsNone(cache.lookup("What are the main risks of nuclear energy?", other_tenant))
+
+    def test_entries_and_bytes_stay_bounded(self):
+        cache = CouncilCache(max_entries=2)
+        for topic in ("volcanoes", "glaciers", "tides"):
+            cache.store(f"Explain {topic} to a child", CONTEXT, [{"type": "finalizer_chunk", "chunk": topic}])
+
+        self.assertIsNone(cache.lookup("Explain volcanoes to a child", CONTEXT))
+        self.assertIsNotNone(cache.lookup("Explain tides to a child", CONTEXT))
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["evictions"]), (2, 1))
+
+        tiny = CouncilCache(max_bytes=10)
+        tiny.store("Explain tides", CONTEXT, [{"type": "finalizer_chunk", "chunk": "x" * 100}])
+        self.assertEqual(tiny.stats()["entries"], 0)
+
+    def test_compaction_merges_each_stream_into_one_event(self):
+        events = [
+            {"type": "generator_chunk", "agent": "A", "chunk": "Hel"},
+            {"type": "generator_chunk", "agent": "B", "chunk": "Other"},
+            {"type": "generator_chunk", "agent": "A", "chunk": "lo"},
+            {"type": "generator_done", "agent": "A"},
+        ]
+
+        self.assertEqual(compact_events(events), [
+            {"type": "generator_chunk", "agent": "A", "chunk": "Hello"},
+            {"type": "generator_chunk", "agent": "B", "chunk": "Other"},
+            {"type": "generator_done", "agent": "A"},
+        ])
+
+    async def test_replay_mode_answers_a_paraphrase_without_calling_models(self):
+        client = FakeClient()
+        workflow = CouncilWorkflow(
+            settings=get_settings(),
+            client_factory=lambda **kwargs: client,
+            council_cache=CouncilCache(mode="replay"),
+        )
+
+        first = [event async for event in workflow.stream(WorkflowRequest(query="Should we ship on Friday?", selected_agents=["The Academic"]))]
+        calls_after_first_run = client.calls
+        second = [event async for event in workflow.stream(WorkflowRequest(query="should we ship on friday", selected_agents=["The Academic"]))]
+
+        self.assertEqual(client.calls, calls_after_first_run)
+        self.assertEqual(second[0]["type"], "council_cache_hit")
+        self.assertNotIn("cached_query", second[0])
+        self.assertEqual(second[-1]["type"], "done")
+        self.assertTrue(second[-1]["cache_hit"])
+        final_text = "".join(event["chunk"] for event in second if event["type"] == "finalizer_chunk")
+        self.assertEqual(final_text, "Final answer")
+        self.assertEqual(
+            [event["type"] for event in second if not event["type"].endswith("_chunk")][1:-1],
+            [event["type"] for event in first if not event["type"].endswith("_chunk")][:-1],
+        )
+
+    async def test_offer_mode_sends_the_cached_report_and_still_runs(self):
+        client = FakeClient()
+        workflow = CouncilWorkflow(
+            settings=get_settings(),
+            client_factory=lambda **kwargs: client,
+            council_cache=CouncilCache(mode="offer"),
+        )
+        request = WorkflowRequest(query="Should we ship on Friday?", selected_agents=["The Academic"])
+
+        _first = [event async for event in workflow.stream(request)]
+        second = [event async for event in workflow.stream(request)]
+        opted_out = [event async for event in workflow.stream(WorkflowRequest(query=request.query, selected_agents=request.selected_agents, use_council_cache=False))]
+
+        self.assertEqual(second[0]["type"], "council_cache_hit")
+        self.assertEqual(second[0]["final_report"], "Final answer")
+        self.assertTrue(any(event["type"] == "finalizer_done" for event in second))
+        self.assertEqual(client.calls, 12)
+        self.assertNotEqual(opted_out[0]["type"], "council_cache_hit")
+
+
+if __name__ == "__main__":
+    unittest.main()
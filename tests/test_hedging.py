@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import types
+import unittest
+
+from llm_council.circuit_breaker import BreakerRegistry
+from llm_council.concurrency import LimiterRegistry
+from llm_council.hedging import HedgeController
+from llm_council.llm_client import LLMClient
+from llm_council.retry import RetryScheduler
+from llm_council.settings import get_settings
+
+
+def chunk(content: str | None = None, usage: tuple[int, int, int] | None = None):
+    return types.SimpleNamespace(
+        choices=[] if content is None else [types.SimpleNamespace(delta=types.SimpleNamespace(content=content))],
+        usage=None if usage is None else types.SimpleNamespace(prompt_tokens=usage[0], completion_tokens=usage[1], total_tokens=usage[2]),
+    )
+
+
+class HedgingTests(unittest.IsolatedAsyncioTestCase):
+    def test_hedge_delay_waits_for_enough_ttft_samples(self):
+        controller = HedgeController(enabled=True, percentile=0.9, min_samples=10, min_delay_seconds=0.0)
+        for seconds in range(1, 10):
+            controller.record_ttft("demo/model", float(seconds))
+        self.assertIsNone(controller.hedge_delay("demo/model"))
+
+        controller.record_ttft("demo/model", 10.0)
+        self.assertEqual(controller.hedge_delay("demo/model"), 10.0)
+
+    async def test_silent_primary_is_hedged_to_the_fallback_and_cancelled(self):
+        controller = HedgeController(enabled=True, min_samples=1, min_delay_seconds=0.0)
+        controller.record_ttft("slow/model", 0.01)
+        client = LLMClient(
+            api_key="nvapi-test-key",
+            settings=get_settings(),
+            limiters=LimiterRegistry(),
+            retries=RetryScheduler(),
+            hedging=controller,
+            breakers=BreakerRegistry(),
+        )
+        primary_closed = asyncio.Event()
+
+        async def silent_stream():
+            try:
+                await asyncio.sleep(10)
+                yield chunk("too late")
+            finally:
+                primary_closed.set()
+
+        async def fast_stream():
+            yield chunk("Fast answer")
+            yield chunk(usage=(12, 3, 15))
+
+        async def create(**kwargs):
+            return silent_stream() if kwargs["model"] == "slow/model" else fast_stream()
+
+        client.openai_client = types.SimpleNamespace(
+            chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)),
+        )
+
+        updates = [update async for update in client.stream_generate("Hello", model="slow/model", fallback_model="fast/model")]
+
+        self.assertEqual("".join(update.delta for update in updates), "Fast answer")
+        self.assertEqual(updates[-1].model, "fast/model")
+        self.assertEqual(updates[-1].usage["hedged"], 1)
+        self.assertEqual(updates[-1].usage["hedge_wins"], 1)
+        self.assertEqual(updates[-1].usage["hedge_extra_tokens"], 12)
+        self.assertTrue(primary_closed.is_set())
+        stats = controller.stats()[0]
+        self.assertEqual((stats["model"], stats["hedges"], stats["hedge_wins"]), ("slow/model", 1, 1))
+
+    async def test_hedging_is_opt_in(self):
+        controller = HedgeController(enabled=False, min_samples=1)
+        controller.record_ttft("demo/model", 0.01)
+        client = LLMClient(api_key="nvapi-test-key", settings=get_settings(), hedging=controller)
+        calls = []
+
+        async def stream():
+            yield chunk("Only once")
+            yield chunk(usage=(1, 1, 2))
+
+        async def create(**kwargs):
+            calls.append(kwargs["model"])
+            return stream()
+
+        client.openai_client = types.SimpleNamespace(
+            chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)),
+        )
+
+        updates = [update async for update in client.stream_generate("Hello", model="demo/model")]
+
+        self.assertEqual(calls, ["demo/model"])
+        self.assertNotIn("hedged", updates[-1].usage)
+
+
+if __name__ == "__main__":
+    unittest.main()
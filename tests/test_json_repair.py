@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import unittest
+
+from llm_council.json_repair import JsonRepairStats, repair_json
+
+
+class RepairJsonTests(unittest.TestCase):
+    def test_clean_json_needs_no_repair(self):
+        recovered = repair_json(' {"a": [1, 2]} ')
+        self.assertEqual(recovered.value, {"a": [1, 2]})
+        self.assertEqual(recovered.repairs, ())
+
+    def test_common_model_damage_is_repaired_and_reported(self):
+        cases = [
+            ('```json\n{"a": [1, 2,],}\n```', {"a": [1, 2]}, ("code_fence", "trailing_comma")),
+            ('Here you go:\n{"a": {"b": "x}"}}\nAnything else? {"c": 1}', {"a": {"b": "x}"}}, ("extracted",)),
+            ('{"structure": ["One", "Tw', {"structure": ["One", "Tw"]}, ("closed_brackets",)),
+            ('{"a": 1, "b": tru', {"a": 1}, ("closed_brackets", "dropped_partial")),
+            ('[1, 2] then {"largest": "object"}', {"largest": "object"}, ("extracted",)),
+        ]
+        for raw, value, repairs in cases:
+            with self.subTest(raw=raw):
+                recovered = repair_json(raw)
+                self.assertEqual(recovered.value, value)
+                self.assertEqual(recovered.repairs, repairs)
+
+    def test_text_without_json_is_rejected(self):
+        with self.assertRaises(ValueError):
+            repair_json("I could not produce a scorecard.")
+
+
+class JsonRepairStatsTests(unittest.TestCase):
+    def test_repair_and_failure_rates_are_tracked_per_model(self):
+        stats = JsonRepairStats()
+        stats.record("critic/model", "critic", ())
+        stats.record("critic/model", "critic", ("code_fence", "trailing_comma"))
+        stats.record("critic/model", "critic", None)
+        stats.record("architect/model", "architect", ())
+
+        by_model = {entry["model"]: entry for entry in stats.stats()}
+        self.assertEqual(by_model["critic/model"]["outputs"], 3)
+        self.assertAlmostEqual(by_model["critic/model"]["repair_rate"], 0.3333)
+        self.assertAlmostEqual(by_model["critic/model"]["failure_rate"], 0.3333)
+        self.assertEqual(by_model["critic/model"]["repairs"], {"code_fence": 1, "trailing_comma": 1})
+        self.assertEqual(by_model["architect/model"]["repair_rate"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import unittest
+
+from llm_council.json_stream import WILDCARD, IncrementalJsonParser
+
+DOCUMENT = json.dumps(
+    {
+        "reviews": {
+            "The Academic": {"metric_scores": {"accuracy": 9, "clarity": 8}, "critique": 'Quotes "}" and \\ stay intact.'},
+            "The Skeptic": {"metric_scores": {"accuracy": 6, "clarity": 7}, "critique": "Thin."},
+        },
+        "confidence": -0.5e1,
+        "final": True,
+        "structure": ["Intro - set up", "Details, with ] brackets"],
+    }
+)
+
+
+class IncrementalJsonParserTests(unittest.TestCase):
+    def test_values_complete_identically_for_any_chunking(self):
+        expected = [
+            (("reviews", "The Academic"), json.loads(DOCUMENT)["reviews"]["The Academic"]),
+            (("reviews", "The Skeptic"), json.loads(DOCUMENT)["reviews"]["The Skeptic"]),
+            (("structure", 0), "Intro - set up"),
+            (("structure", 1), "Details, with ] brackets"),
+        ]
+        for size in (1, 2, 5, 13, len(DOCUMENT)):
+            with self.subTest(size=size):
+                parser = IncrementalJsonParser([("reviews", WILDCARD), ("structure", WILDCARD)])
+                emitted = []
+                for start in range(0, len(DOCUMENT), size):
+                    emitted.extend(parser.feed(DOCUMENT[start:start + size]))
+                self.assertEqual(emitted, expected)
+                self.assertTrue(parser.finished)
+                self.assertEqual(parser.top_level(), json.loads(DOCUMENT))
+
+    def test_each_value_is_reported_as_soon_as_it_closes(self):
+        parser = IncrementalJsonParser([("structure", WILDCARD)])
+        self.assertEqual(parser.feed('```json\n{"tone_guidelines": "Calm", "structure": ["One", "Tw'), [(("structure", 0), "One")])
+        self.assertEqual(parser.feed('o", "Thr'), [(("structure", 1), "Two")])
+        self.assertEqual(parser.top_level(), {"tone_guidelines": "Calm"})
+
+    def test_malformed_json_stops_the_scan_without_raising(self):
+        parser = IncrementalJsonParser([("structure", WILDCARD)])
+        self.assertEqual(parser.feed('{"structure": ["One", oops, "Two"]}'), [(("structure", 0), "One")])
+        self.assertTrue(parser.failed)
+        self.assertEqual(parser.feed('"more"'), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import types
+import unittest
+from dataclasses import replace
+
+import httpx
+from openai import APIConnectionError
+
+from llm_council.capabilities import CapabilityCache
+from llm_council.circuit_breaker import BreakerRegistry
+from llm_council.llm_client import LLMClient
+from llm_council.metrics import CouncilMetrics, Histogram
+from llm_council.retry import RetryScheduler
+from llm_council.settings import get_settings
+from llm_council.stalls import StallMonitor
+from llm_council.workflow import CouncilWorkflow, WorkflowRequest
+
+
+class ExpositionTests(unittest.TestCase):
+    def test_histogram_buckets_are_cumulative_and_labels_escaped(self):
+        histogram = Histogram("demo_seconds", "Demo.", ("model",), buckets=(0.5, 1.0))
+        for value in (0.2, 0.5, 0.7, 3.0):
+            histogram.observe(value, 'org/"model"')
+        lines: list[str] = []
+        histogram.render(lines)
+
+        self.assertEqual(lines, [
+            "# HELP demo_seconds Demo.",
+            "# TYPE demo_seconds histogram",
+            'demo_seconds_bucket{model="org/\\"model\\"",le="0.5"} 2',
+            'demo_seconds_bucket{model="org/\\"model\\"",le="1"} 3',
+            'demo_seconds_bucket{model="org/\\"model\\"",le="+Inf"} 4',
+            'demo_seconds_sum{model="org/\\"model\\""} 4.4',
+            'demo_seconds_count{model="org/\\"model\\""} 4',
+        ])
+
+    def test_watched_gauges_are_read_at_scrape_time(self):
+        metrics = CouncilMetrics()
+        depth = {"value": 1.0}
+        metrics.watch("demo_queue_depth", "Demo queue.", ("queue",), lambda: [(("demo",), depth["value"])])
+        depth["value"] = 7.0
+
+        text = metrics.render()
+
+        self.assertIn('demo_queue_depth{queue="demo"} 7', text)
+        self.assertIn("llm_council_councils_in_flight 0", text)
+
+    def test_models_outside_the_configured_set_share_one_label(self):
+        metrics = CouncilMetrics(known_models={"openai/gpt-oss-20b"})
+        metrics.retries.inc("openai/gpt-oss-20b")
+        metrics.retries.inc("custom/model-a")
+        metrics.retries.inc("custom/model-b")
+        metrics.watch("demo_in_flight", "Demo.", ("model",), lambda: [(("custom/model-a",), 2.0), (("custom/model-b",), 3.0)])
+
+        text = metrics.render()
+
+        self.assertIn('llm_council_llm_retries_total{model="openai/gpt-oss-20b"} 1', text)
+        self.assertIn('llm_council_llm_retries_total{model="other"} 2', text)
+        self.assertIn('demo_in_flight{model="other"} 5', text)
+        self.assertNotIn("custom/model", text)
+
+    def test_configured_fallback_models_keep_their_own_label(self):
+        settings = replace(get_settings(), fallback_chains={"critic": ("demo/fallback-model",)})
+        metrics = CouncilMetrics.from_settings(settings)
+
+        self.assertEqual(metrics.model_label("demo/fallback-model"), "demo/fallback-model")
+        self.assertEqual(metrics.model_label("openai/gpt-oss-20b"), "openai/gpt-oss-20b")
+        self.assertEqual(metrics.model_label("anything/else"), "other")
+
+
+class ClientMetricsTests(unittest.IsolatedAsyncioTestCase):
+    async def test_streams_record_ttft_tokens_and_retries_by_model_and_role(self):
+        metrics = CouncilMetrics()
+        calls = {"count": 0}
+
+        async def create(**kwargs):
+            calls["count"] += 1
+            if calls["count"] == 1:
+                raise APIConnectionError(request=httpx.Request("POST", "https://example.nvidia.test/v1"))
+            return _Stream(["Hello ", "council"], usage=(12, 30, 42))
+
+        client = LLMClient(
+            api_key="nvapi-test-key", settings=get_settings(), retries=RetryScheduler(base_delay_seconds=0.0),
+            breakers=BreakerRegistry(), response_cache=None, capabilities=CapabilityCache(), stalls=StallMonitor(), metrics=metrics,
+        )
+        client.openai_client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+
+        updates = [update async for update in client.stream_generate("Decide", model="demo/model", role="critic")]
+
+        self.assertEqual(updates[-1].usage, {"prompt": 12, "completion": 30, "total": 42})
+        self.assertEqual(metrics.ttft.snapshot("demo/model", "critic")["count"], 1)
+        self.assertEqual(metrics.token_rate.snapshot("demo/model", "critic")["count"], 1)
+        text = metrics.render()
+        self.assertIn('llm_council_llm_tokens_total{model="demo/model",role="critic",kind="completion"} 30', text)
+        self.assertIn('llm_council_llm_retries_total{model="demo/model"} 1', text)
+
+
+class WorkflowMetricsTests(unittest.IsolatedAsyncioTestCase):
+    async def test_council_records_each_phase_and_its_total_duration(self):
+        usage = {"prompt": 1, "completion": 1, "total": 2}
+        scorecard = {"metric_scores": {"accuracy": 9, "relevance": 9, "completeness": 9, "clarity": 9, "practical_usefulness": 9}, "critique": "Strong."}
+        responses = [
+            "Draft",
+            json.dumps({"reviews": {"The Academic": scorecard}}),
+            json.dumps({"structure": ["Intro"], "tone_guidelines": "Clear", "missing_facts_to_add": [], "critique_integration": "Use it."}),
+            "Final",
+        ]
+        roles: list[str] = []
+
+        class RoleClient:
+            async def stream_generate(self, *args, role="other", **kwargs):
+                roles.append(role)
+                yield types.SimpleNamespace(delta=responses.pop(0), usage=None)
+                yield types.SimpleNamespace(delta="", usage=usage)
+
+        metrics = CouncilMetrics()
+        workflow = CouncilWorkflow(settings=get_settings(), client_factory=lambda **kwargs: RoleClient(), metrics=metrics)
+
+        _events = [event async for event in workflow.stream(WorkflowRequest(query="Measure this", selected_agents=["The Academic"]))]
+
+        self.assertEqual(roles, ["generator", "critic", "architect", "finalizer"])
+        for phase in ("generator", "critic", "architect", "finalizer"):
+            self.assertEqual(metrics.phase_duration.snapshot(phase)["count"], 1, phase)
+        self.assertEqual(metrics.council_duration.snapshot("full", "completed")["count"], 1)
+        self.assertIn("llm_council_councils_in_flight 0", metrics.render())
+
+
+class _Stream:
+    def __init__(self, deltas: list[str], usage: tuple[int, int, int]) -> None:
+        self.chunks = [types.SimpleNamespace(usage=None, choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=delta))]) for delta in deltas]
+        self.chunks.append(types.SimpleNamespace(
+            usage=types.SimpleNamespace(prompt_tokens=usage[0], completion_tokens=usage[1], total_tokens=usage[2]), choices=[],
+        ))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+
+    async def close(self):
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,7 @@ import types
 import unittest
 from unittest.mock import AsyncMock, patch
 
+from llm_council.client_pool import ClientPool
 from llm_council.llm_client import LLMClient, StreamUpdate
 from llm_council.settings import DEFAULT_MODEL_MAP, get_settings
 
@@ -30,13 +31,12 @@ class NvidiaNimTests(unittest.IsolatedAsyncioTestCase):
         ):
             settings = get_settings()
 
-        with patch("llm_council.llm_client.AsyncOpenAI") as async_openai:
-            LLMClient(settings=settings)
+        with patch("llm_council.client_pool.AsyncOpenAI") as async_openai:
+            LLMClient(settings=settings, pool=ClientPool())
 
-        async_openai.assert_called_once_with(
-            api_key="nvapi-server-key",
-            base_url="https://example.nvidia.test/v1",
-        )
+        async_openai.assert_called_once()
+        self.assertEqual(async_openai.call_args.kwargs["api_key"], "nvapi-server-key")
+        self.assertEqual(async_openai.call_args.kwargs["base_url"], "https://example.nvidia.test/v1")
 
     async def test_connection_request_has_no_provider_specific_headers(self):
         client = LLMClient(api_key="nvapi-test-key", settings=get_settings())
@@ -108,5 +108,27 @@ class NvidiaNimTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(request.await_args.kwargs["reasoning_effort"], "medium")
         self.assertNotIn("max_tokens", request.await_args.kwargs)
 
+    async def test_stream_generate_drops_reasoning_when_not_requested(self):
+        client = LLMClient(api_key="nvapi-test-key", settings=get_settings())
+
+        async def chunks():
+            yield types.SimpleNamespace(
+                choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=None, reasoning_content="Hidden."))],
+                usage=None,
+            )
+            yield types.SimpleNamespace(
+                choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content="Answer.", reasoning_content=None))],
+                usage=types.SimpleNamespace(prompt_tokens=3, completion_tokens=2, total_tokens=5),
+            )
+
+        request = AsyncMock(return_value=chunks())
+        client.openai_client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=request)))
+
+        updates = [update async for update in client.stream_generate("Hello", model="demo/model", include_reasoning=False)]
+
+        self.assertEqual([update.reasoning for update in updates if update.reasoning], [])
+        self.assertEqual("".join(update.delta for update in updates), "Answer.")
+
+
 if __name__ == "__main__":
     unittest.main()
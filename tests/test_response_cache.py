@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import tempfile
+import time
+import types
+import unittest
+from pathlib import Path
+
+from llm_council.circuit_breaker import BreakerRegistry
+from llm_council.llm_client import LLMClient
+from llm_council.response_cache import CachedResponse, ResponseCache, response_cache_key
+from llm_council.retry import RetryScheduler
+from llm_council.schemas import CriticBatchOutput
+from llm_council.settings import get_settings
+
+
+def chunk(content: str | None = None, usage: tuple[int, int, int] | None = None):
+    return types.SimpleNamespace(
+        choices=[] if content is None else [types.SimpleNamespace(delta=types.SimpleNamespace(content=content))],
+        usage=None if usage is None else types.SimpleNamespace(prompt_tokens=usage[0], completion_tokens=usage[1], total_tokens=usage[2]),
+    )
+
+
+def cached(content: str, *, created_at: float | None = None) -> CachedResponse:
+    return CachedResponse(
+        content=content,
+        reasoning="",
+        usage={"prompt": 1, "completion": 1, "total": 2},
+        model="demo/model",
+        created_at=time.time() if created_at is None else created_at,
+    )
+
+
+class ResponseCacheTests(unittest.IsolatedAsyncioTestCase):
+    def test_key_covers_api_key_model_prompt_schema_and_reasoning_effort(self):
+        base = response_cache_key("key-a", "demo/model", "Hello", CriticBatchOutput, "medium")
+        self.assertEqual(base, response_cache_key("key-a", "demo/model", "Hello", CriticBatchOutput, "medium"))
+        self.assertNotEqual(base, response_cache_key("key-b", "demo/model", "Hello", CriticBatchOutput, "medium"))
+        self.assertNotEqual(base, response_cache_key("key-a", "other/model", "Hello", CriticBatchOutput, "medium"))
+        self.assertNotEqual(base, response_cache_key("key-a", "demo/model", "Hello!", CriticBatchOutput, "medium"))
+        self.assertNotEqual(base, response_cache_key("key-a", "demo/model", "Hello", None, "medium"))
+        self.assertNotEqual(base, response_cache_key("key-a", "demo/model", "Hello", CriticBatchOutput, "low"))
+
+    async def test_lru_evicts_to_the_byte_budget_and_expires_by_ttl(self):
+        cache = ResponseCache(max_bytes=10, ttl_seconds=60)
+        await cache.put("a", cached("aaaa"))
+        await cache.put("b", cached("bbbb"))
+        self.assertIsNotNone(await cache.get("a"))
+        await cache.put("c", cached("cccc"))
+
+        self.assertIsNone(await cache.get("b"))
+        self.assertIsNotNone(await cache.get("a"))
+        await cache.put("old", cached("dd", created_at=time.time() - 120))
+        self.assertIsNone(await cache.get("old"))
+
+        stats = cache.stats()
+        self.assertEqual(stats["bytes"], 8)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["expirations"], 1)
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 2))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    async def test_disk_tier_survives_a_new_process_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            await ResponseCache(disk_dir=Path(directory)).put("key", cached("from disk"))
+            restarted = ResponseCache(disk_dir=Path(directory))
+
+            entry = await restarted.get("key")
+
+        self.assertEqual(entry.content, "from disk")
+        self.assertEqual(restarted.stats()["disk_hits"], 1)
+
+    async def test_identical_call_is_replayed_without_a_request(self):
+        cache = ResponseCache()
+        client = LLMClient(
+            api_key="nvapi-test-key",
+            settings=get_settings(),
+            retries=RetryScheduler(),
+            breakers=BreakerRegistry(),
+            response_cache=cache,
+        )
+        calls = []
+
+        async def stream():
+            yield chunk("Cached ")
+            yield chunk("answer")
+            yield chunk(usage=(10, 2, 12))
+
+        async def create(**kwargs):
+            calls.append(kwargs["model"])
+            return stream()
+
+        client.openai_client = types.SimpleNamespace(
+            chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)),
+        )
+
+        first = [update async for update in client.stream_generate("Hello", model="demo/model", reasoning_effort="low")]
+        second = [update async for update in client.stream_generate("Hello", model="demo/model", reasoning_effort="low")]
+
+        self.assertEqual(calls, ["demo/model"])
+        self.assertFalse(any(update.cache_hit for update in first))
+        self.assertTrue(all(update.cache_hit for update in second))
+        self.assertEqual("".join(update.delta for update in second), "Cached answer")
+        self.assertEqual(second[-1].usage, {"prompt": 10, "completion": 2, "total": 12})
+        self.assertEqual(second[-1].model, "demo/model")
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    async def test_api_keys_do_not_share_entries(self):
+        cache = ResponseCache()
+        calls = []
+
+        async def stream():
+            yield chunk("Tenant answer")
+            yield chunk(usage=(10, 2, 12))
+
+        async def create(**kwargs):
+            calls.append(kwargs["model"])
+            return stream()
+
+        for api_key in ("nvapi-tenant-a", "nvapi-tenant-b"):
+            client = LLMClient(
+                api_key=api_key,
+                settings=get_settings(),
+                retries=RetryScheduler(),
+                breakers=BreakerRegistry(),
+                response_cache=cache,
+            )
+            client.openai_client = types.SimpleNamespace(
+                chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)),
+            )
+            updates = [update async for update in client.stream_generate("Hello", model="demo/model")]
+            self.assertFalse(any(update.cache_hit for update in updates))
+
+        self.assertEqual(calls, ["demo/model", "demo/model"])
+        self.assertEqual(cache.stats()["entries"], 2)
+
+    async def test_empty_and_invalid_structured_answers_are_not_cached(self):
+        cache = ResponseCache()
+        client = LLMClient(
+            api_key="nvapi-test-key",
+            settings=get_settings(),
+            retries=RetryScheduler(),
+            breakers=BreakerRegistry(),
+            response_cache=cache,
+        )
+        answers = ["", "not json at all", '{"reviews": {"Agent": {"critique": "no scores"}}}']
+
+        async def stream(content):
+            if content:
+                yield chunk(content)
+            yield chunk(usage=(10, 2, 12))
+
+        async def create(**kwargs):
+            return stream(answers.pop(0))
+
+        client.openai_client = types.SimpleNamespace(
+            chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)),
+        )
+
+        _ = [update async for update in client.stream_generate("Hello", model="demo/model")]
+        for _attempt in range(2):
+            _ = [update async for update in client.stream_generate("Score", schema=CriticBatchOutput, model="demo/model")]
+
+        self.assertEqual(answers, [])
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    async def test_failed_stream_is_not_cached(self):
+        cache = ResponseCache()
+        client = LLMClient(
+            api_key="nvapi-test-key",
+            settings=get_settings(),
+            retries=RetryScheduler(max_retries=0),
+            breakers=BreakerRegistry(enabled=False),
+            response_cache=cache,
+        )
+
+        async def broken_stream():
+            yield chunk("Partial")
+            raise ConnectionError("stream dropped")
+
+        async def create(**kwargs):
+            return broken_stream()
+
+        client.openai_client = types.SimpleNamespace(
+            chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)),
+        )
+
+        with self.assertRaises(RuntimeError):
+            _ = [update async for update in client.stream_generate("Hello", model="demo/model")]
+
+        self.assertEqual(cache.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
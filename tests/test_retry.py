@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import time
+import unittest
+
+import httpx
+from openai import APIConnectionError, APIStatusError
+
+from llm_council.retry import RetryScheduler, is_retryable, retry_after_seconds
+
+
+def status_error(status: int, headers: dict[str, str] | None = None) -> APIStatusError:
+    request = httpx.Request("POST", "https://example.nvidia.test/v1/chat/completions")
+    return APIStatusError("upstream error", response=httpx.Response(status, headers=headers, request=request), body=None)
+
+
+class RetrySchedulerTests(unittest.TestCase):
+    def test_retryable_errors_are_classified_by_type_not_message_text(self):
+        request = httpx.Request("POST", "https://example.nvidia.test/v1")
+        self.assertTrue(is_retryable(status_error(429)))
+        self.assertTrue(is_retryable(APIConnectionError(request=request)))
+        self.assertFalse(is_retryable(status_error(400)))
+        self.assertFalse(is_retryable(ValueError("status 429 in a message")))
+
+    def test_provider_wait_headers_are_parsed(self):
+        self.assertEqual(retry_after_seconds(status_error(429, {"retry-after": "7"})), 7.0)
+        self.assertEqual(retry_after_seconds(status_error(429, {"retry-after-ms": "250"})), 0.25)
+        self.assertEqual(
+            retry_after_seconds(status_error(429, {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "1m30s"})),
+            90.0,
+        )
+        self.assertIsNone(
+            retry_after_seconds(status_error(429, {"x-ratelimit-remaining-requests": "12", "x-ratelimit-reset-requests": "2s"})),
+        )
+        http_date = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 30))
+        self.assertAlmostEqual(retry_after_seconds(status_error(503, {"retry-after": http_date})), 30.0, delta=2.0)
+
+    def test_retry_after_gate_is_shared_by_every_caller_for_the_model(self):
+        scheduler = RetryScheduler(base_delay_seconds=0.01)
+        first = scheduler.next_delay("demo/model", status_error(429, {"retry-after": "5"}), 0)
+        second = scheduler.next_delay("demo/model", status_error(503), 0)
+
+        self.assertGreaterEqual(first, 5.0)
+        self.assertGreaterEqual(second, 4.5)
+        self.assertLess(scheduler.next_delay("other/model", status_error(503), 0), 0.02)
+
+    def test_budget_limits_retries_across_concurrent_failures(self):
+        scheduler = RetryScheduler(budget_min=3, budget_ratio=0.0, base_delay_seconds=0.0)
+        delays = [scheduler.next_delay("demo/model", status_error(503), 0) for _ in range(10)]
+
+        self.assertEqual(sum(delay is not None for delay in delays), 3)
+        self.assertEqual(scheduler.stats()[0]["denied_budget"], 7)
+
+    def test_idle_refill_is_scaled_by_the_configured_rate(self):
+        scheduler = RetryScheduler(budget_min=3, budget_ratio=0.0, base_delay_seconds=0.0, budget_refill_per_second=0.1)
+        for _ in range(3):
+            scheduler.next_delay("demo/model", status_error(503), 0)
+        scheduler._models["demo/model"].refilled_at -= 5  # five idle seconds regain half a retry
+
+        self.assertIsNone(scheduler.next_delay("demo/model", status_error(503), 0))
+        scheduler._models["demo/model"].refilled_at -= 6
+        self.assertIsNotNone(scheduler.next_delay("demo/model", status_error(503), 0))
+
+    def test_idle_models_are_evicted_past_the_registry_bound(self):
+        scheduler = RetryScheduler(max_entries=2, budget_ratio=0.0, base_delay_seconds=0.0)
+        scheduler.next_delay("gated/model", status_error(429, {"retry-after": "5"}), 0)
+        scheduler.record_request("idle/model")
+        scheduler.record_request("custom/model")
+
+        self.assertEqual([row["model"] for row in scheduler.stats()], ["gated/model", "custom/model"])
+        self.assertEqual(scheduler.evictions, 1)
+
+    def test_retries_never_sleep_past_the_deadline(self):
+        scheduler = RetryScheduler()
+        delay = scheduler.next_delay(
+            "demo/model",
+            status_error(429, {"retry-after": "10"}),
+            0,
+            deadline=time.monotonic() + 3,
+        )
+
+        self.assertIsNone(delay)
+        self.assertEqual(scheduler.stats()[0]["denied_deadline"], 1)
+
+    def test_non_retryable_and_exhausted_attempts_give_up(self):
+        scheduler = RetryScheduler(max_retries=2)
+        self.assertIsNone(scheduler.next_delay("demo/model", status_error(400), 0))
+        self.assertIsNone(scheduler.next_delay("demo/model", status_error(503), 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import unittest
+
+from llm_council.llm_client import StreamUpdate
+from llm_council.sectional import SectionalFinalizer, build_section_outline
+from llm_council.settings import get_settings
+from llm_council.workflow import CouncilWorkflow, WorkflowRequest
+
+
+def scripted_sections(scripts):
+    """``scripts[index]`` is a list of (delay, delta) pairs, or an exception to raise."""
+
+    async def open_stream(index, _section):
+        script = scripts[index]
+        if isinstance(script, Exception):
+            raise script
+        for delay, delta in script:
+            await asyncio.sleep(delay)
+            yield StreamUpdate(delta=delta)
+        yield StreamUpdate(usage={"prompt": 10, "completion": 5, "total": 15}, model="demo/model")
+
+    return open_stream
+
+
+class SectionalFinalizerTests(unittest.IsolatedAsyncioTestCase):
+    async def test_sections_stream_in_blueprint_order_even_when_later_ones_finish_first(self):
+        finalizer = SectionalFinalizer(
+            scripted_sections([
+                [(0.03, "# One\n"), (0.03, "slow")],
+                [(0, "# Two\n"), (0, "fast")],
+                [(0, "# Three")],
+            ]),
+            ["Section 1: One - open", "Section 2: Two - middle", "Section 3: Three - close"],
+        )
+
+        updates = [update async for update in finalizer.stream()]
+
+        text = "".join(update.delta for update in updates)
+        self.assertEqual(text, "# One\nslow\n\n# Two\nfast\n\n# Three")
+        self.assertEqual(updates[-1].usage, {"prompt": 30, "completion": 15, "total": 45})
+        self.assertEqual([report.title for report in finalizer.reports], ["Section 1: One", "Section 2: Two", "Section 3: Three"])
+        self.assertLess(finalizer.reports[1].time_taken, finalizer.reports[0].time_taken)
+        self.assertEqual(build_section_outline(["Section 1: One - open", "Section 2: Two"]), "1. Section 1: One\n2. Section 2: Two")
+
+    async def test_failed_section_is_reported_and_left_out(self):
+        finalizer = SectionalFinalizer(
+            scripted_sections([[(0, "# One")], RuntimeError("boom"), [(0, "# Three")]]),
+            ["One", "Two", "Three"],
+        )
+
+        text = "".join([update.delta async for update in finalizer.stream()])
+
+        self.assertEqual(text, "# One\n\n# Three")
+        self.assertEqual([(report.index, report.error) for report in finalizer.failed], [(2, "boom")])
+
+    async def test_sectional_workflow_reports_per_section_timing_and_usage(self):
+        class SectionClient:
+            def __init__(self):
+                self.section_prompts = []
+
+            async def stream_generate(self, prompt, *args, **kwargs):
+                if "Senior Quality Assurance Judge" in prompt:
+                    content = json.dumps({"reviews": {"The Academic": {"metric_scores": {"accuracy": 9, "relevance": 9, "completeness": 9, "clarity": 9, "practical_usefulness": 9}, "critique": "Strong."}}})
+                elif "Chief Solutions Architect" in prompt:
+                    content = json.dumps({"structure": ["Section 1: Intro - set up", "Section 2: Detail - explain"], "tone_guidelines": "Clear", "missing_facts_to_add": [], "critique_integration": "Use it."})
+                elif "Section Writers" in prompt:
+                    self.section_prompts.append(prompt)
+                    content = "# Intro" if "section 1 of 2" in prompt else "# Detail"
+                else:
+                    content = "Draft"
+                yield StreamUpdate(delta=content)
+                yield StreamUpdate(usage={"prompt": 1, "completion": 1, "total": 2})
+
+        client = SectionClient()
+        workflow = CouncilWorkflow(settings=get_settings(), client_factory=lambda **kwargs: client)
+        request = WorkflowRequest(query="Test", selected_agents=["The Academic"], finalizer_mode="sectional")
+        events = [event async for event in workflow.stream(request)]
+
+        self.assertEqual(len(client.section_prompts), 2)
+        self.assertTrue(all("1. Section 1: Intro\n2. Section 2: Detail" in prompt for prompt in client.section_prompts))
+        self.assertEqual("".join(event["chunk"] for event in events if event["type"] == "finalizer_chunk"), "# Intro\n\n# Detail")
+        finalizer_done = next(event for event in events if event["type"] == "finalizer_done")
+        self.assertEqual([section["title"] for section in finalizer_done["sections"]], ["Section 1: Intro", "Section 2: Detail"])
+        self.assertEqual(finalizer_done["usage"]["total"], 4)
+        self.assertFalse(any(event["type"] == "error" for event in events))
+
+    async def test_section_writers_start_while_the_architect_is_still_streaming(self):
+        class OverlapClient:
+            def __init__(self):
+                self.section_started = asyncio.Event()
+                self.sections_before_architect_done = 0
+
+            async def stream_generate(self, prompt, *args, **kwargs):
+                if "Senior Quality Assurance Judge" in prompt:
+                    yield StreamUpdate(delta=json.dumps({"reviews": {"The Academic": {"metric_scores": {"accuracy": 9, "relevance": 9, "completeness": 9, "clarity": 9, "practical_usefulness": 9}, "critique": "Strong."}}}))
+                elif "Chief Solutions Architect" in prompt:
+                    yield StreamUpdate(delta='{"structure": ["Section 1: Intro - set up", "Section 2: Detail - explain"], "tone_guidelines": "Clear", "missing_facts_to_add": [], ')
+                    await asyncio.wait_for(self.section_started.wait(), 1)
+                    self.sections_before_architect_done += 1
+                    yield StreamUpdate(delta='"critique_integration": "Use it."}')
+                elif "Section Writers" in prompt:
+                    self.section_started.set()
+                    yield StreamUpdate(delta="# Intro" if "section 1 of 2" in prompt else "# Detail")
+                else:
+                    yield StreamUpdate(delta="Draft")
+                yield StreamUpdate(usage={"prompt": 1, "completion": 1, "total": 2})
+
+        client = OverlapClient()
+        workflow = CouncilWorkflow(settings=get_settings(), client_factory=lambda **kwargs: client)
+        request = WorkflowRequest(query="Test", selected_agents=["The Academic"], finalizer_mode="sectional")
+        events = [event async for event in workflow.stream(request)]
+
+        self.assertEqual(client.sections_before_architect_done, 1)
+        self.assertEqual("".join(event["chunk"] for event in events if event["type"] == "finalizer_chunk"), "# Intro\n\n# Detail")
+        self.assertFalse(any(event["type"] == "error" for event in events))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import asyncio
+import tempfile
 import unittest
+from dataclasses import replace
+from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 from fastapi.testclient import TestClient
@@ -9,6 +12,8 @@ from openai import OpenAIError
 
 from llm_council import server
 from llm_council.llm_client import StreamUpdate
+from llm_council.trace_sink import TraceSink
+from llm_council.tracer import WorkflowTracer
 
 
 class ServerTests(unittest.TestCase):
@@ -22,6 +27,70 @@ class ServerTests(unittest.TestCase):
         self.assertIn("model_map", payload)
         self.assertIn("personas", payload)
 
+    def test_circuit_breaker_endpoint_reports_breaker_states(self):
+        registry = server.get_breaker_registry(server.settings)
+        registry.get(server.api_key_fingerprint(server.settings.nvidia_api_key), "demo/breaker-model")
+        response = self.client.get("/api/circuit-breakers")
+        self.assertEqual(response.status_code, 200)
+        breakers = {entry["model"]: entry for entry in response.json()["breakers"]}
+        self.assertEqual(breakers["demo/breaker-model"]["state"], "closed")
+
+    def test_circuit_breaker_endpoint_hides_other_callers_keys(self):
+        registry = server.get_breaker_registry(server.settings)
+        registry.get(server.api_key_fingerprint("nvapi-tenant-a"), "demo/tenant-a-model")
+        registry.get(server.api_key_fingerprint("nvapi-tenant-b"), "demo/tenant-b-model")
+
+        anonymous = {entry["model"] for entry in self.client.get("/api/circuit-breakers").json()["breakers"]}
+        tenant_a = {
+            entry["model"]
+            for entry in self.client.get(
+                "/api/circuit-breakers", headers={"X-NVIDIA-API-Key": "nvapi-tenant-a"}
+            ).json()["breakers"]
+        }
+
+        self.assertNotIn("demo/tenant-a-model", anonymous)
+        self.assertIn("demo/tenant-a-model", tenant_a)
+        self.assertNotIn("demo/tenant-b-model", tenant_a)
+
+    def test_traces_are_served_only_to_the_key_that_made_them(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sink = TraceSink(Path(directory))
+            tracer = WorkflowTracer(enabled=True, log_dir=directory, sink=sink, owner=server.api_key_fingerprint("nvapi-tenant-a"))
+            tracer.log_step("Generators", "Generator-The Academic", "prompt", "tenant draft")
+            run_id = tracer.finalize()
+            with patch.object(server, "settings", replace(server.settings, enable_trace_logs=True)), patch.object(server, "get_trace_sink", return_value=sink):
+                anonymous = self.client.get(f"/api/traces/{run_id}")
+                other = self.client.get(f"/api/traces/{run_id}", headers={"X-NVIDIA-API-Key": "nvapi-tenant-b"})
+                owner = self.client.get(f"/api/traces/{run_id}", headers={"X-NVIDIA-API-Key": "nvapi-tenant-a"})
+            sink.close()
+
+        self.assertEqual((anonymous.status_code, other.status_code), (404, 404))
+        self.assertEqual(owner.status_code, 200)
+        self.assertIn("tenant draft", owner.text)
+
+    def test_metrics_endpoint_serves_prometheus_text_with_queue_depths(self):
+        server.metrics.fallbacks.inc("demo/metrics-model", "error")
+        server.metrics.fallbacks.inc(server.DEFAULT_MODEL_MAP["critic"], "error")
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn("# TYPE llm_council_llm_time_to_first_token_seconds histogram", response.text)
+        self.assertIn('llm_council_llm_fallbacks_total{model="other",reason="error"}', response.text)
+        self.assertIn(f'llm_council_llm_fallbacks_total{{model="{server.DEFAULT_MODEL_MAP["critic"]}",reason="error"}}', response.text)
+        self.assertNotIn("demo/metrics-model", response.text)
+        self.assertIn('llm_council_queue_depth{queue="trace_export"} 0', response.text)
+
+    def test_model_capabilities_endpoint_lists_and_resets_learned_parameters(self):
+        cache = server.get_capability_cache(server.settings)
+        cache.record("http://capabilities.local/v1", "demo/capability-model", {"reasoning_effort": False})
+        listed = self.client.get("/api/model-capabilities").json()["models"]
+        self.assertIn(
+            {"model": "demo/capability-model", "accepts": {"reasoning_effort": False}},
+            [{"model": row["model"], "accepts": row["accepts"]} for row in listed],
+        )
+        response = self.client.delete("/api/model-capabilities", params={"base_url": "http://capabilities.local/v1"})
+        self.assertEqual(response.json(), {"removed": 1})
+
     def test_check_model_returns_success_when_connection_passes(self):
         with patch.object(server.LLMClient, "check_connection", new=AsyncMock(return_value=True)):
             response = self.client.post(
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import types
+import unittest
+
+from llm_council.capabilities import CapabilityCache
+from llm_council.circuit_breaker import BreakerRegistry
+from llm_council.concurrency import LimiterRegistry
+from llm_council.llm_client import LLMClient
+from llm_council.retry import RetryScheduler
+from llm_council.settings import get_settings
+from llm_council.stalls import StallMonitor, stitch_overlap
+
+
+class StitchTests(unittest.TestCase):
+    def test_repeated_tail_is_dropped_but_short_coincidences_are_kept(self):
+        self.assertEqual(stitch_overlap("The council weighs the evidence", "weighs the evidence and then"), len("weighs the evidence"))
+        self.assertEqual(stitch_overlap("Ends with the ", "the answer"), 0)
+
+
+class StallRecoveryTests(unittest.IsolatedAsyncioTestCase):
+    def client(self, responses: list[list[str]], monitor: StallMonitor, requests: list[dict], limiters: LimiterRegistry | None = None) -> LLMClient:
+        async def create(**kwargs):
+            requests.append(kwargs)
+            return _StallingStream(responses.pop(0))
+
+        client = LLMClient(api_key="nvapi-test-key", settings=get_settings(), limiters=limiters, retries=RetryScheduler(), breakers=BreakerRegistry(), response_cache=None, capabilities=CapabilityCache(), stalls=monitor)
+        client.openai_client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+        return client
+
+    async def test_stalled_stream_is_continued_and_stitched(self):
+        requests: list[dict] = []
+        monitor = StallMonitor(timeout_seconds=0.05, recovery="continue")
+        client = self.client(
+            [["The council weighs ", "the evidence"], ["weighs the evidence and answers yes.", None]],
+            monitor,
+            requests,
+        )
+
+        updates = [update async for update in client._stream_messages([{"role": "user", "content": "Decide"}], model="demo/model")]
+
+        self.assertEqual("".join(update.delta for update in updates), "The council weighs the evidence and answers yes.")
+        self.assertEqual(requests[1]["messages"][1], {"role": "assistant", "content": "The council weighs the evidence"})
+        self.assertIn("Continue from:", requests[1]["messages"][2]["content"])
+        self.assertEqual(monitor.stats()["models"][0] | {"stall_seconds": 0, "max_gap_seconds": 0}, {
+            "model": "demo/model", "streams": 1, "stalls": 1, "continued": 1, "failed": 0, "stall_seconds": 0, "max_gap_seconds": 0,
+        })
+
+    async def test_continued_stream_reports_usage_from_every_attempt(self):
+        monitor = StallMonitor(timeout_seconds=0.05, recovery="continue")
+        client = self.client(
+            [
+                ["The council weighs ", {"prompt": 10, "completion": 4, "total": 14}],
+                ["weighs the evidence and answers yes.", {"prompt": 18, "completion": 6, "total": 24}, None],
+            ],
+            monitor,
+            [],
+        )
+
+        updates = [update async for update in client._stream_messages([{"role": "user", "content": "Decide"}], model="demo/model")]
+
+        self.assertEqual(updates[-1].usage, {"prompt": 28, "completion": 10, "total": 38})
+
+    async def test_fail_policy_ends_a_stalled_stream_with_an_error(self):
+        monitor = StallMonitor(timeout_seconds=0.05, recovery="fail")
+        client = self.client([["Partial answer"]], monitor, [])
+
+        updates = []
+        with self.assertRaisesRegex(RuntimeError, "stalled"):
+            async for update in client._stream_messages([{"role": "user", "content": "Decide"}], model="demo/model"):
+                updates.append(update)
+
+        self.assertEqual([update.delta for update in updates], ["Partial answer"])
+        self.assertEqual(monitor.stats()["models"][0]["failed"], 1)
+
+    async def test_stall_after_output_does_not_shrink_the_concurrency_limit(self):
+        limiters = LimiterRegistry(initial_limit=8)
+        client = self.client([["Partial answer"]], StallMonitor(timeout_seconds=0.05, recovery="fail"), [], limiters)
+
+        with self.assertRaisesRegex(RuntimeError, "stalled"):
+            _ = [update async for update in client._stream_messages([{"role": "user", "content": "Decide"}], model="demo/model")]
+
+        self.assertEqual(limiters.get(client.key_id, "demo/model").limit, 8)
+
+
+class _StallingStream:
+    """Yields the given deltas and then hangs, unless the list ends with ``None``.
+
+    A dict is sent as a usage record.
+    """
+
+    def __init__(self, deltas: list[str | dict | None]) -> None:
+        self.deltas = list(deltas)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.deltas:
+            await asyncio.Event().wait()
+        delta = self.deltas.pop(0)
+        if delta is None:
+            raise StopAsyncIteration
+        if isinstance(delta, dict):
+            usage = types.SimpleNamespace(prompt_tokens=delta["prompt"], completion_tokens=delta["completion"], total_tokens=delta["total"])
+            return types.SimpleNamespace(usage=usage, choices=[])
+        return types.SimpleNamespace(usage=None, choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=delta))])
+
+    async def close(self):
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
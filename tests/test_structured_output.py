@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import types
+import unittest
+
+import httpx
+from openai import APIStatusError
+
+from llm_council.capabilities import CapabilityCache
+from llm_council.circuit_breaker import BreakerRegistry
+from llm_council.llm_client import LLMClient, sent_parameters
+from llm_council.retry import RetryScheduler
+from llm_council.schemas import ArchitectBlueprint, critic_batch_model
+from llm_council.settings import get_settings
+from llm_council.structured_output import StructuredOutputCompiler, compile_json_schema
+
+
+class StructuredOutputCompilerTests(unittest.TestCase):
+    def test_batch_schema_pins_agents_metrics_and_score_range(self):
+        schema = compile_json_schema(critic_batch_model(("The Academic", "The Skeptic")))
+
+        reviews = schema["properties"]["reviews"]
+        self.assertNotIn("$defs", schema)
+        self.assertEqual(reviews["required"], ["The Academic", "The Skeptic"])
+        self.assertFalse(reviews["additionalProperties"])
+        accuracy = reviews["properties"]["The Skeptic"]["properties"]["metric_scores"]["properties"]["accuracy"]
+        self.assertEqual((accuracy["minimum"], accuracy["maximum"]), (1, 10))
+
+    def test_params_are_compiled_once_per_model_and_mode(self):
+        compiler = StructuredOutputCompiler()
+        first = compiler.request_params("demo/model", ArchitectBlueprint, "json_schema")
+        again = compiler.request_params("demo/model", ArchitectBlueprint, "json_schema")
+        guided = compiler.request_params("demo/model", ArchitectBlueprint, "guided_json")
+
+        self.assertIs(first, again)
+        self.assertEqual(first["response_format"]["json_schema"]["name"], "ArchitectBlueprint")
+        self.assertIn("guided_json", guided["extra_body"]["nvext"])
+        self.assertEqual(compiler.request_params("demo/model", ArchitectBlueprint, "json_object"), {"response_format": {"type": "json_object"}})
+        self.assertEqual(compiler.request_params("demo/model", ArchitectBlueprint, "off"), {})
+        self.assertEqual(compiler.stats()["compiled"], 2)
+        self.assertEqual(compiler.stats()["cache_hits"], 1)
+
+
+def _rejecting(requests: list[dict], rejected_modes: set[str], reply):
+    async def create(**kwargs):
+        requests.append(kwargs)
+        sent = sent_parameters(kwargs)
+        if sent and sent[0] in rejected_modes:
+            raise APIStatusError(
+                "unsupported structured output",
+                response=httpx.Response(422, request=httpx.Request("POST", "https://example.nvidia.test/v1")),
+                body=None,
+            )
+        return reply()
+
+    return create
+
+
+class StructuredOutputClientTests(unittest.IsolatedAsyncioTestCase):
+    def client(self, create) -> LLMClient:
+        client = LLMClient(
+            api_key="nvapi-test-key", settings=get_settings(), retries=RetryScheduler(), breakers=BreakerRegistry(),
+            response_cache=None, capabilities=CapabilityCache(), structured_output=StructuredOutputCompiler(default_mode="json_schema"),
+        )
+        client.openai_client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+        return client
+
+    def test_default_mode_is_plain_json_object(self):
+        self.assertEqual(get_settings().nvidia_structured_output, "json_object")
+
+    async def test_rejected_schema_steps_down_the_ladder(self):
+        requests: list[dict] = []
+        client = self.client(_rejecting(requests, {"json_schema", "guided_json"}, lambda: _Stream('{"structure": []}')))
+
+        updates = [update async for update in client._stream_messages([{"role": "user", "content": "Plan"}], schema=ArchitectBlueprint, model="demo/model")]
+
+        self.assertEqual("".join(update.delta for update in updates), '{"structure": []}')
+        self.assertEqual([sent_parameters(request)[0] for request in requests], ["json_schema", "guided_json", "json_object"])
+
+    async def test_non_streamed_calls_step_down_instead_of_dropping_the_constraint(self):
+        requests: list[dict] = []
+        reply = types.SimpleNamespace(choices=[types.SimpleNamespace(message=types.SimpleNamespace(content='{"structure": []}'))], usage=None)
+        client = self.client(_rejecting(requests, {"json_schema"}, lambda: reply))
+
+        content, _usage = await client._real_generate("Plan", schema=ArchitectBlueprint, model="demo/model")
+
+        self.assertEqual(content, '{"structure": []}')
+        self.assertEqual([sent_parameters(request) for request in requests], [["json_schema"], ["guided_json"]])
+        self.assertEqual(client.capabilities.accepts(get_settings().nvidia_api_base_url, "demo/model"), {"json_schema": False, "guided_json": True})
+
+
+class _Stream:
+    def __init__(self, content: str) -> None:
+        self.chunks = [
+            types.SimpleNamespace(usage=None, choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=content))]),
+        ]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+
+    async def close(self):
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from llm_council.trace_sink import TraceSink, render_markdown
+from llm_council.tracer import WorkflowTracer
+
+
+class TraceSinkTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = Path(self.directory.name)
+
+    def test_concurrent_runs_share_one_file_and_render_separately(self):
+        sink = TraceSink(self.path)
+        first = WorkflowTracer(enabled=True, log_dir=self.path, sink=sink)
+        second = WorkflowTracer(enabled=True, log_dir=self.path, sink=sink)
+        first.log_step("Generators", "Generator-The Academic", "prompt with nvapi-secret-key", "draft one")
+        second.log_step("Generators", "Generator-The Skeptic", "other prompt", "draft two")
+        first_id, second_id = first.finalize(), second.finalize()
+        sink.close()
+
+        self.assertNotEqual(first_id, second_id)
+        self.assertEqual([path.name for path in self.path.iterdir()], ["traces.jsonl"])
+        markdown = render_markdown(sink.read_run(first_id))
+        self.assertIn("**Agent:** Generator-The Academic", markdown)
+        self.assertIn("[REDACTED_NVIDIA_KEY]", markdown)
+        self.assertNotIn("draft two", markdown)
+        self.assertTrue(markdown.endswith("# End of Trace\n"))
+
+    def test_drafts_embedded_in_later_prompts_are_written_once(self):
+        sink = TraceSink(self.path)
+        tracer = WorkflowTracer(enabled=True, log_dir=self.path, sink=sink)
+        drafts = [f"Draft {index}: " + "evidence " * 120 + "nvapi-leaked-key" for index in range(3)]
+        for index, draft in enumerate(drafts):
+            tracer.log_step("Generators", f"Generator-{index}", "the question", draft)
+        critic_prompt = "Judge these.\n" + "".join(f"--- RESPONSE ID: {index} ---\n{draft}\n" for index, draft in enumerate(drafts))
+        tracer.log_step("Critics", "Critic-Batch-1", critic_prompt, "{}")
+        tracer.log_step("Finalizer", "Finalizer-Writer", critic_prompt + "Write the report.", "Report")
+        tracer.finalize()
+        sink.close()
+
+        records = sink.read_run(tracer.run_id)
+        self.assertEqual([record["kind"] for record in records].count("blob"), 3)
+        self.assertEqual((self.path / "traces.jsonl").read_text(encoding="utf-8").count("Draft 0: evidence"), 1)
+        self.assertEqual(tracer.blobs.stats()["references"], 6)
+        markdown = render_markdown(records)
+        self.assertEqual(markdown.count(drafts[0].replace("nvapi-leaked-key", "[REDACTED_NVIDIA_KEY]")), 3)
+        self.assertNotIn("nvapi-leaked-key", markdown)
+
+    def test_segments_rotate_by_size_are_gzipped_and_capped(self):
+        sink = TraceSink(self.path, max_bytes=300, retention=2, batch_size=1)
+        tracer = WorkflowTracer(enabled=True, log_dir=self.path, sink=sink)
+        for index in range(12):
+            tracer.log_step("Critics", f"Critic-Batch-{index}", "x" * 100, "y" * 100)
+        sink.flush()
+        stats = sink.stats()
+
+        self.assertGreater(stats["rotations"], 2)
+        self.assertEqual(stats["segments_removed"], stats["rotations"] - 2)
+        self.assertEqual(len(list(self.path.glob("traces-*.jsonl.gz"))), 2)
+        self.assertFalse(list(self.path.glob("traces-*.jsonl")))
+        # The start record was pruned, so reading walks every kept segment, oldest first.
+        agents = [record["agent"] for record in sink.read_run(tracer.run_id)]
+        self.assertEqual(agents, sorted(agents, key=lambda agent: int(agent.rsplit("-", 1)[1])))
+        self.assertIn("Critic-Batch-11", agents)
+        sink.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,18 @@
 from __future__ import annotations
 
+import datetime
+import tempfile
+import threading
+import time
 import unittest
+from dataclasses import replace
+from pathlib import Path
 from unittest.mock import patch
 
+from llm_council.settings import get_settings
+from llm_council.trace_export import TraceExporter
+from llm_council.trace_sampling import TraceSampler
+from llm_council.trace_sink import TraceSink
 from llm_council.tracer import WorkflowTracer
 
 
@@ -46,6 +56,7 @@ class TracerTests(unittest.TestCase):
         self.assertIsNone(root.tree)
 
     def test_langsmith_trace_keeps_visible_content_and_redacts_keys(self):
+        exporter = TraceExporter()
         with patch("llm_council.tracer.Client", return_value=object()) as client, patch(
             "llm_council.tracer.RunTree", FakeRunTree,
         ):
@@ -54,6 +65,7 @@ class TracerTests(unittest.TestCase):
                 langsmith_tracing=True,
                 langsmith_api_key="lsv2_pt_actual-key",
                 langsmith_project="llm-souncil-prod",
+                exporter=exporter,
             )
             root = tracer.start_root(
                 "Council Meeting",
@@ -70,8 +82,10 @@ class TracerTests(unittest.TestCase):
                 usage={"prompt": 4, "completion": 6, "total": 10},
             )
             tracer.finish_root(outputs={"final_report": "A visible answer"}, usage={"prompt": 4, "completion": 6, "total": 10})
+            exporter.close()
 
         client.assert_called_once()
+        self.assertEqual(exporter.stats()["exported"], 4)
         self.assertEqual(len(FakeRunTree.created), 2)
         root_tree, child_tree = FakeRunTree.created
         self.assertEqual(root_tree.kwargs["project_name"], "llm-souncil-prod")
@@ -86,6 +100,127 @@ class TracerTests(unittest.TestCase):
         self.assertIn("duration_seconds", child_tree.ended["metadata"]["timing"])
         self.assertIn("time_to_first_delta_seconds", child_tree.ended["metadata"]["timing"])
 
+    def test_delayed_export_keeps_the_callers_start_and_end_times(self):
+        exporter = TraceExporter()
+        release = threading.Event()
+        exporter.submit(release.wait)  # the worker is busy until after the run has ended
+        with patch("llm_council.tracer.Client", return_value=object()), patch("llm_council.tracer.RunTree", FakeRunTree):
+            tracer = WorkflowTracer(enabled=False, langsmith_tracing=True, langsmith_api_key="lsv2_pt_key", exporter=exporter)
+            tracer.start_root("Council Meeting", {"query": "q"})
+            child = tracer.start_llm("Generator", {"prompt": "p"})
+            time.sleep(0.05)
+            child.finish(outputs={"visible_output": "draft"})
+            tracer.finish_root(outputs={"final_report": "draft"})
+            finished = datetime.datetime.now(datetime.timezone.utc)
+            time.sleep(0.05)
+            release.set()
+            exporter.close()
+
+        root_tree, child_tree = FakeRunTree.created
+        self.assertLessEqual(root_tree.kwargs["start_time"], child_tree.kwargs["start_time"])
+        self.assertGreaterEqual((child_tree.ended["end_time"] - child_tree.kwargs["start_time"]).total_seconds(), 0.05)
+        self.assertLessEqual(root_tree.ended["end_time"], finished)
+
+    def test_tail_held_runs_keep_their_own_times_when_released_later(self):
+        exporter = TraceExporter()
+        sampler = TraceSampler(head_rate=0.0, tail=True)
+        with patch("llm_council.tracer.Client", return_value=object()), patch("llm_council.tracer.RunTree", FakeRunTree):
+            tracer = WorkflowTracer(enabled=False, langsmith_tracing=True, langsmith_api_key="lsv2_pt_key", exporter=exporter, sampler=sampler)
+            tracer.start_root("Council Meeting", {"query": "q"})
+            child = tracer.start_llm("Generator", {"prompt": "p"})
+            time.sleep(0.05)
+            child.finish(outputs={"visible_output": "draft"})
+            tracer.finish_root(error="All generators failed")
+            finished = datetime.datetime.now(datetime.timezone.utc)
+            time.sleep(0.05)
+            self.assertEqual(FakeRunTree.created, [])  # held until the tail decision
+            tracer.finalize()
+            exporter.close()
+
+        root_tree, child_tree = FakeRunTree.created
+        self.assertTrue(tracer.sampled)
+        self.assertGreaterEqual((child_tree.ended["end_time"] - child_tree.kwargs["start_time"]).total_seconds(), 0.05)
+        self.assertLessEqual(root_tree.ended["end_time"], finished)
+        self.assertLessEqual(root_tree.kwargs["start_time"], child_tree.kwargs["start_time"])
+
+
+class TraceExporterTests(unittest.TestCase):
+    def test_full_queue_drops_instead_of_blocking_and_close_flushes(self):
+        release = threading.Event()
+        done: list[int] = []
+        exporter = TraceExporter(max_queue=2, batch_size=10)
+        exporter.submit(release.wait)
+        while exporter.stats()["queued"]:  # the worker has taken the blocking call
+            threading.Event().wait(0.001)
+
+        accepted = [exporter.submit(lambda index=index: done.append(index)) for index in range(4)]
+        release.set()
+        exporter.close()
+
+        self.assertEqual(accepted, [True, True, False, False])
+        self.assertEqual(done, [0, 1])
+        self.assertEqual(exporter.stats()["dropped"], 2)
+        self.assertFalse(exporter.submit(lambda: None))
+
+
+class TraceSamplingTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.sink = TraceSink(Path(directory.name))
+
+    def _run(self, sampler: TraceSampler, *, error: str | None = None, cancel: bool = False) -> WorkflowTracer:
+        tracer = WorkflowTracer(enabled=True, sink=self.sink, sampler=sampler)
+        tracer.start_root("Council Meeting", {"query": "q"})
+        tracer.start_llm("Generator", {"prompt": "p"}).finish(outputs={"visible_output": "draft"})
+        tracer.log_step("Generators", "Generator-1", "q", "draft")
+        if cancel:
+            tracer.close_unfinished("Council stream ended before completion.")
+        else:
+            tracer.finish_root(error=error)
+            tracer.finalize()
+        return tracer
+
+    def test_head_sampling_skips_unsampled_runs_entirely(self):
+        sampler = TraceSampler(head_rate=0.0)
+        tracer = self._run(sampler)
+        self.sink.close()
+
+        self.assertIsNone(tracer.run_id)
+        self.assertEqual(self.sink.stats()["enqueued"], 0)
+        self.assertEqual(sampler.stats()["head_dropped"], 1)
+
+    def test_tail_sampling_keeps_failed_and_cancelled_runs_and_drops_the_rest_unbuilt(self):
+        sampler = TraceSampler(head_rate=0.0, tail=True, latency_threshold_seconds=0)
+        dropped = self._run(sampler)
+        failed = self._run(sampler, error="All generators failed")
+        cancelled = self._run(sampler, cancel=True)
+        self.sink.close()
+
+        self.assertFalse(dropped.sampled)
+        self.assertEqual(self.sink.read_run(dropped.run_id), [])
+        self.assertTrue(failed.sampled and cancelled.sampled)
+        self.assertEqual([record["kind"] for record in self.sink.read_run(failed.run_id)], ["start", "step", "end"])
+        self.assertEqual(len(self.sink.read_run(cancelled.run_id)), 3)
+        stats = sampler.stats()
+        self.assertEqual(stats["tail_kept"], {"cancelled": 1, "error": 1, "slow": 0})
+        self.assertEqual(stats["tail_dropped"], 1)
+        self.assertEqual(stats["discarded_operations"], 3)
+        self.assertEqual(self.sink.stats()["enqueued"], 6)  # the dropped run never reached the sink
+
+    def test_shared_components_are_built_from_the_given_settings(self):
+        settings = replace(get_settings(), trace_sample_rate=0.0)
+        with patch("llm_council.tracer.get_trace_sampler", side_effect=TraceSampler.from_settings) as get_sampler:
+            tracer = WorkflowTracer(enabled=True, sink=self.sink, settings=settings)
+
+        get_sampler.assert_called_once_with(settings)
+        self.assertFalse(tracer.sampled)
+
+    def test_slow_runs_are_kept_by_latency(self):
+        sampler = TraceSampler(head_rate=0.0, tail=True, latency_threshold_seconds=5)
+        self.assertEqual(sampler.tail_reason(cancelled=False, errored=False, duration_seconds=6), "slow")
+        self.assertIsNone(sampler.tail_reason(cancelled=False, errored=False, duration_seconds=4))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -8,7 +8,7 @@ from pathlib import Path
 
 from llm_council.prompts import load_prompt_set
 from llm_council.settings import get_settings
-from llm_council.workflow import CouncilWorkflow, WorkflowRequest, aggregate_critic_reviews, balanced_critic_batches, critic_review_schema, parse_critic_batch, select_active_agents
+from llm_council.workflow import EXPRESS_MARKER, CouncilWorkflow, ExpressStreamSplitter, WorkflowRequest, aggregate_critic_reviews, balanced_critic_batches, critic_review_schema, next_critic_batch_size, parse_critic_batch, select_active_agents
 
 
 class FakeClient:
@@ -150,6 +150,20 @@ class WorkflowTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(critic_event["winner_id"], "The Academic")
         self.assertTrue(any(event["type"] == "finalizer_done" for event in events))
 
+    async def test_run_closes_its_client_when_it_ends(self):
+        class ClosingClient(FakeClient):
+            closed = 0
+
+            async def aclose(self):
+                self.closed += 1
+
+        client = ClosingClient([RuntimeError("upstream down")])
+        workflow = CouncilWorkflow(settings=get_settings(), client_factory=lambda **kwargs: client)
+
+        _events = [event async for event in workflow.stream(WorkflowRequest(query="Test", selected_agents=["The Academic"]))]
+
+        self.assertEqual(client.closed, 1)
+
     async def test_custom_agent_uses_its_prompt_and_model(self):
         class RecordingClient(FakeClient):
             def __init__(self, responses):
@@ -276,6 +290,236 @@ class WorkflowTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(client.critic_starts, 2)
         self.assertTrue(any(event["type"] == "critic_result" for event in events))
 
+    async def test_pipelined_critics_review_drafts_in_completion_order(self):
+        self.assertEqual([next_critic_batch_size(count) for count in (1, 3, 4, 5, 7, 12)], [1, 3, 2, 3, 3, 3])
+
+        class StragglerClient(FakeClient):
+            def __init__(self, slow_agents):
+                super().__init__([])
+                self.slow_agents = slow_agents
+                self.critic_batches = []
+
+            async def stream_generate(self, prompt, *args, **kwargs):
+                if "Senior Quality Assurance Judge" in prompt:
+                    agents = [line.split("--- RESPONSE ID: ")[1].split(" ---")[0] for line in prompt.splitlines() if line.startswith("--- RESPONSE ID:")]
+                    self.critic_batches.append(agents)
+                    content = json.dumps({"reviews": {agent: {"metric_scores": {"accuracy": 8, "relevance": 8, "completeness": 8, "clarity": 8, "practical_usefulness": 8}, "critique": "Solid."} for agent in agents}})
+                elif "Chief Solutions Architect" in prompt:
+                    content = json.dumps({"structure": ["Answer"], "tone_guidelines": "Clear", "missing_facts_to_add": [], "critique_integration": "Use the finalists."})
+                elif "You are the Finalizer" in prompt:
+                    content = "Final answer"
+                else:
+                    content = "Draft"
+                    if any(agent in prompt for agent in self.slow_agents):
+                        await asyncio.sleep(0.1)
+                yield type("Update", (), {"delta": content, "usage": None})()
+                yield type("Update", (), {"delta": "", "usage": {"prompt": 1, "completion": 1, "total": 2}})()
+
+        agents = ["The Academic", "The Layman", "The Skeptic", "The Futurist", "The Ethical Guardian"]
+
+        async def run(slow_agents, timeout_seconds):
+            client = StragglerClient(slow_agents)
+            settings = replace(get_settings(), critic_scheduling="pipelined", critic_batch_timeout_seconds=timeout_seconds)
+            workflow = CouncilWorkflow(settings=settings, client_factory=lambda **kwargs: client)
+            events = [event async for event in workflow.stream(WorkflowRequest(query="Test", selected_agents=agents))]
+            return client, events
+
+        client, events = await run(["The Academic"], 5)
+        starts = [event for event in events if event["type"] == "critic_start"]
+        straggler_done = next(event for event in events if event["type"] == "generator_done" and event["agent"] == "The Academic")
+        self.assertLess(events.index(starts[0]), events.index(straggler_done))
+        self.assertEqual(client.critic_batches, [["The Layman", "The Skeptic", "The Futurist"], ["The Ethical Guardian", "The Academic"]])
+        self.assertEqual([(event["batch"], event["total_batches"]) for event in starts], [(1, 2), (2, 2)])
+        critic_result = next(event for event in events if event["type"] == "critic_result")
+        self.assertEqual(set(critic_result["scorecards"]), set(agents))
+
+        client, events = await run(["The Academic", "The Layman", "The Skeptic"], 0.01)
+        self.assertEqual(client.critic_batches[0], ["The Futurist", "The Ethical Guardian"])
+        self.assertEqual(sorted(agent for batch in client.critic_batches for agent in batch), sorted(agents))
+
+    async def test_generator_quorum_cuts_off_stragglers(self):
+        class HangingClient(FakeClient):
+            def __init__(self, hanging_agents):
+                super().__init__([])
+                self.hanging_agents = hanging_agents
+                self.cancelled = []
+
+            async def stream_generate(self, prompt, *args, **kwargs):
+                if "Senior Quality Assurance Judge" in prompt:
+                    agents = [line.split("--- RESPONSE ID: ")[1].split(" ---")[0] for line in prompt.splitlines() if line.startswith("--- RESPONSE ID:")]
+                    content = json.dumps({"reviews": {agent: {"metric_scores": {"accuracy": 8, "relevance": 8, "completeness": 8, "clarity": 8, "practical_usefulness": 8}, "critique": "Solid."} for agent in agents}})
+                elif "Chief Solutions Architect" in prompt:
+                    content = json.dumps({"structure": ["Answer"], "tone_guidelines": "Clear", "missing_facts_to_add": [], "critique_integration": "Use the finalists."})
+                elif "You are the Finalizer" in prompt:
+                    content = "Final answer"
+                else:
+                    content = "Draft"
+                    hanging = next((agent for agent in self.hanging_agents if agent in prompt), None)
+                    if hanging:
+                        try:
+                            await asyncio.sleep(60)
+                        except asyncio.CancelledError:
+                            self.cancelled.append(hanging)
+                            raise
+                yield type("Update", (), {"delta": content, "usage": None})()
+                yield type("Update", (), {"delta": "", "usage": {"prompt": 1, "completion": 1, "total": 2}})()
+
+        agents = ["The Academic", "The Layman", "The Skeptic", "The Futurist"]
+        settings = replace(get_settings(), generator_straggler_timeout_seconds=0)
+
+        async def run(request):
+            client = HangingClient(["The Skeptic", "The Futurist"])
+            workflow = CouncilWorkflow(settings=settings, client_factory=lambda **kwargs: client)
+            events = [event async for event in workflow.stream(request)]
+            await asyncio.sleep(0)
+            return client, events
+
+        client, events = await run(WorkflowRequest(query="Test", selected_agents=agents, generator_quorum=2))
+        cutoffs = [event for event in events if event.get("cutoff")]
+        self.assertEqual(sorted(event["agent"] for event in cutoffs), ["The Futurist", "The Skeptic"])
+        self.assertTrue(all(event["recoverable"] and "quorum of 2 drafts" in event["message"] for event in cutoffs))
+        self.assertEqual(sorted(client.cancelled), ["The Futurist", "The Skeptic"])
+        self.assertEqual(set(next(event for event in events if event["type"] == "critic_result")["scorecards"]), {"The Academic", "The Layman"})
+        self.assertEqual(events[-1]["type"], "done")
+
+        client, events = await run(WorkflowRequest(query="Test", selected_agents=agents, straggler_timeout_seconds=0.05, straggler_after_drafts=1))
+        cutoffs = [event for event in events if event.get("cutoff")]
+        self.assertEqual(len(cutoffs), 2)
+        self.assertIn("0.05s after 1 of 4 drafts", cutoffs[0]["message"])
+        self.assertTrue(any(event["type"] == "finalizer_done" for event in events))
+
+    async def test_express_splitter_holds_back_a_marker_split_across_deltas(self):
+        splitter = ExpressStreamSplitter()
+        blueprint = answer = ""
+        for delta in ['{"structure": []}\n=== FIN', "AL ANS", "WER ===", "\n", "Hello", " world"]:
+            blueprint_text, answer_text = splitter.feed(delta)
+            self.assertNotIn("===", blueprint_text + answer_text)
+            blueprint += blueprint_text
+            answer += answer_text
+        self.assertEqual((blueprint, answer), ('{"structure": []}\n', "Hello world"))
+
+    async def test_express_pipeline_fuses_architect_and_finalizer_and_skips_the_critic(self):
+        class ExpressClient(FakeClient):
+            def __init__(self):
+                super().__init__([])
+                self.prompts = []
+
+            async def stream_generate(self, prompt, *args, **kwargs):
+                self.prompts.append(prompt)
+                if EXPRESS_MARKER in prompt:
+                    blueprint = json.dumps({"structure": ["Answer"], "tone_guidelines": "Clear", "missing_facts_to_add": [], "critique_integration": "None."})
+                    for delta in (blueprint[:10], blueprint[10:] + "\n" + EXPRESS_MARKER[:5], EXPRESS_MARKER[5:] + "\nFinal ", "answer"):
+                        yield type("Update", (), {"delta": delta, "usage": None})()
+                    yield type("Update", (), {"delta": "", "usage": {"prompt": 5, "completion": 5, "total": 10}})()
+                    return
+                yield type("Update", (), {"delta": "Draft", "usage": None})()
+                yield type("Update", (), {"delta": "", "usage": {"prompt": 1, "completion": 1, "total": 2}})()
+
+        client = ExpressClient()
+        workflow = CouncilWorkflow(settings=get_settings(), client_factory=lambda **kwargs: client)
+        request = WorkflowRequest(query="Test", selected_agents=["The Academic", "The Skeptic"], pipeline="express")
+        events = [event async for event in workflow.stream(request)]
+
+        self.assertEqual(len(client.prompts), 3)
+        self.assertFalse(any(event["type"] in ("critic_start", "error") for event in events))
+        phase_events = [event["type"] for event in events if event["type"].split("_")[0] in ("critic", "architect", "finalizer") and not event["type"].endswith("_chunk")]
+        self.assertEqual(phase_events, [
+            "critic_result", "critic_done", "architect_start", "architect_section", "architect_thinking_done",
+            "architect_result", "finalizer_start", "finalizer_thinking_done", "finalizer_done",
+        ])
+        critic_result = next(event for event in events if event["type"] == "critic_result")
+        self.assertEqual(critic_result["finalists"], ["The Academic", "The Skeptic"])
+        self.assertEqual(next(event for event in events if event["type"] == "architect_result")["structure"], ["Answer"])
+        self.assertEqual("".join(event["chunk"] for event in events if event["type"] == "finalizer_chunk"), "Final answer")
+        self.assertNotIn("===", "".join(event["chunk"] for event in events if event["type"] == "architect_chunk"))
+        self.assertEqual(events[-1]["total_tokens"]["total"], 14)
+
+    async def test_scorecards_and_sections_stream_before_their_json_finishes(self):
+        class ChunkedClient(FakeClient):
+            async def stream_generate(self, prompt, *args, **kwargs):
+                if "Senior Quality Assurance Judge" in prompt:
+                    scorecard = {"metric_scores": {"accuracy": 9, "relevance": 8, "completeness": 8, "clarity": 9, "practical_usefulness": 8}, "critique": "Solid."}
+                    content = json.dumps({"reviews": {"The Academic": scorecard, "The Skeptic": scorecard}})
+                elif "Chief Solutions Architect" in prompt:
+                    # Cut off mid-blueprint, as a token limit would.
+                    content = '{"tone_guidelines": "Plain", "structure": ["Intro - set up", "Detail - explain", "Outro'
+                elif "You are the Finalizer" in prompt:
+                    content = "Final answer"
+                else:
+                    content = "Draft"
+                for start in range(0, len(content), 7):
+                    yield type("Update", (), {"delta": content[start:start + 7], "usage": None})()
+                yield type("Update", (), {"delta": "", "usage": {"prompt": 1, "completion": 1, "total": 2}})()
+
+        client = ChunkedClient([])
+        workflow = CouncilWorkflow(settings=get_settings(), client_factory=lambda **kwargs: client)
+        events = [event async for event in workflow.stream(WorkflowRequest(query="Test", selected_agents=["The Academic", "The Skeptic"]))]
+        types = [event["type"] for event in events]
+
+        reviews = [event for event in events if event["type"] == "critic_review"]
+        self.assertEqual([(event["agent"], event["average"]) for event in reviews], [("The Academic", 8.4), ("The Skeptic", 8.4)])
+        self.assertLess(events.index(reviews[0]), max(index for index, kind in enumerate(types) if kind == "critic_chunk"))
+        sections = [event for event in events if event["type"] == "architect_section"]
+        self.assertEqual([(event["index"], event["section"]) for event in sections], [(0, "Intro - set up"), (1, "Detail - explain")])
+        architect_result = next(event for event in events if event["type"] == "architect_result")
+        self.assertEqual(architect_result["structure"], ["Intro - set up", "Detail - explain", "Outro"])
+        self.assertEqual(architect_result["tone_guidelines"], "Plain")
+        self.assertEqual(architect_result["json_repairs"], ["closed_brackets"])
+        self.assertEqual(architect_result["missing_facts_to_add"], [])
+        self.assertFalse(any(event["type"] == "error" for event in events))
+        self.assertEqual(types[-2:], ["finalizer_done", "done"])
+
+    async def test_partial_critic_batch_keeps_valid_scorecards_and_reasks_only_the_missing_drafts(self):
+        scorecard = {"metric_scores": {"accuracy": 8, "relevance": 8, "completeness": 8, "clarity": 8, "practical_usefulness": 8}, "critique": "Solid."}
+
+        class PartialCriticClient(FakeClient):
+            def __init__(self, reask_reply):
+                super().__init__([])
+                self.reask_reply = reask_reply
+                self.critic_batches = []
+
+            async def stream_generate(self, prompt, *args, **kwargs):
+                if "Senior Quality Assurance Judge" in prompt:
+                    agents = [line.split("--- RESPONSE ID: ")[1].split(" ---")[0] for line in prompt.splitlines() if line.startswith("--- RESPONSE ID:")]
+                    self.critic_batches.append(agents)
+                    if len(self.critic_batches) == 1:
+                        # The Skeptic's scorecard is out of range and The Futurist's is missing.
+                        content = json.dumps({"reviews": {"The Academic": scorecard, "The Skeptic": {**scorecard, "metric_scores": {**scorecard["metric_scores"], "accuracy": 11}}}})
+                    else:
+                        content = json.dumps({"reviews": {agent: scorecard for agent in agents}}) if self.reask_reply else "still broken"
+                elif "Chief Solutions Architect" in prompt:
+                    content = json.dumps({"structure": ["Answer"], "tone_guidelines": "Clear", "missing_facts_to_add": [], "critique_integration": "Use it."})
+                elif "You are the Finalizer" in prompt:
+                    content = "Final answer"
+                else:
+                    content = "Draft"
+                yield type("Update", (), {"delta": content, "usage": None})()
+                yield type("Update", (), {"delta": "", "usage": {"prompt": 1, "completion": 1, "total": 2}})()
+
+        agents = ["The Academic", "The Skeptic", "The Futurist"]
+        settings = replace(get_settings(), critic_scheduling="barrier")
+
+        client = PartialCriticClient(reask_reply=True)
+        workflow = CouncilWorkflow(settings=settings, client_factory=lambda **kwargs: client)
+        events = [event async for event in workflow.stream(WorkflowRequest(query="Test", selected_agents=agents))]
+        self.assertEqual(client.critic_batches, [agents, ["The Skeptic", "The Futurist"]])
+        first_start, reask_start = [event for event in events if event["type"] == "critic_start"]
+        self.assertEqual(reask_start["reask_of"], 1)
+        self.assertEqual(reask_start["total_batches"], first_start["total_batches"])
+        critic_result = next(event for event in events if event["type"] == "critic_result")
+        self.assertEqual(set(critic_result["scorecards"]), set(agents))
+        critic_errors = [event["message"] for event in events if event["type"] == "error"]
+        self.assertEqual(len(critic_errors), 1)
+        self.assertIn("Re-scoring just those drafts", critic_errors[0])
+
+        client = PartialCriticClient(reask_reply=False)
+        workflow = CouncilWorkflow(settings=settings, client_factory=lambda **kwargs: client)
+        events = [event async for event in workflow.stream(WorkflowRequest(query="Test", selected_agents=agents))]
+        self.assertEqual(len(client.critic_batches), 2)
+        critic_result = next(event for event in events if event["type"] == "critic_result")
+        self.assertEqual(list(critic_result["scorecards"]), ["The Academic"])
+        self.assertIn("The Academic", critic_result["finalists"])
+
     async def test_generator_failure_emits_error(self):
         fake_client = FakeClient([RuntimeError("boom")])
         workflow = CouncilWorkflow(
@@ -378,5 +622,45 @@ class WorkflowTests(unittest.IsolatedAsyncioTestCase):
         self.assertGreater(len(architect_result["structure"]), 0)
 
 
+    async def test_reasoning_mode_controls_thinking_delivery(self):
+        class ReasoningClient(FakeClient):
+            def __init__(self):
+                super().__init__([])
+                self.include_reasoning = []
+
+            async def stream_generate(self, prompt, *args, **kwargs):
+                self.include_reasoning.append(kwargs["include_reasoning"])
+                if "Senior Quality Assurance Judge" in prompt:
+                    content = json.dumps({"reviews": {"The Academic": {"metric_scores": {"accuracy": 9, "relevance": 9, "completeness": 9, "clarity": 9, "practical_usefulness": 9}, "critique": "Strong."}}})
+                elif "Chief Solutions Architect" in prompt:
+                    content = json.dumps({"structure": ["Answer"], "tone_guidelines": "Clear", "missing_facts_to_add": [], "critique_integration": "Use it."})
+                else:
+                    content = "Answer"
+                if kwargs["include_reasoning"]:
+                    yield type("Update", (), {"delta": "", "reasoning": "think", "usage": None})()
+                yield type("Update", (), {"delta": content, "usage": None})()
+                yield type("Update", (), {"delta": "", "usage": {"prompt": 1, "completion": 1, "total": 2}})()
+
+        async def run(mode):
+            client = ReasoningClient()
+            workflow = CouncilWorkflow(settings=get_settings(), client_factory=lambda **kwargs: client)
+            request = WorkflowRequest(query="Test", selected_agents=["The Academic"], reasoning_mode=mode)
+            return client, [event async for event in workflow.stream(request)]
+
+        full_client, full_events = await run("full")
+        summary_client, summary_events = await run("summary")
+        none_client, none_events = await run("none")
+
+        self.assertTrue(all(full_client.include_reasoning))
+        self.assertEqual(sum(event["type"].endswith("_thinking") for event in full_events), 4)
+        self.assertTrue(all(summary_client.include_reasoning))
+        self.assertFalse(any(event["type"].endswith("_thinking") for event in summary_events))
+        thinking_done = [event for event in summary_events if event["type"].endswith("_thinking_done")]
+        self.assertEqual([event["reasoning_chars"] for event in thinking_done], [5, 5, 5, 5])
+        self.assertFalse(any(none_client.include_reasoning))
+        self.assertFalse(any(event["type"].endswith("_thinking") for event in none_events))
+        self.assertTrue(any(event["type"] == "finalizer_done" for event in none_events))
+
+
 if __name__ == "__main__":
     unittest.main()
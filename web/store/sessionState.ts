@@ -225,7 +225,8 @@ export function applyCouncilEvent(session: CouncilSession, event: CouncilEvent):
     case 'generator_chunk': {
       const nextSession: CouncilSession = {
         ...session,
-        activePhase: 1,
+        // Pipelined critic batches can start while slower personas are still drafting.
+        activePhase: Math.max(session.activePhase, 1) as CouncilSession['activePhase'],
         status: 'streaming',
         generatorStreams: {
           ...session.generatorStreams,
@@ -278,7 +279,8 @@ export function applyCouncilEvent(session: CouncilSession, event: CouncilEvent):
         activePhase: Math.max(session.activePhase, 2) as CouncilSession['activePhase'],
         status: 'streaming',
         criticStream: '',
-        criticProgress: { batch: event.batch, totalBatches: event.total_batches, model: event.model },
+        // A re-ask re-scores part of an earlier batch, so progress stays on that batch.
+        criticProgress: { batch: event.reask_of ?? event.batch, totalBatches: event.total_batches, model: event.model },
         criticThinking: { ...session.criticThinking, [event.batch]: '' },
       };
       nextSession.summary = getSessionSummary(nextSession);
@@ -306,6 +308,27 @@ export function applyCouncilEvent(session: CouncilSession, event: CouncilEvent):
     case 'critic_done':
       return { ...session, criticProgress: null };
 
+    case 'critic_review': {
+      // Preview each scorecard as its JSON closes; critic_result replaces it with the ranked data.
+      const previous = session.criticData;
+      const average = event.average ?? 0;
+      return {
+        ...session,
+        criticData: {
+          winner_id: previous?.winner_id || '',
+          rankings: previous?.rankings || [],
+          reasoning: previous?.reasoning || '',
+          ...previous,
+          flaws: { ...(previous?.flaws || {}), [event.agent]: event.critique },
+          scores: { ...(previous?.scores || {}), [event.agent]: average },
+          scorecards: {
+            ...(previous?.scorecards || {}),
+            [event.agent]: { metric_scores: event.metric_scores, average, critique: event.critique },
+          },
+        },
+      };
+    }
+
     case 'architect_result': {
       const withMetric = updatePhaseMetric(
         {
@@ -336,6 +359,20 @@ export function applyCouncilEvent(session: CouncilSession, event: CouncilEvent):
     case 'architect_chunk':
       return { ...session, architectStream: `${session.architectStream}${event.chunk}` };
 
+    case 'architect_section': {
+      const structure = event.index === 0 ? [] : [...(session.architectData?.structure || [])];
+      structure[event.index] = event.section;
+      return {
+        ...session,
+        architectData: {
+          tone_guidelines: '',
+          missing_facts_to_add: [],
+          ...session.architectData,
+          structure,
+        },
+      };
+    }
+
     case 'architect_thinking':
       return { ...session, architectThinking: `${session.architectThinking}${event.chunk}` };
 
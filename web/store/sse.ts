@@ -1,9 +1,12 @@
 import type {
   ArchitectResultEvent,
+  ArchitectSectionEvent,
   ArchitectStartEvent,
   ArchitectThinkingDoneEvent,
   ArchitectThinkingEvent,
+  CouncilCacheHitEvent,
   CouncilEvent,
+  CriticReviewEvent,
   CriticStartEvent,
   CriticThinkingDoneEvent,
   CriticThinkingEvent,
@@ -112,7 +115,13 @@ function normalizeEvent(type: string, payload: Record<string, unknown>): Council
 
     case 'critic_start':
       if (typeof payload.model === 'string') {
-        return { type, model: payload.model, batch: Number(payload.batch || 1), total_batches: Number(payload.total_batches || 1) } satisfies CriticStartEvent;
+        return {
+          type,
+          model: payload.model,
+          batch: Number(payload.batch || 1),
+          total_batches: Number(payload.total_batches || 1),
+          ...(typeof payload.reask_of === 'number' ? { reask_of: payload.reask_of } : {}),
+        } satisfies CriticStartEvent;
       }
       return null;
 
@@ -122,6 +131,19 @@ function normalizeEvent(type: string, payload: Record<string, unknown>): Council
     case 'critic_done':
       return { type };
 
+    case 'critic_review':
+      if (typeof payload.agent === 'string' && payload.metric_scores && typeof payload.metric_scores === 'object') {
+        return {
+          type,
+          batch: Number(payload.batch || 1),
+          agent: payload.agent,
+          metric_scores: Object.fromEntries(Object.entries(payload.metric_scores).map(([metric, score]) => [metric, Number(score)])),
+          critique: String(payload.critique || ''),
+          average: payload.average === undefined ? undefined : Number(payload.average),
+        } satisfies CriticReviewEvent;
+      }
+      return null;
+
     case 'critic_thinking':
       return typeof payload.chunk === 'string'
         ? { type, batch: Number(payload.batch || 1), chunk: payload.chunk } satisfies CriticThinkingEvent
@@ -152,6 +174,11 @@ function normalizeEvent(type: string, payload: Record<string, unknown>): Council
     case 'architect_chunk':
       return typeof payload.chunk === 'string' ? { type, chunk: payload.chunk } : null;
 
+    case 'architect_section':
+      return typeof payload.section === 'string'
+        ? { type, index: Number(payload.index || 0), section: payload.section } satisfies ArchitectSectionEvent
+        : null;
+
     case 'architect_thinking':
       return typeof payload.chunk === 'string' ? { type, chunk: payload.chunk } satisfies ArchitectThinkingEvent : null;
 
@@ -188,6 +215,15 @@ function normalizeEvent(type: string, payload: Record<string, unknown>): Council
         total_tokens: toUsage(payload.total_tokens),
       } satisfies DoneEvent;
 
+    case 'council_cache_hit':
+      return {
+        type,
+        mode: payload.mode === 'offer' ? 'offer' : 'replay',
+        similarity: Number(payload.similarity || 0),
+        age_seconds: Number(payload.age_seconds || 0),
+        final_report: typeof payload.final_report === 'string' ? payload.final_report : undefined,
+      } satisfies CouncilCacheHitEvent;
+
     case 'error':
       return {
         type,
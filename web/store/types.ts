@@ -162,6 +162,7 @@ export interface CriticStartEvent extends BaseCouncilEvent {
   model: string;
   batch: number;
   total_batches: number;
+  reask_of?: number;
 }
 
 export interface CriticChunkEvent extends BaseCouncilEvent {
@@ -173,6 +174,15 @@ export interface CriticDoneEvent extends BaseCouncilEvent {
   type: 'critic_done';
 }
 
+export interface CriticReviewEvent extends BaseCouncilEvent {
+  type: 'critic_review';
+  batch: number;
+  agent: string;
+  metric_scores: Record<string, number>;
+  critique: string;
+  average?: number;
+}
+
 export interface CriticThinkingEvent extends BaseCouncilEvent {
   type: 'critic_thinking';
   batch: number;
@@ -198,6 +208,12 @@ export interface ArchitectChunkEvent extends BaseCouncilEvent {
   chunk: string;
 }
 
+export interface ArchitectSectionEvent extends BaseCouncilEvent {
+  type: 'architect_section';
+  index: number;
+  section: string;
+}
+
 export interface ArchitectThinkingEvent extends BaseCouncilEvent {
   type: 'architect_thinking';
   chunk: string;
@@ -239,6 +255,14 @@ export interface DoneEvent extends BaseCouncilEvent {
   total_tokens: MetricUsage;
 }
 
+export interface CouncilCacheHitEvent extends BaseCouncilEvent {
+  type: 'council_cache_hit';
+  mode: 'replay' | 'offer';
+  similarity: number;
+  age_seconds: number;
+  final_report?: string;
+}
+
 export interface ErrorEvent extends BaseCouncilEvent {
   type: 'error';
   message: string;
@@ -285,11 +309,13 @@ export type CouncilEvent =
   | CriticStartEvent
   | CriticChunkEvent
   | CriticDoneEvent
+  | CriticReviewEvent
   | CriticThinkingEvent
   | CriticThinkingDoneEvent
   | CriticResultEvent
   | ArchitectStartEvent
   | ArchitectChunkEvent
+  | ArchitectSectionEvent
   | ArchitectThinkingEvent
   | ArchitectThinkingDoneEvent
   | ArchitectResultEvent
@@ -298,6 +324,7 @@ export type CouncilEvent =
   | FinalizerThinkingEvent
   | FinalizerThinkingDoneEvent
   | FinalizerDoneEvent
+  | CouncilCacheHitEvent
   | DoneEvent
   | ErrorEvent;
 
@@ -72,6 +72,17 @@ test('live phase buffers preserve generator tabs and structured progress', () =>
   assert.equal(session.architectStream, '{"structure":');
 });
 
+test('scorecard and section previews fill in before the phase results arrive', () => {
+  let session = createSession('5', 'Preview this', agents);
+  session = applyCouncilEvent(session, { type: 'critic_review', batch: 1, agent: 'The Academic', metric_scores: { accuracy: 9 }, critique: 'Solid.', average: 9 });
+  session = applyCouncilEvent(session, { type: 'architect_section', index: 0, section: 'Intro' });
+  session = applyCouncilEvent(session, { type: 'architect_section', index: 1, section: 'Detail' });
+
+  assert.equal(session.criticData?.scorecards?.['The Academic'].critique, 'Solid.');
+  assert.equal(session.criticData?.scores['The Academic'], 9);
+  assert.deepEqual(session.architectData?.structure, ['Intro', 'Detail']);
+});
+
 test('critic thinking remains live only until its critic batch completes', () => {
   let session = createSession('thinking', 'Review this', agents);
   session = applyCouncilEvent(session, { type: 'critic_start', model: 'openai/gpt-oss-120b', batch: 1, total_batches: 2 });
@@ -26,6 +26,11 @@ test('parseSseChunk accepts structured phase progress events', () => {
   assert.deepEqual(parsed.events.map((event) => event.type), ['critic_start', 'architect_chunk']);
 });
 
+test('parseSseChunk keeps the batch a critic re-ask belongs to', () => {
+  const parsed = parseSseChunk('', 'event: critic_start\ndata: {"type":"critic_start","model":"openai/gpt-oss-120b","batch":3,"total_batches":2,"reask_of":1}\n\n');
+  assert.deepEqual(parsed.events[0], { type: 'critic_start', model: 'openai/gpt-oss-120b', batch: 3, total_batches: 2, reask_of: 1 });
+});
+
 test('parseFollowUpSseChunk keeps reasoning separate from answer content', () => {
   const parsed = parseFollowUpSseChunk('', 'event: chat_reasoning_chunk\ndata: {"chunk":"Think"}\n\nevent: chat_content_chunk\ndata: {"chunk":"Answer"}\n\nevent: chat_done\ndata: {"model":"openai/gpt-oss-20b","usage":{"prompt":2,"completion":3,"total":5}}\n\n');
   assert.deepEqual(parsed.events.map((event) => event.type), ['chat_reasoning_chunk', 'chat_content_chunk', 'chat_done']);
@@ -40,3 +45,8 @@ test('parseSseChunk accepts temporary thinking events for all council phases', (
   const parsed = parseSseChunk('', 'event: generator_thinking\ndata: {"agent":"The Academic","chunk":"Drafting"}\n\nevent: architect_thinking\ndata: {"chunk":"Planning"}\n\nevent: finalizer_thinking\ndata: {"chunk":"Synthesizing"}\n\n');
   assert.deepEqual(parsed.events.map((event) => event.type), ['generator_thinking', 'architect_thinking', 'finalizer_thinking']);
 });
+
+test('parseSseChunk accepts streamed scorecard and blueprint section previews', () => {
+  const parsed = parseSseChunk('', 'event: critic_review\ndata: {"batch":1,"agent":"The Academic","metric_scores":{"accuracy":9},"critique":"Solid."}\n\nevent: architect_section\ndata: {"index":0,"section":"Intro - set up"}\n\n');
+  assert.deepEqual(parsed.events.map((event) => event.type), ['critic_review', 'architect_section']);
+});